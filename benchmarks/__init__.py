@@ -0,0 +1,5 @@
+"""
+Benchmarks for csfloat.py.
+
+Run them from the repository root as modules, e.g. ``python -m benchmarks.client``.
+"""
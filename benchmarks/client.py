@@ -0,0 +1,197 @@
+"""
+Benchmarks HTTPClient, ListingAsyncIterator and the model constructors against the local fake server.
+
+    python -m benchmarks.client --output before.json
+    python -m benchmarks.client --compare before.json
+
+Throughputs are the best of ``--repeat`` rounds, construction costs the best per-object time,
+and memory per listing is measured with tracemalloc.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import time
+import timeit
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+import csfloat
+
+from . import report
+from .fake_server import FakeCSFloat
+
+
+async def best_of(repeat: int, func: Callable[[], Awaitable[Any]]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def bench_http(server: FakeCSFloat, metrics: Dict[str, Any], *, repeat: int, requests: int, concurrency: int) -> None:
+    client = csfloat.Client(base_url=server.base_url)
+    listing_count = len(server.listings)
+    pages = -(-listing_count // 50)
+    listing_ids = [data["id"] for data in server.listings[:requests]]
+
+    async def crawl() -> None:
+        listings = await (await client.fetch_all_listings(limit=50)).flatten()
+        assert len(listings) == listing_count
+
+    async def crawl_raw() -> None:
+        iterator = await client.fetch_all_listings(limit=50)
+        assert sum([len(page) async for page in iterator.pages()]) == listing_count
+
+    async def get_listing() -> None:
+        for listing_id in listing_ids:
+            await client.get_listing(listing_id)
+
+    async def get_listing_concurrent() -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def get(listing_id: str) -> None:
+            async with semaphore:
+                await client.get_listing(listing_id)
+
+        await asyncio.gather(*(get(listing_id) for listing_id in listing_ids))
+
+    async def get_user_stall() -> None:
+        for _ in range(requests):
+            await client.get_user_stall(76561197960265728, limit=40)
+
+    async def get_inventory() -> None:
+        for _ in range(max(requests // 10, 1)):
+            await client.get_inventory()
+
+    try:
+        elapsed = await best_of(repeat, crawl)
+        metrics["crawl.pages_per_second"] = report.metric(pages / elapsed, "pages/s", higher_is_better=True)
+        metrics["crawl.listings_per_second"] = report.metric(listing_count / elapsed, "listings/s", higher_is_better=True)
+
+        elapsed = await best_of(repeat, crawl_raw)
+        metrics["crawl_raw.pages_per_second"] = report.metric(pages / elapsed, "pages/s", higher_is_better=True)
+        metrics["crawl_raw.listings_per_second"] = report.metric(
+            listing_count / elapsed, "listings/s", higher_is_better=True
+        )
+
+        elapsed = await best_of(repeat, get_listing)
+        metrics["get_listing.requests_per_second"] = report.metric(requests / elapsed, "requests/s", higher_is_better=True)
+
+        elapsed = await best_of(repeat, get_listing_concurrent)
+        metrics["get_listing_concurrent.requests_per_second"] = report.metric(
+            requests / elapsed, "requests/s", higher_is_better=True
+        )
+
+        elapsed = await best_of(repeat, get_user_stall)
+        metrics["get_user_stall.requests_per_second"] = report.metric(
+            requests / elapsed, "requests/s", higher_is_better=True
+        )
+
+        elapsed = await best_of(repeat, get_inventory)
+        items = max(requests // 10, 1) * len(json.loads(server.inventory))
+        metrics["get_inventory.items_per_second"] = report.metric(items / elapsed, "items/s", higher_is_better=True)
+    finally:
+        await client.close()
+
+
+def per_object_us(func: Callable[[], Any], count: int, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) / count * 1e6
+
+
+def bench_construction(listings: List[Dict[str, Any]], metrics: Dict[str, Any], *, repeat: int) -> None:
+    sellers = [data["seller"] for data in listings]
+    items = [data["item"] for data in listings]
+    count = len(listings)
+
+    def construct() -> None:
+        for data in listings:
+            csfloat.Listing(data=data)
+
+    def construct_and_access() -> None:
+        for data in listings:
+            listing = csfloat.Listing(data=data)
+            listing.price, listing.created_at, listing.item.float_value, listing.seller.username
+
+    def construct_with_identity_map() -> None:
+        identity_map = csfloat.IdentityMap()
+        for data in listings:
+            csfloat.Listing(data=data, identity_map=identity_map).seller
+
+    def construct_users() -> None:
+        for data in sellers:
+            csfloat.User(data=data)
+
+    def construct_items() -> None:
+        for data in items:
+            csfloat.Listing(data={"item": data}).item
+
+    metrics["construct.listing_us"] = report.metric(per_object_us(construct, count, repeat), "us", higher_is_better=False)
+    metrics["construct.listing_with_access_us"] = report.metric(
+        per_object_us(construct_and_access, count, repeat), "us", higher_is_better=False
+    )
+    metrics["construct.listing_with_identity_map_us"] = report.metric(
+        per_object_us(construct_with_identity_map, count, repeat), "us", higher_is_better=False
+    )
+    metrics["construct.user_us"] = report.metric(per_object_us(construct_users, count, repeat), "us", higher_is_better=False)
+    metrics["construct.item_us"] = report.metric(per_object_us(construct_items, count, repeat), "us", higher_is_better=False)
+
+
+def bench_memory(server: FakeCSFloat, metrics: Dict[str, Any]) -> None:
+    bodies = [server.page(page, 50) for page in range(-(-len(server.listings) // 50))]
+    count = len(server.listings)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        decoded = [listing for body in bodies for listing in json.loads(body)["data"]]
+        after_decode, _ = tracemalloc.get_traced_memory()
+        listings = [csfloat.Listing(data=data) for data in decoded]
+        after_construct, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    metrics["memory.decoded_json_bytes_per_listing"] = report.metric(after_decode / count, "bytes", higher_is_better=False)
+    metrics["memory.listing_object_bytes_per_listing"] = report.metric(
+        (after_construct - after_decode) / count, "bytes", higher_is_better=False
+    )
+    metrics["memory.total_bytes_per_listing"] = report.metric(after_construct / count, "bytes", higher_is_better=False)
+    del listings, decoded
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    parameters = {
+        "listings": args.listings,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "latency_ms": args.latency,
+    }
+    result = report.new_report("client", parameters)
+    metrics = result["metrics"]
+
+    async with FakeCSFloat(listing_count=args.listings, latency=args.latency / 1000) as server:
+        await bench_http(server, metrics, repeat=args.repeat, requests=args.requests, concurrency=args.concurrency)
+        bench_construction(server.listings, metrics, repeat=args.repeat)
+        bench_memory(server, metrics)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listings", type=int, default=5_000, help="listings served by /listings")
+    parser.add_argument("--requests", type=int, default=200, help="requests per single-object benchmark")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight for the concurrent benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per benchmark, the best is reported")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server latency in milliseconds")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--compare", help="a previous JSON report to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args))
+    report.show(result, report.load(args.compare) if args.compare else None)
+    if args.output:
+        report.write(result, args.output)
@@ -0,0 +1,107 @@
+"""
+A local aiohttp fake of the CSFloat API for the benchmarks.
+
+It serves ``/listings``, ``/listings/{id}``, ``/users/{id}/stall`` and ``/me/inventory`` from
+payloads generated once at start-up. Response bodies are serialized ahead of time, so the
+server does as little work per request as possible and the numbers reflect the client.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from . import payloads
+
+MAX_PAGE_SIZE = 50
+
+
+class FakeCSFloat:
+    """Serves ``listing_count`` listings, paginated like the real API.
+
+    Parameters
+    ----------
+    listing_count: :class:`int`
+        The number of listings served by ``/listings``.
+    inventory_size: :class:`int`
+        The number of items in ``/me/inventory``.
+    latency: :class:`float`
+        Seconds every response is delayed by, to simulate a network round-trip.
+    seed: :class:`int`
+        The seed of the generated payloads.
+    """
+
+    def __init__(
+        self, *, listing_count: int = 5_000, inventory_size: int = 500, latency: float = 0.0, seed: int = 0
+    ) -> None:
+        self.latency = latency
+        self.listings: List[Dict[str, Any]] = payloads.listings(listing_count, seed=seed)
+        self.by_id: Dict[str, bytes] = {data["id"]: json.dumps(data).encode() for data in self.listings}
+        self.inventory: bytes = json.dumps(payloads.inventory(inventory_size, seed=seed)).encode()
+        self._pages: Dict[tuple, bytes] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: str = ""
+        self.requests = 0
+
+    def page(self, page: int, limit: int) -> bytes:
+        key = (page, limit)
+        body = self._pages.get(key)
+        if body is None:
+            start = page * limit
+            body = json.dumps({"data": self.listings[start : start + limit]}).encode()
+            self._pages[key] = body
+        return body
+
+    async def _respond(self, body: bytes, status: int = 200) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(body=body, status=status, content_type="application/json")
+
+    async def get_listings(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get("limit", MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+        return await self._respond(self.page(int(request.query.get("page", 0)), limit))
+
+    async def get_listing(self, request: web.Request) -> web.Response:
+        body = self.by_id.get(request.match_info["listing_id"])
+        if body is None:
+            return await self._respond(b'{"code": 4, "message": "record not found"}', status=404)
+        return await self._respond(body)
+
+    async def get_user_stall(self, request: web.Request) -> web.Response:
+        limit = min(int(request.query.get("limit", 40)), MAX_PAGE_SIZE)
+        return await self._respond(self.page(int(request.query.get("page", 0)), limit))
+
+    async def get_inventory(self, request: web.Request) -> web.Response:
+        return await self._respond(self.inventory)
+
+    def application(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/listings", self.get_listings)
+        app.router.add_get("/api/v1/listings/{listing_id}", self.get_listing)
+        app.router.add_get("/api/v1/users/{user_id}/stall", self.get_user_stall)
+        app.router.add_get("/api/v1/me/inventory", self.get_inventory)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Starts the server and returns its base URL. Port ``0`` picks a free port."""
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}/api/v1"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeCSFloat":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
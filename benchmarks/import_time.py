@@ -0,0 +1,75 @@
+"""
+Measures how long importing csfloat takes in a fresh interpreter.
+
+Every scenario runs in ``--runs`` new processes, so nothing is cached in ``sys.modules``.
+The report contains the median and best time and the number of modules each scenario loads:
+
+    python -m benchmarks.import_time --runs 30 --output import_time.json
+    python -m benchmarks.import_time --compare import_time.json
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from . import report
+
+SCENARIOS = {
+    "import_csfloat": "import csfloat",
+    "import_enums": "from csfloat import Category",
+    "import_client": "from csfloat import Client",
+    "import_all": "from csfloat import *",
+}
+
+_PROBE = """
+import sys, time
+before = len(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, len(sys.modules) - before, int("aiohttp" in sys.modules))
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_scenario(name: str, statement: str, runs: int, metrics: Dict[str, Any]) -> None:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (ROOT, os.environ.get("PYTHONPATH")))))
+    times: List[float] = []
+    modules = 0
+    loads_aiohttp = 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        times.append(float(output[0]) * 1000)
+        modules = int(output[1])
+        loads_aiohttp = int(output[2])
+
+    metrics[f"{name}.median_ms"] = report.metric(statistics.median(times), "ms", higher_is_better=False)
+    metrics[f"{name}.best_ms"] = report.metric(min(times), "ms", higher_is_better=False)
+    metrics[f"{name}.modules"] = report.metric(modules, "modules", higher_is_better=False)
+    metrics[f"{name}.loads_aiohttp"] = report.metric(loads_aiohttp, "bool", higher_is_better=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20, help="fresh interpreters per scenario")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--compare", help="a previous JSON report to compare against")
+    args = parser.parse_args()
+
+    result = report.new_report("import_time", {"runs": args.runs, "scenarios": SCENARIOS})
+    for name, statement in SCENARIOS.items():
+        run_scenario(name, statement, args.runs, result["metrics"])
+
+    report.show(result, report.load(args.compare) if args.compare else None)
+    if args.output:
+        report.write(result, args.output)
@@ -0,0 +1,169 @@
+"""
+Synthetic but realistically shaped API payloads for the benchmarks.
+
+The generators are seeded, so every run and every machine works on the same data.
+"""
+
+import random
+from typing import Any, Dict, List
+
+WEAPONS = [
+    ("AK-47", 7, ["Redline", "Vulcan", "Case Hardened", "Fire Serpent", "Slate", "Bloodsport"]),
+    ("AWP", 9, ["Asiimov", "Dragon Lore", "Hyper Beast", "Neo-Noir", "Atheris", "Chromatic Aberration"]),
+    ("M4A1-S", 60, ["Printstream", "Hyper Beast", "Golden Coil", "Decimator", "Nightmare"]),
+    ("Desert Eagle", 1, ["Blaze", "Code Red", "Printstream", "Kumicho Dragon"]),
+    ("Glock-18", 4, ["Fade", "Water Elemental", "Vogue", "Neo-Noir"]),
+    ("USP-S", 61, ["Kill Confirmed", "Cortex", "Orion", "The Traitor"]),
+]
+WEARS = [
+    ("Factory New", 0.0, 0.07),
+    ("Minimal Wear", 0.07, 0.15),
+    ("Field-Tested", 0.15, 0.38),
+    ("Well-Worn", 0.38, 0.45),
+    ("Battle-Scarred", 0.45, 1.0),
+]
+TIMESTAMP = "2024-{0:02d}-{1:02d}T{2:02d}:{3:02d}:{4:02d}.{5:06d}Z"
+ICON_URL = "-9a81dlWLwJ2UUGcVs_nsVtzdOEdtWwKGZZLQHTxDZ7I56KU0Zwwo4NUX4oFJZEHLbXH5ApeO4YmlhxYQknCRvCo04D{0:x}"
+INSPECT_LINK = "steam://rungame/730/76561202255233023/+csgo_econ_action_preview%20S76561198000000000A{0}D{1}"
+
+
+def _timestamp(rng: random.Random) -> str:
+    return TIMESTAMP.format(
+        rng.randint(1, 12),
+        rng.randint(1, 28),
+        rng.randint(0, 23),
+        rng.randint(0, 59),
+        rng.randint(0, 59),
+        rng.randint(0, 999_999),
+    )
+
+
+def user(rng: random.Random, index: int) -> Dict[str, Any]:
+    steam_id = str(76561197960265728 + index)
+    return {
+        "avatar": f"https://avatars.steamstatic.com/{index:040x}_full.jpg",
+        "away": rng.random() < 0.05,
+        "flags": rng.choice([0, 0, 16, 48]),
+        "has_valid_steam_api_key": True,
+        "obfuscated_id": str(rng.getrandbits(63)),
+        "online": rng.random() < 0.4,
+        "stall_public": True,
+        "statistics": {
+            "median_trade_time": rng.randint(60, 20_000),
+            "total_avoided_trades": rng.randint(0, 5),
+            "total_failed_trades": rng.randint(0, 10),
+            "total_trades": rng.randint(0, 5_000),
+            "total_verified_trades": rng.randint(0, 5_000),
+        },
+        "steam_id": steam_id,
+        "username": f"trader_{index}",
+        "verification_mode": "key",
+    }
+
+
+def item(rng: random.Random, asset_id: int) -> Dict[str, Any]:
+    weapon, def_index, finishes = rng.choice(WEAPONS)
+    finish = rng.choice(finishes)
+    wear_name, low, high = rng.choice(WEARS)
+    stattrak = rng.random() < 0.1
+    name = f"{'StatTrak™ ' if stattrak else ''}{weapon} | {finish} ({wear_name})"
+    stickers = [
+        {
+            "stickerId": rng.randint(1, 8_000),
+            "slot": slot,
+            "wear": rng.choice([0.0, rng.random()]),
+            "icon_url": f"econ/stickers/{rng.getrandbits(32):08x}.png",
+            "name": f"Sticker | Team {rng.randint(1, 200)} | Katowice 2014",
+            "reference": {"price": rng.randint(3, 50_000), "quantity": rng.randint(1, 500), "updated_at": _timestamp(rng)},
+        }
+        for slot in range(rng.choice([0, 0, 1, 2, 3, 4]))
+    ]
+    keychains = None
+    if rng.random() < 0.15:
+        keychains = [
+            {
+                "stickerId": rng.randint(1, 50),
+                "slot": 0,
+                "pattern": rng.randint(0, 100_000),
+                "name": "Charm | Lil' Squirt",
+                "reference": {"price": rng.randint(30, 3_000), "quantity": rng.randint(1, 200)},
+            }
+        ]
+    return {
+        "asset_id": str(asset_id),
+        "def_index": def_index,
+        "paint_index": rng.randint(1, 1_200),
+        "paint_seed": rng.randint(0, 1_000),
+        "float_value": round(rng.uniform(low, high), 14),
+        "icon_url": ICON_URL.format(asset_id),
+        "d_param": str(rng.getrandbits(62)),
+        "is_stattrak": stattrak,
+        "is_souvenir": False,
+        "rarity": rng.randint(1, 6),
+        "quality": 9 if stattrak else 4,
+        "market_hash_name": name,
+        "stickers": stickers,
+        "keychains": keychains,
+        "tradable": 0,
+        "inspect_link": INSPECT_LINK.format(asset_id, rng.getrandbits(62)),
+        "has_screenshot": True,
+        "cs2_screenshot_id": str(rng.getrandbits(63)),
+        "cs2_screenshot_at": _timestamp(rng),
+        "is_commodity": False,
+        "type": "skin",
+        "rarity_name": "Covert",
+        "type_name": "Skin",
+        "item_name": f"{weapon} | {finish}",
+        "wear_name": wear_name,
+        "description": "It has been custom painted.",
+        "collection": "The Phoenix Collection",
+        "serialized_inspect": f"{rng.getrandbits(64):016X}",
+        "gs_sig": f"{rng.getrandbits(128):032x}",
+        "low_rank": rng.choice([None, rng.randint(1, 1_000)]),
+    }
+
+
+def listing(rng: random.Random, index: int, *, sellers: int = 500) -> Dict[str, Any]:
+    auction = rng.random() < 0.1
+    base_price = rng.randint(100, 500_000)
+    price = max(3, int(base_price * rng.uniform(0.8, 1.3)))
+    data: Dict[str, Any] = {
+        "id": str(700_000_000_000_000_000 + index),
+        "created_at": _timestamp(rng),
+        "type": "auction" if auction else "buy_now",
+        "price": price,
+        "description": rng.choice(["", "", "fast trade", "no lowballs pls"]),
+        "state": "listed",
+        "seller": user(rng, rng.randrange(sellers)),
+        "reference": {
+            "base_price": base_price,
+            "float_factor": round(rng.uniform(0.9, 1.5), 6),
+            "predicted_price": int(base_price * rng.uniform(0.9, 1.4)),
+            "quantity": rng.randint(1, 3_000),
+            "last_updated": _timestamp(rng),
+        },
+        "item": item(rng, 30_000_000_000 + index),
+        "is_seller": False,
+        "min_offer_price": int(price * 0.9),
+        "max_offer_discount": rng.choice([500, 1_000, 1_500]),
+        "is_watchlisted": False,
+        "watchers": rng.randint(0, 60),
+    }
+    if auction:
+        data["auction_details"] = {
+            "reserve_price": price,
+            "top_bid": None,
+            "expires_at": _timestamp(rng),
+            "min_next_bid": price,
+        }
+    return data
+
+
+def listings(count: int, *, seed: int = 0, sellers: int = 500) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [listing(rng, index, sellers=sellers) for index in range(count)]
+
+
+def inventory(count: int, *, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [item(rng, 40_000_000_000 + index) for index in range(count)]
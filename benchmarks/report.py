@@ -0,0 +1,72 @@
+"""
+Benchmark reports: environment metadata, JSON output and comparison with an earlier run.
+
+A report is a dict with a ``metrics`` mapping of ``name -> {"value", "unit", "higher_is_better"}``,
+so reports of different runs, commits or machines can be compared metric by metric.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional
+
+import csfloat
+
+
+def metric(value: float, unit: str, *, higher_is_better: bool) -> Dict[str, Any]:
+    return {"value": round(value, 6), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "csfloat": csfloat.__version__,
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def new_report(benchmark: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {"benchmark": benchmark, "environment": environment(), "parameters": parameters, "metrics": {}}
+
+
+def write(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def show(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None, *, file: Any = sys.stdout) -> None:
+    """Prints the metrics of ``report``, with the change relative to ``baseline`` if given.
+
+    Changes are signed so that positive always means better.
+    """
+    previous = baseline["metrics"] if baseline is not None else {}
+    for name, current in report["metrics"].items():
+        line = f"{name:<44} {current['value']:>16,.3f} {current['unit']:<14}"
+        old = previous.get(name)
+        if old is not None and old["value"]:
+            change = (current["value"] - old["value"]) / old["value"] * 100
+            if not current["higher_is_better"]:
+                change = -change
+            line += f" {change:+7.1f}%"
+        print(line, file=file)
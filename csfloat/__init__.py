@@ -12,17 +12,156 @@ __license__ = "MIT"
 __copyright__ = "Copyright 2023-present PaxxPatriot"
 __version__ = "0.3.0"
 
-__path__ = __import__("pkgutil").extend_path(__path__, __name__)
-
+import importlib
 import logging
-from typing import NamedTuple
+from typing import TYPE_CHECKING, Any, List, NamedTuple
+
+if TYPE_CHECKING:
+    from .auctions import *
+    from .broadcast import *
+    from .bulk import *
+    from .client import *
+    from .concurrency import *
+    from .diff import *
+    from .enums import *
+    from .errors import *
+    from .export import *
+    from .frame import *
+    from .history import *
+    from .identity import *
+    from .index import *
+    from .iterators import *
+    from .listing import *
+    from .profiling import *
+    from .repricer import *
+    from .scheduler import *
+    from .scoring import *
+    from .snapshot import *
+    from .store import *
+    from .topk import *
+    from .tracing import *
+    from .transport import *
+    from .user import *
+
 
-from .client import *
-from .enums import *
-from .errors import *
-from .iterators import *
-from .listing import *
-from .user import *
+# Public names and the submodule defining them. Submodules, and with them aiohttp, are only
+# imported when one of their names is first accessed, so e.g. using the enums stays cheap.
+_LAZY_NAMES = {
+    "AuctionWatcher": "auctions",
+    "BroadcastConsumer": "broadcast",
+    "ListingBroadcast": "broadcast",
+    "ListingRequest": "bulk",
+    "RepriceRequest": "bulk",
+    "BulkJournal": "bulk",
+    "BulkItemResult": "bulk",
+    "BulkResult": "bulk",
+    "Client": "client",
+    "LimiterDecision": "concurrency",
+    "AdaptiveLimiter": "concurrency",
+    "HedgingPolicy": "concurrency",
+    "Fingerprint": "diff",
+    "fingerprint": "diff",
+    "ChangeEvent": "diff",
+    "Snapshot": "diff",
+    "SnapshotWriter": "diff",
+    "diff_snapshots": "diff",
+    "SortingParameter": "enums",
+    "Category": "enums",
+    "ListingType": "enums",
+    "Rarity": "enums",
+    "ChangeType": "enums",
+    "SlowConsumerPolicy": "enums",
+    "RequestPriority": "enums",
+    "CSFloatException": "errors",
+    "ClientException": "errors",
+    "HTTPException": "errors",
+    "BadRequest": "errors",
+    "Unauthorized": "errors",
+    "Forbidden": "errors",
+    "NotFound": "errors",
+    "Gone": "errors",
+    "InternalServerError": "errors",
+    "ServiceUnavailable": "errors",
+    "BadArgument": "errors",
+    "RequestTimeout": "errors",
+    "NDJSONSink": "export",
+    "CSVSink": "export",
+    "ListingFrame": "frame",
+    "PricePoint": "history",
+    "PriceHistoryStore": "history",
+    "IdentityMap": "identity",
+    "ListingIndex": "index",
+    "AttachmentIndex": "index",
+    "ListingAsyncIterator": "iterators",
+    "TopBid": "listing",
+    "AuctionDetails": "listing",
+    "Listing": "listing",
+    "ProfileSummary": "profiling",
+    "PipelineProfiler": "profiling",
+    "RepricingService": "repricer",
+    "PriorityScheduler": "scheduler",
+    "DealScores": "scoring",
+    "score_listings": "scoring",
+    "write_snapshot": "snapshot",
+    "BinarySnapshot": "snapshot",
+    "ListingStore": "store",
+    "TopK": "topk",
+    "select_top_k": "topk",
+    "by_price": "topk",
+    "by_float_value": "topk",
+    "by_watchers": "topk",
+    "by_discount": "topk",
+    "Span": "tracing",
+    "Tracer": "tracing",
+    "NoOpTracer": "tracing",
+    "OpenTelemetryTracer": "tracing",
+    "TransportResponse": "transport",
+    "Transport": "transport",
+    "AiohttpTransport": "transport",
+    "RecordingTransport": "transport",
+    "ReplayTransport": "transport",
+    "FirebaseMessaging": "user",
+    "PaymentAccounts": "user",
+    "UserStatistics": "user",
+    "AuthenticatedUserStatistics": "user",
+    "UserPreferences": "user",
+    "User": "user",
+    "AuthenticatedUser": "user",
+}
+
+_SUBMODULES = frozenset(
+    (
+        "auctions",
+        "broadcast",
+        "bulk",
+        "client",
+        "concurrency",
+        "diff",
+        "enums",
+        "errors",
+        "export",
+        "frame",
+        "history",
+        "http",
+        "identity",
+        "index",
+        "item",
+        "iterators",
+        "listing",
+        "profiling",
+        "repricer",
+        "scheduler",
+        "scoring",
+        "snapshot",
+        "store",
+        "topk",
+        "tracing",
+        "transport",
+        "user",
+    )
+)
+
+__all__ = tuple(_LAZY_NAMES) + ("VersionInfo", "version_info")
 
 
 class VersionInfo(NamedTuple):
@@ -35,4 +174,23 @@ class VersionInfo(NamedTuple):
 
 version_info: VersionInfo = VersionInfo(major=0, minor=3, micro=0, releaselevel="final", serial=0)
 
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_NAMES.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # cache it, so __getattr__ is only called on first access
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
+
+
 logging.getLogger(__name__).addHandler(logging.NullHandler())
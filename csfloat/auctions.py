@@ -0,0 +1,247 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import inspect
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .enums import RequestPriority
+from .errors import BadArgument, NotFound
+from .listing import Listing
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__ = ("AuctionWatcher",)
+
+
+_log = logging.getLogger(__name__)
+
+
+def _auction_state(listing: Listing) -> Tuple[Any, ...]:
+    details = listing._auction_details or {}
+    top_bid = details.get("top_bid") or {}
+    return (listing._state, details.get("min_next_bid"), top_bid.get("id"), top_bid.get("price"))
+
+
+class _Watched:
+    __slots__ = ("listing", "expires_at", "version")
+
+    def __init__(self, listing: Listing, expires_at: float) -> None:
+        self.listing = listing
+        self.expires_at = expires_at
+        self.version = 0
+
+
+class AuctionWatcher:
+    """Refreshes auctions on a schedule derived from their expiry.
+
+    Auctions are kept in a heap ordered by their next refresh time, so adding, removing and
+    rescheduling an auction is O(log n). The refresh interval of an auction is ``urgency`` times
+    the remaining time until :attr:`AuctionDetails.expires_at`, clamped to
+    ``[min_interval, max_interval]``, so auctions are polled more often as they approach their end.
+    A last refresh happens right after expiry, after which the auction is dropped.
+
+    Parameters
+    ----------
+    client: :class:`Client`
+        The client used to refresh the auctions with :meth:`Client.get_listing`.
+    on_update:
+        Callback, or coroutine function, called with ``(old, new)`` :class:`Listing` objects whenever
+        the state, the minimum next bid or the top bid of an auction changed.
+    min_interval: :class:`float`
+        The minimum number of seconds between two refreshes of an auction.
+    max_interval: :class:`float`
+        The maximum number of seconds between two refreshes of an auction.
+    urgency: :class:`float`
+        The share of the remaining time used as refresh interval.
+    concurrency: :class:`int`
+        The maximum number of refreshes in flight.
+    priority: :class:`RequestPriority`
+        The priority of the refreshes, by default :attr:`RequestPriority.normal` so they don't
+        compete with the high priority requests of the client.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        on_update: Optional[Callable[[Listing, Listing], Any]] = None,
+        min_interval: float = 5.0,
+        max_interval: float = 3600.0,
+        urgency: float = 0.1,
+        concurrency: int = 4,
+        priority: RequestPriority = RequestPriority.normal,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise BadArgument("min_interval has to be positive and not larger than max_interval")
+        if not 0 < urgency <= 1:
+            raise BadArgument("urgency has to be within (0, 1]")
+
+        self.client: Client = client
+        self.on_update: Optional[Callable[[Listing, Listing], Any]] = on_update
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.urgency: float = urgency
+        self.priority: RequestPriority = priority
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._watched: Dict[str, _Watched] = {}
+        # (due, sequence, listing_id, version); outdated entries are skipped when popped
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = 0
+        self._wakeup = asyncio.Event()
+        self._running = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __repr__(self) -> str:
+        return f"<AuctionWatcher auctions={len(self._watched)}>"
+
+    def __len__(self) -> int:
+        return len(self._watched)
+
+    def __contains__(self, listing_id: object) -> bool:
+        return listing_id in self._watched
+
+    def interval(self, remaining: float) -> float:
+        """Returns the refresh interval in seconds for an auction ending in ``remaining`` seconds."""
+        return min(self.max_interval, max(self.min_interval, remaining * self.urgency))
+
+    def _schedule(self, listing_id: str, due: float) -> None:
+        entry = self._watched[listing_id]
+        entry.version += 1
+        self._sequence += 1
+        heapq.heappush(self._heap, (due, self._sequence, listing_id, entry.version))
+        self._wakeup.set()
+
+    def _next_due(self, entry: _Watched, now: float) -> float:
+        remaining = entry.expires_at - now
+        if remaining <= 0:
+            return now
+        # never schedule past the expiry, the final state is fetched right after it
+        return now + min(self.interval(remaining), remaining + 1.0)
+
+    def watch(self, listing: Listing) -> None:
+        """Starts watching an auction. Watching an already watched auction replaces its listing."""
+        details = listing.auction_details
+        if details is None:
+            raise BadArgument("only auctions can be watched")
+
+        listing_id = listing.listing_id
+        entry = self._watched.get(listing_id)
+        if entry is None:
+            entry = self._watched[listing_id] = _Watched(listing, details.expires_at.timestamp())
+        else:
+            entry.listing = listing
+            entry.expires_at = details.expires_at.timestamp()
+        self._schedule(listing_id, self._next_due(entry, time.time()))
+
+    def unwatch(self, listing_id: str) -> Optional[Listing]:
+        """Stops watching an auction and returns its last known listing."""
+        entry = self._watched.pop(listing_id, None)
+        return entry.listing if entry is not None else None
+
+    def get(self, listing_id: str) -> Optional[Listing]:
+        """Returns the last known listing of a watched auction."""
+        entry = self._watched.get(listing_id)
+        return entry.listing if entry is not None else None
+
+    def stop(self) -> None:
+        """Stops :meth:`run` after the refreshes in flight."""
+        self._running = False
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """*coroutine*
+        Refreshes the watched auctions until :meth:`stop` is called.
+        """
+        self._running = True
+        try:
+            while self._running:
+                self._wakeup.clear()
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, listing_id, version = heapq.heappop(self._heap)
+                    entry = self._watched.get(listing_id)
+                    if entry is None or entry.version != version:
+                        continue
+                    await self._semaphore.acquire()
+                    task = asyncio.create_task(self._refresh(listing_id, entry))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                timeout = self._heap[0][0] - time.time() if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _refresh(self, listing_id: str, entry: _Watched) -> None:
+        # retried soon unless the refresh succeeds or the auction is dropped on purpose
+        due: Optional[float] = time.time() + self.min_interval
+        try:
+            try:
+                listing = await self.client.get_listing(listing_id, priority=self.priority)  # type: ignore
+            except NotFound:
+                _log.info(f"Auction {listing_id} does not exist anymore, stop watching it")
+                self._watched.pop(listing_id, None)
+                due = None
+                return
+            except Exception as e:
+                # HTTP errors, timeouts and transport errors alike; the auction must not fall off the heap
+                _log.warning(f"Refreshing auction {listing_id} failed: {e!r}")
+                return
+
+            old = entry.listing
+            entry.listing = listing
+            details = listing._auction_details
+            if details and details.get("expires_at"):
+                entry.expires_at = listing.auction_details.expires_at.timestamp()  # type: ignore
+
+            now = time.time()
+            if listing.state != "listed" or entry.expires_at < now:
+                self._watched.pop(listing_id, None)
+                due = None
+            else:
+                due = self._next_due(entry, now)
+
+            if self.on_update is not None and _auction_state(old) != _auction_state(listing):
+                try:
+                    result = self.on_update(old, listing)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    _log.exception(f"on_update failed for auction {listing_id}")
+        finally:
+            self._semaphore.release()
+            # an auction unwatched in the meantime stays unwatched
+            if due is not None and self._watched.get(listing_id) is entry:
+                self._schedule(listing_id, due)
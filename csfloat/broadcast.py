@@ -0,0 +1,258 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+from typing import Any, List, Optional
+
+from .enums import SlowConsumerPolicy
+from .errors import BadArgument
+from .iterators import ListingAsyncIterator
+from .listing import Listing
+
+__all__ = (
+    "BroadcastConsumer",
+    "ListingBroadcast",
+)
+
+
+class _End:
+    __slots__ = ("error",)
+
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+
+
+class BroadcastConsumer:
+    """An async iterator over the listings of a :class:`ListingBroadcast`.
+
+    Created by :meth:`ListingBroadcast.subscribe`. A consumer that stops iterating before the end
+    has to be closed with :meth:`aclose`, otherwise its full buffer blocks the broadcast under the
+    ``block`` policy.
+    """
+
+    __slots__ = (
+        "_queue",
+        "_maxsize",
+        "_space",
+        "_policy",
+        "_detached",
+        "_dropped",
+        "_finished",
+    )
+
+    def __init__(self, *, maxsize: int, policy: SlowConsumerPolicy) -> None:
+        # the queue itself is unbounded so the end marker always fits, the limit is enforced in _deliver
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._maxsize = maxsize
+        self._space = asyncio.Event()
+        self._policy = policy
+        self._detached = False
+        self._dropped = 0
+        self._finished = False
+
+    def __repr__(self) -> str:
+        return f"<BroadcastConsumer policy={self._policy} pending={self.pending} dropped={self._dropped} detached={self._detached}>"
+
+    def __aiter__(self) -> "BroadcastConsumer":
+        return self
+
+    async def __anext__(self) -> Listing:
+        if self._finished:
+            raise StopAsyncIteration
+
+        element = await self._queue.get()
+        self._space.set()
+        if isinstance(element, _End):
+            self._finished = True
+            if element.error is not None:
+                raise element.error
+            raise StopAsyncIteration
+        return element
+
+    @property
+    def policy(self) -> SlowConsumerPolicy:
+        """:class:`SlowConsumerPolicy`: Returns the policy applied when the buffer is full."""
+        return self._policy
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: Returns the number of buffered listings."""
+        return self._queue.qsize()
+
+    @property
+    def dropped(self) -> int:
+        """:class:`int`: Returns the number of listings dropped by the ``drop_oldest`` policy."""
+        return self._dropped
+
+    @property
+    def detached(self) -> bool:
+        """:class:`bool`: Returns whether the consumer was detached by the ``detach`` policy or closed."""
+        return self._detached
+
+    async def aclose(self) -> None:
+        """*coroutine*
+        Unsubscribes the consumer and ends its iteration. The broadcast skips it from now on.
+        """
+        self._detach()
+        self._finished = True
+
+    def _detach(self) -> None:
+        self._detached = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        # wakes up a broadcast blocked on the full buffer
+        self._space.set()
+
+    def _full(self) -> bool:
+        return self._queue.qsize() >= self._maxsize
+
+    async def _deliver(self, listing: Listing) -> None:
+        if self._detached:
+            return
+
+        if not self._full():
+            self._queue.put_nowait(listing)
+        elif self._policy is SlowConsumerPolicy.block:
+            while self._full():
+                self._space.clear()
+                await self._space.wait()
+                if self._detached:
+                    return
+            self._queue.put_nowait(listing)
+        elif self._policy is SlowConsumerPolicy.drop_oldest:
+            self._queue.get_nowait()
+            self._dropped += 1
+            self._queue.put_nowait(listing)
+        else:
+            self._detach()
+            self._queue.put_nowait(_End())
+
+    def _close(self, error: Optional[BaseException] = None) -> None:
+        if not self._detached:
+            self._queue.put_nowait(_End(error))
+
+
+class ListingBroadcast:
+    """Fans the listings of a single :class:`ListingAsyncIterator` out to multiple consumers.
+
+    Every page is fetched once and every :class:`Listing` is built once and shared by all
+    consumers. Each consumer has its own bounded buffer and a :class:`SlowConsumerPolicy` that
+    decides what happens when it is full:
+
+    - ``block``: the broadcast waits, which slows down every consumer and the crawl.
+    - ``drop_oldest``: the oldest buffered listing of that consumer is discarded.
+    - ``detach``: the consumer is removed from the broadcast and its iteration ends.
+
+    Consumers have to subscribe before :meth:`start` to receive every listing. A consumer that
+    stops early is removed with :meth:`BroadcastConsumer.aclose` or :meth:`unsubscribe`.
+
+    .. code-block:: python3
+
+        broadcast = ListingBroadcast(await client.fetch_all_listings(min_price=100))
+        fast = broadcast.subscribe(maxsize=500, policy=SlowConsumerPolicy.drop_oldest)
+        slow = broadcast.subscribe()
+        broadcast.start()
+
+        async for listing in slow:
+            if listing.price > 100:
+                await slow.aclose()
+                break
+    """
+
+    __slots__ = (
+        "_iterator",
+        "_consumers",
+        "_task",
+        "_count",
+    )
+
+    def __init__(self, iterator: ListingAsyncIterator) -> None:
+        self._iterator = iterator
+        self._consumers: List[BroadcastConsumer] = []
+        self._task: Optional[asyncio.Task[int]] = None
+        self._count = 0
+
+    def __repr__(self) -> str:
+        return f"<ListingBroadcast consumers={len(self.consumers)} listings={self._count}>"
+
+    @property
+    def consumers(self) -> List[BroadcastConsumer]:
+        """List[:class:`BroadcastConsumer`]: Returns the attached consumers."""
+        return [consumer for consumer in self._consumers if not consumer.detached]
+
+    @property
+    def count(self) -> int:
+        """:class:`int`: Returns the number of listings broadcast so far."""
+        return self._count
+
+    def subscribe(
+        self,
+        *,
+        maxsize: int = 1000,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.block,
+    ) -> BroadcastConsumer:
+        """Adds a consumer with a buffer of ``maxsize`` listings."""
+        if maxsize <= 0:
+            raise BadArgument("maxsize has to be a positive integer")
+
+        consumer = BroadcastConsumer(maxsize=maxsize, policy=policy)
+        self._consumers.append(consumer)
+        return consumer
+
+    def unsubscribe(self, consumer: BroadcastConsumer) -> None:
+        """Removes a consumer; its iteration ends and the broadcast no longer waits for it."""
+        consumer._detach()
+        consumer._finished = True
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def start(self) -> "asyncio.Task[int]":
+        """Starts broadcasting in a background task and returns it."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self) -> int:
+        """*coroutine*
+        Broadcasts every remaining listing of the iterator and returns their number.
+
+        Errors raised by the iterator are re-raised here and by every consumer.
+        """
+        error: Optional[BaseException] = None
+        try:
+            async for page in self._iterator.pages():
+                listings = [Listing(data=data, identity_map=self._iterator.identity_map) for data in page]
+                for listing in listings:
+                    for consumer in self.consumers:
+                        await consumer._deliver(listing)
+                self._count += len(listings)
+                if not self.consumers:
+                    break
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            for consumer in self._consumers:
+                consumer._close(error)
+        return self._count
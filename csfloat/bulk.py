@@ -0,0 +1,343 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import os
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from .enums import ListingType
+from .errors import BadArgument
+from .item import Item
+from .listing import Listing
+
+__all__ = (
+    "ListingRequest",
+    "RepriceRequest",
+    "BulkJournal",
+    "BulkItemResult",
+    "BulkResult",
+)
+
+T = TypeVar("T")
+
+
+AUCTION_DURATIONS = (1, 3, 5, 7, 14)
+MAX_DESCRIPTION_LENGTH = 32
+
+
+class ListingRequest:
+    """Represents an item that should be listed.
+
+    Parameters
+    ----------
+    item: Union[:class:`Item`, :class:`str`, :class:`int`]
+        The inventory item or its asset ID.
+    price: :class:`int`
+        The buy now price, or the reserve price of an auction, in cents.
+    type: :class:`ListingType`
+        The type of listing.
+    duration_days: Optional[:class:`int`]
+        The duration of an auction, one of 1, 3, 5, 7 or 14.
+    description: Optional[:class:`str`]
+        A description of at most 32 characters.
+    max_offer_discount: Optional[:class:`int`]
+        The maximum offer discount of a buy now listing.
+    private: :class:`bool`
+        Whether the listing is private.
+    """
+
+    __slots__ = (
+        "asset_id",
+        "price",
+        "type",
+        "duration_days",
+        "description",
+        "max_offer_discount",
+        "private",
+    )
+
+    def __init__(
+        self,
+        item: Union[Item, str, int],
+        price: int,
+        *,
+        type: ListingType = ListingType.buy_now,
+        duration_days: Optional[int] = None,
+        description: Optional[str] = "",
+        max_offer_discount: Optional[int] = None,
+        private: bool = False,
+    ) -> None:
+        self.asset_id: Union[str, int] = item.asset_id if isinstance(item, Item) else item
+        self.price: int = price
+        self.type: ListingType = type
+        self.duration_days: Optional[int] = duration_days
+        self.description: Optional[str] = description
+        self.max_offer_discount: Optional[int] = max_offer_discount
+        self.private: bool = private
+
+    def __repr__(self) -> str:
+        return f"<ListingRequest asset_id={self.asset_id!r} price={self.price!r} type={self.type!r}>"
+
+    def validate(self) -> None:
+        """Checks the arguments without sending anything.
+
+        Raises
+        ------
+        :exc:`BadArgument`
+            An argument is invalid.
+        """
+        if isinstance(self.description, str) and len(self.description) > MAX_DESCRIPTION_LENGTH:
+            raise BadArgument(f"description can't be longer than {MAX_DESCRIPTION_LENGTH} characters")
+        if self.price <= 0:
+            raise BadArgument("price has to be positive")
+        if self.type is ListingType.auction:
+            if self.duration_days not in AUCTION_DURATIONS:
+                raise BadArgument("duration_days has to be a value of 1, 3, 5, 7 or 14")
+            if self.max_offer_discount is not None:
+                raise BadArgument("max_offer_discount is only supported for buy now listings")
+
+    def to_params(self) -> Dict[str, Any]:
+        """Validates the request and returns the body of the listing request."""
+        self.validate()
+
+        params: Dict[str, Any] = {
+            "type": self.type.value,
+            "asset_id": self.asset_id,
+            "private": self.private,
+        }
+        if self.type is ListingType.auction:
+            params["reserve_price"] = self.price
+            params["duration_days"] = self.duration_days
+        else:
+            params["price"] = self.price
+            if self.max_offer_discount is not None:
+                params["max_offer_discount"] = self.max_offer_discount
+
+        if self.description != "":
+            params["description"] = self.description
+        return params
+
+
+class RepriceRequest:
+    """Represents a listing that should be relisted for a new price.
+
+    Repricing unlists the listing and lists its asset again as buy now listing.
+
+    Parameters
+    ----------
+    listing_id: Union[:class:`str`, :class:`int`]
+        The ID of the current listing.
+    asset_id: Union[:class:`str`, :class:`int`]
+        The asset ID of the listed item.
+    price: :class:`int`
+        The new price in cents.
+    description: Optional[:class:`str`]
+        The description of the new listing.
+    max_offer_discount: Optional[:class:`int`]
+        The maximum offer discount of the new listing.
+    private: :class:`bool`
+        Whether the new listing is private.
+    """
+
+    __slots__ = (
+        "listing_id",
+        "listing",
+    )
+
+    def __init__(
+        self,
+        listing_id: Union[str, int],
+        asset_id: Union[str, int],
+        price: int,
+        *,
+        description: Optional[str] = "",
+        max_offer_discount: Optional[int] = None,
+        private: bool = False,
+    ) -> None:
+        self.listing_id: str = str(listing_id)
+        self.listing: ListingRequest = ListingRequest(
+            asset_id,
+            price,
+            description=description,
+            max_offer_discount=max_offer_discount,
+            private=private,
+        )
+
+    def __repr__(self) -> str:
+        return f"<RepriceRequest listing_id={self.listing_id!r} price={self.listing.price!r}>"
+
+    @classmethod
+    def from_listing(cls, listing: Listing, price: int) -> "RepriceRequest":
+        """Creates a request that keeps the description and offer settings of ``listing``."""
+        return cls(
+            listing.listing_id,
+            listing.item.asset_id,
+            price,
+            description=listing.description or "",
+            max_offer_discount=listing._max_offer_discount,
+        )
+
+
+class BulkJournal:
+    """Records which steps of a bulk operation succeeded so an interrupted batch can be resumed.
+
+    With a ``path`` every step is appended to a file as a JSON line and the file is loaded again
+    when the journal is created, so passing the same path to a new journal resumes the batch.
+    Without a path the journal only lives in memory.
+    """
+
+    __slots__ = (
+        "_path",
+        "_steps",
+    )
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._steps: Dict[Tuple[str, str], Any] = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a torn last line of an interrupted write
+                        continue
+                    self._steps[(entry["key"], entry["step"])] = entry.get("data")
+
+    def __repr__(self) -> str:
+        return f"<BulkJournal path={self._path!r} steps={len(self._steps)}>"
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def done(self, key: str, step: str) -> bool:
+        """Returns whether ``step`` already succeeded for ``key``."""
+        return (key, step) in self._steps
+
+    def get(self, key: str, step: str) -> Any:
+        """Returns the data recorded with a step."""
+        return self._steps.get((key, step))
+
+    def keys(self, step: str) -> List[str]:
+        """Returns the keys ``step`` succeeded for, in the order they were recorded."""
+        return [key for key, recorded in self._steps if recorded == step]
+
+    def record(self, key: str, step: str, data: Any = None) -> None:
+        """Records that ``step`` succeeded for ``key``."""
+        self._steps[(key, step)] = data
+        if self._path is not None:
+            with open(self._path, "a", encoding="utf-8") as fp:
+                fp.write(json.dumps({"key": key, "step": step, "data": data}, separators=(",", ":")) + "\n")
+
+    def clear(self) -> None:
+        """Forgets all steps and truncates the file."""
+        self._steps.clear()
+        if self._path is not None:
+            open(self._path, "w", encoding="utf-8").close()
+
+
+class BulkItemResult(Generic[T]):
+    """Represents the outcome of a single operation of a bulk request."""
+
+    __slots__ = (
+        "_request",
+        "_result",
+        "_error",
+    )
+
+    def __init__(self, *, request: Any, result: Optional[T] = None, error: Optional[Exception] = None) -> None:
+        self._request = request
+        self._result = result
+        self._error = error
+
+    def __repr__(self) -> str:
+        return f"<BulkItemResult request={self._request!r} success={self.success} error={self._error!r}>"
+
+    @property
+    def request(self) -> Any:
+        """Returns the request of the operation."""
+        return self._request
+
+    @property
+    def result(self) -> Optional[T]:
+        """Returns the result of the operation, e.g. the created :class:`Listing`, if it succeeded."""
+        return self._result
+
+    @property
+    def error(self) -> Optional[Exception]:
+        """Optional[:class:`Exception`]: Returns the error that made the operation fail."""
+        return self._error
+
+    @property
+    def success(self) -> bool:
+        """:class:`bool`: Returns whether the operation succeeded."""
+        return self._error is None
+
+
+class BulkResult(Generic[T]):
+    """Represents the report of a bulk request. The results are in the order of the requests."""
+
+    __slots__ = (
+        "_results",
+        "_elapsed",
+    )
+
+    def __init__(self, *, results: List[BulkItemResult[T]], elapsed: float) -> None:
+        self._results = results
+        self._elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return f"<BulkResult succeeded={len(self.succeeded)} failed={len(self.failed)} elapsed={self._elapsed:.2f}>"
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self._results)
+
+    @property
+    def results(self) -> List[BulkItemResult[T]]:
+        """List[:class:`BulkItemResult`]: Returns the result of every request."""
+        return self._results
+
+    @property
+    def succeeded(self) -> List[BulkItemResult[T]]:
+        """List[:class:`BulkItemResult`]: Returns the successful results."""
+        return [result for result in self._results if result.success]
+
+    @property
+    def failed(self) -> List[BulkItemResult[T]]:
+        """List[:class:`BulkItemResult`]: Returns the failed results."""
+        return [result for result in self._results if not result.success]
+
+    @property
+    def elapsed(self) -> float:
+        """:class:`float`: Returns the duration of the bulk request in seconds."""
+        return self._elapsed
+
+    @property
+    def throughput(self) -> float:
+        """:class:`float`: Returns the number of processed requests per second."""
+        return len(self._results) / self._elapsed if self._elapsed > 0 else 0.0
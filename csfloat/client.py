@@ -22,14 +22,27 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import asyncio
+import contextlib
+import functools
 import logging
-from typing import List, Optional
+import time
+from concurrent.futures import Executor
+from typing import AsyncContextManager, Dict, Iterable, List, Optional, Union
 
+from .bulk import BulkItemResult, BulkJournal, BulkResult, ListingRequest, RepriceRequest
+from .concurrency import AdaptiveLimiter, HedgingPolicy
+from .enums import ListingType, RequestPriority
 from .errors import BadArgument
 from .http import HTTPClient
+from .identity import IdentityMap
 from .item import Item
 from .iterators import ListingAsyncIterator
 from .listing import Listing
+from .profiling import PipelineProfiler
+from .scheduler import PriorityScheduler
+from .tracing import Tracer, traced
+from .transport import Transport
 from .user import AuthenticatedUser, User
 
 __all__ = ("Client",)
@@ -38,43 +51,110 @@ __all__ = ("Client",)
 _log = logging.getLogger(__name__)
 
 
+def _bulk_slots(concurrency: Optional[int]) -> AsyncContextManager:
+    # without a fixed concurrency the AdaptiveLimiter of the HTTPClient decides how many requests run
+    if concurrency is None:
+        return contextlib.nullcontext()
+    if concurrency <= 0:
+        raise BadArgument("concurrency has to be a positive integer")
+    return asyncio.Semaphore(concurrency)
+
+
 class Client:
-    def __init__(self, debug: bool = False):
-        self.http: HTTPClient = HTTPClient()
+    def __init__(
+        self,
+        debug: bool = False,
+        *,
+        identity_map: Optional[IdentityMap] = None,
+        executor: Optional[Executor] = None,
+        profiler: Optional[PipelineProfiler] = None,
+        tracer: Optional[Tracer] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        timeout: Optional[float] = 30.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+    ):
+        self.http: HTTPClient = HTTPClient(
+            executor=executor,
+            profiler=profiler,
+            tracer=tracer,
+            base_url=base_url,
+            transport=transport,
+            limiter=limiter,
+            timeout=timeout,
+            timeouts=timeouts,
+            hedging=hedging,
+            scheduler=scheduler,
+        )
+        self.identity_map: Optional[IdentityMap] = identity_map
 
     def set_api_key(self, *, api_key: str):
         self.http.set_api_key(api_key)
 
     async def close(self) -> None:
         """*coroutine*
-        Closes the `aiohttp.ClientSession`.
+        Closes the transport, e.g. its `aiohttp.ClientSession`.
         """
         await self.http.close()
 
-    async def fetch_all_listings(self, **kwargs) -> ListingAsyncIterator:
+    async def fetch_all_listings(
+        self, *, prefetch: Optional[int] = None, priority: RequestPriority = RequestPriority.low, **kwargs
+    ) -> ListingAsyncIterator:
         """*coroutine*
         Returns an AsyncIterator that iterates over **all** listings of csfloat. The result can be filtered by passing parameters as `kwargs` to the method.
         A list of accepted parameters can be found at the `CSFloat documentation <https://docs.csfloat.com/#get-all-listings>`_.
 
+        Following pages are requested while the current one is consumed. ``prefetch`` sets how many;
+        by default it follows the limit of the client's :class:`AdaptiveLimiter`. Pass ``0`` to fetch
+        one page at a time.
+
+        An iterator that is left before its end has to be closed, or its prefetched requests keep
+        running and holding slots of the limiter. Use it as an async context manager or call
+        :meth:`ListingAsyncIterator.aclose`:
+
+        .. code-block:: python3
+
+            async with await client.fetch_all_listings(min_price=100) as listings:
+                async for listing in listings:
+                    if listing.price > 50:
+                        break
+
+        The pages are requested with ``priority``, by default :attr:`RequestPriority.low`.
 
         Returns
         -------
         :class:`ListingAsyncIterator` of :class:`Listing`
         """
 
-        return ListingAsyncIterator(self.http.get_all_listings, **kwargs)
-
-    async def get_listing(self, id: int) -> Listing:
+        return ListingAsyncIterator(
+            functools.partial(self.http.get_all_listings, priority=priority),
+            identity_map=self.identity_map,
+            executor=self.http.executor,
+            profiler=self.http.profiler,
+            tracer=self.http.tracer,
+            limiter=self.http.limiter,
+            prefetch=prefetch,
+            **kwargs,
+        )
+
+    @traced("Client.get_listing")
+    async def get_listing(self, id: int, *, priority: RequestPriority = RequestPriority.high) -> Listing:
         """*coroutine*
         Return a specific listing.
 
+        This is requested with :attr:`RequestPriority.high` unless another ``priority`` is given.
+
         Returns
         -------
         :class:`Listing`
         """
-        data = await self.http.get_listing(item_id=id)
-        return Listing(data=data)
+        data = await self.http.get_listing(item_id=id, priority=priority)
+        return Listing(data=data, identity_map=self.identity_map)
 
+    @traced("Client.get_user")
     async def get_user(self, id: int) -> User:
         """*coroutine*
         Return a specific user.
@@ -86,7 +166,10 @@ class Client:
         data = await self.http.get_user(user_id=id)
         return User(data=data)
 
-    async def get_user_stall(self, id: int, *, limit: int = 40, **kwargs) -> List[Listing]:
+    @traced("Client.get_user_stall")
+    async def get_user_stall(
+        self, id: int, *, limit: int = 40, priority: RequestPriority = RequestPriority.low, **kwargs
+    ) -> List[Listing]:
         """*coroutine*
         Return the listings in a stall of a specific user.
 
@@ -102,9 +185,10 @@ class Client:
             "limit": limit,
         }
         params = params | kwargs
-        data = await self.http.get_user_stall(user_id=id, params=params)
-        return [Listing(data=listing_data) for listing_data in data["data"]]
+        data = await self.http.get_user_stall(user_id=id, params=params, priority=priority)
+        return [Listing(data=listing_data, identity_map=self.identity_map) for listing_data in data["data"]]
 
+    @traced("Client.me")
     async def me(self) -> AuthenticatedUser:
         """*coroutine*
         Returns the authenticated user.
@@ -116,6 +200,7 @@ class Client:
         data = await self.http.me()
         return AuthenticatedUser(data=data["user"])
 
+    @traced("Client.get_inventory")
     async def get_inventory(self) -> List[Item]:
         """*coroutine*
         Return a list of the items in the user's inventory.
@@ -127,6 +212,7 @@ class Client:
         data = await self.http.get_inventory()
         return [Item(data=item_data) for item_data in data]
 
+    @traced("Client.list_item_as_buy_now")
     async def list_item_as_buy_now(
         self,
         asset_id: str | int,
@@ -136,48 +222,171 @@ class Client:
         description: Optional[str] = "",
         private: bool = False,
     ) -> Listing:
-        if isinstance(description, str) and len(description) > 32:
-            raise BadArgument("description can't be longer than 32 characters")
-
-        params = {
-            "type": "buy_now",
-            "asset_id": asset_id,
-            "price": price,
-            "private": private,
-        }
-
-        if max_offer_discount is not None:
-            params["max_offer_discount"] = max_offer_discount
-
-        if description != "":
-            params["description"] = description
-
-        data = await self.http.list_item(parameters=params)
+        request = ListingRequest(
+            asset_id,
+            price,
+            type=ListingType.buy_now,
+            max_offer_discount=max_offer_discount,
+            description=description,
+            private=private,
+        )
+        data = await self.http.list_item(parameters=request.to_params())
         return Listing(data=data)
 
+    @traced("Client.list_item_as_auction")
     async def list_item_as_auction(
         self, asset_id: str | int, price: int, duration_days: int, *, description: Optional[str] = "", private: bool = False
     ) -> Listing:
-        if duration_days not in [1, 3, 5, 7, 14]:
-            raise BadArgument("duration_days has to be a value of 1, 3, 5, 7 or 14")
+        request = ListingRequest(
+            asset_id,
+            price,
+            type=ListingType.auction,
+            duration_days=duration_days,
+            description=description,
+            private=private,
+        )
+        data = await self.http.list_item(parameters=request.to_params())
+        return Listing(data=data)
 
-        if isinstance(description, str) and len(description) > 32:
-            raise BadArgument("description can't be longer than 32 characters")
+    @traced("Client.bulk_list_items")
+    async def bulk_list_items(
+        self,
+        requests: Iterable[ListingRequest],
+        *,
+        concurrency: Optional[int] = None,
+        priority: RequestPriority = RequestPriority.normal,
+    ) -> BulkResult[Listing]:
+        """*coroutine*
+        Lists multiple items with at most ``concurrency`` requests in flight. By default the
+        :class:`AdaptiveLimiter` of the client decides how many requests run at once.
 
-        params = {
-            "type": "auction",
-            "asset_id": asset_id,
-            "reserve_price": price,
-            "duration_days": duration_days,
-            "private": private,
-        }
+        Every request is validated before anything is sent. Invalid requests and requests that fail
+        are reported in the result instead of raising, so one failure doesn't stop the others.
 
-        if description != "":
-            params["description"] = description
+        Returns
+        -------
+        :class:`BulkResult` of :class:`Listing`
+        """
+        requests = list(requests)
+        start = time.perf_counter()
+        slots = _bulk_slots(concurrency)
+
+        # validate everything up front, so an invalid request is reported before anything is listed
+        validated: List[Union[Dict, BadArgument]] = []
+        for request in requests:
+            try:
+                validated.append(request.to_params())
+            except BadArgument as e:
+                validated.append(e)
+
+        async def run(request: ListingRequest, params: Union[Dict, BadArgument]) -> BulkItemResult[Listing]:
+            if isinstance(params, BadArgument):
+                return BulkItemResult(request=request, error=params)
+
+            async with slots:
+                try:
+                    data = await self.http.list_item(parameters=params, priority=priority)
+                except Exception as e:
+                    # HTTP errors, timeouts and transport errors are reported per item
+                    _log.info(f"Listing asset {request.asset_id} failed: {e!r}")
+                    return BulkItemResult(request=request, error=e)
+            return BulkItemResult(request=request, result=Listing(data=data))
+
+        results = await asyncio.gather(*(run(request, params) for request, params in zip(requests, validated)))
+        return BulkResult(results=list(results), elapsed=time.perf_counter() - start)
+
+    @traced("Client.unlist_item")
+    async def unlist_item(self, listing_id: int, *, priority: RequestPriority = RequestPriority.high):
+        data = await self.http.unlist_item(listing_id=listing_id, priority=priority)
+        return data
 
-        data = await self.http.list_item(parameters=params)
-        return Listing(data=data)
+    @traced("Client.bulk_unlist_items")
+    async def bulk_unlist_items(
+        self,
+        listing_ids: Iterable[Union[str, int]],
+        *,
+        concurrency: Optional[int] = None,
+        priority: RequestPriority = RequestPriority.normal,
+        journal: Optional[BulkJournal] = None,
+    ) -> BulkResult[Dict[str, str]]:
+        """*coroutine*
+        Unlists multiple listings with at most ``concurrency`` requests in flight. By default the
+        :class:`AdaptiveLimiter` of the client decides how many requests run at once.
 
-    async def unlist_item(self, listing_id: int):
-        data = await self.http.unlist_item(listing_id=listing_id)
-        return data
+        Listings the ``journal`` already records as unlisted are skipped.
+
+        Returns
+        -------
+        :class:`BulkResult`
+        """
+        journal = journal if journal is not None else BulkJournal()
+        start = time.perf_counter()
+        slots = _bulk_slots(concurrency)
+
+        async def run(listing_id: str) -> BulkItemResult[Dict[str, str]]:
+            if journal.done(listing_id, "unlist"):
+                return BulkItemResult(request=listing_id, result=journal.get(listing_id, "unlist"))
+
+            async with slots:
+                try:
+                    data = await self.http.unlist_item(listing_id=listing_id, priority=priority)  # type: ignore
+                except Exception as e:
+                    # HTTP errors, timeouts and transport errors are reported per item
+                    _log.info(f"Unlisting {listing_id} failed: {e!r}")
+                    return BulkItemResult(request=listing_id, error=e)
+            journal.record(listing_id, "unlist", data)
+            return BulkItemResult(request=listing_id, result=data)
+
+        results = await asyncio.gather(*(run(str(listing_id)) for listing_id in listing_ids))
+        return BulkResult(results=list(results), elapsed=time.perf_counter() - start)
+
+    @traced("Client.bulk_reprice_items")
+    async def bulk_reprice_items(
+        self,
+        requests: Iterable[RepriceRequest],
+        *,
+        concurrency: Optional[int] = None,
+        priority: RequestPriority = RequestPriority.normal,
+        journal: Optional[BulkJournal] = None,
+    ) -> BulkResult[Listing]:
+        """*coroutine*
+        Relists multiple listings for new prices.
+
+        Each listing is unlisted and its asset listed again; up to ``concurrency`` listings are
+        processed at the same time, by default as many as the :class:`AdaptiveLimiter` of the
+        client allows. Every successful step is recorded in ``journal``, so running the same
+        requests with the same journal again resumes an interrupted batch without unlisting or
+        listing anything twice. Failures are reported per listing instead of raising.
+
+        Returns
+        -------
+        :class:`BulkResult` of :class:`Listing`
+        """
+        journal = journal if journal is not None else BulkJournal()
+        start = time.perf_counter()
+        slots = _bulk_slots(concurrency)
+
+        async def run(request: RepriceRequest) -> BulkItemResult[Listing]:
+            key = request.listing_id
+            try:
+                params = request.listing.to_params()
+            except BadArgument as e:
+                return BulkItemResult(request=request, error=e)
+
+            if journal.done(key, "list"):
+                return BulkItemResult(request=request, result=Listing(data=journal.get(key, "list")))
+
+            async with slots:
+                try:
+                    if not journal.done(key, "unlist"):
+                        unlisted = await self.http.unlist_item(listing_id=key, priority=priority)  # type: ignore
+                        journal.record(key, "unlist", unlisted)
+                    data = await self.http.list_item(parameters=params, priority=priority)
+                except Exception as e:
+                    _log.info(f"Repricing {key} failed: {e!r}")
+                    return BulkItemResult(request=request, error=e)
+            journal.record(key, "list", data)
+            return BulkItemResult(request=request, result=Listing(data=data))
+
+        results = await asyncio.gather(*(run(request) for request in requests))
+        return BulkResult(results=list(results), elapsed=time.perf_counter() - start)
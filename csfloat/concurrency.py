@@ -0,0 +1,370 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import collections
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional
+
+from .errors import BadArgument
+
+if TYPE_CHECKING:
+    from .scheduler import PriorityScheduler
+
+__all__ = (
+    "LimiterDecision",
+    "AdaptiveLimiter",
+    "HedgingPolicy",
+)
+
+
+_log = logging.getLogger(__name__)
+
+
+class LimiterDecision:
+    """Represents a change of the limit of an :class:`AdaptiveLimiter`."""
+
+    __slots__ = (
+        "_timestamp",
+        "_action",
+        "_limit",
+        "_reason",
+    )
+
+    def __init__(self, *, timestamp: float, action: str, limit: int, reason: str) -> None:
+        self._timestamp = timestamp
+        self._action = action
+        self._limit = limit
+        self._reason = reason
+
+    def __repr__(self) -> str:
+        return f"<LimiterDecision action={self._action!r} limit={self._limit} reason={self._reason!r}>"
+
+    @property
+    def timestamp(self) -> float:
+        """:class:`float`: Returns the :func:`time.time` of the decision."""
+        return self._timestamp
+
+    @property
+    def action(self) -> str:
+        """:class:`str`: Returns ``"increase"`` or ``"decrease"``."""
+        return self._action
+
+    @property
+    def limit(self) -> int:
+        """:class:`int`: Returns the limit after the decision."""
+        return self._limit
+
+    @property
+    def reason(self) -> str:
+        """:class:`str`: Returns why the limit changed, e.g. ``"status 429"`` or ``"latency"``."""
+        return self._reason
+
+
+class AdaptiveLimiter:
+    """Limits the number of requests in flight and adapts the limit with AIMD.
+
+    Every successful request with a healthy latency raises the limit by ``increase / limit``,
+    i.e. by about ``increase`` per round of ``limit`` requests. A 429 or 5xx response, a failed
+    request or a latency above ``latency_tolerance`` times the moving average multiplies the limit
+    by ``backoff``. Only one decrease happens per round: requests that were sent before the last
+    decrease can't decrease the limit again.
+
+    :class:`HTTPClient` creates one by default, so everything sharing a client shares its limit.
+
+    Parameters
+    ----------
+    initial: :class:`int`
+        The limit to start with.
+    min_limit: :class:`int`
+        The limit never goes below this.
+    max_limit: :class:`int`
+        The limit never goes above this.
+    increase: :class:`float`
+        The additive increase per round.
+    backoff: :class:`float`
+        The multiplicative decrease, between 0 and 1.
+    latency_tolerance: :class:`float`
+        How many times slower than the average a response may be before it counts as a latency spike.
+    history: :class:`int`
+        The number of decisions kept in :attr:`decisions`.
+    on_decision: Optional[Callable[[:class:`LimiterDecision`], Any]]
+        Called with every decision, e.g. to export the limit as a metric.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        latency_tolerance: float = 3.0,
+        history: int = 100,
+        on_decision: Optional[Callable[[LimiterDecision], Any]] = None,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise BadArgument("min_limit <= initial <= max_limit has to hold and min_limit has to be at least 1")
+        if increase <= 0:
+            raise BadArgument("increase has to be a positive number")
+        if not 0 < backoff < 1:
+            raise BadArgument("backoff has to be between 0 and 1")
+        if latency_tolerance <= 1:
+            raise BadArgument("latency_tolerance has to be greater than 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.on_decision = on_decision
+        self.decisions: Deque[LimiterDecision] = collections.deque(maxlen=history)
+
+        self._limit: float = float(initial)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        # the average latency of successful requests, None until the first one
+        self._latency: Optional[float] = None
+        # incremented on every decrease; requests remember the epoch they were sent in
+        self._epoch = 0
+        self.successes = 0
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"<AdaptiveLimiter limit={self.limit} in_flight={self._in_flight} waiting={len(self._waiters)}>"
+
+    @property
+    def limit(self) -> int:
+        """:class:`int`: Returns the current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """:class:`int`: Returns the number of requests in flight."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """:class:`int`: Returns the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Optional[:class:`float`]: Returns the moving average latency of successful requests in seconds."""
+        return self._latency
+
+    async def acquire(self) -> int:
+        """*coroutine*
+        Waits for a free slot and takes it.
+
+        Returns
+        -------
+        :class:`int`
+            A token to pass to :meth:`release`.
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return self._epoch
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed to us, pass it on
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(future)
+            raise
+        return self._epoch
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def release(self, token: int, *, latency: Optional[float], status: Optional[int] = None, error: bool = False) -> None:
+        """Frees the slot taken by :meth:`acquire` and adapts the limit to the outcome of the request.
+
+        Parameters
+        ----------
+        token: :class:`int`
+            The value returned by :meth:`acquire`.
+        latency: Optional[:class:`float`]
+            The seconds the request took. ``None`` frees the slot without adapting the limit,
+            e.g. for a cancelled request.
+        status: Optional[:class:`int`]
+            The status code of the response, if there is one.
+        error: :class:`bool`
+            Whether the request failed without a response, e.g. on a connection error or timeout.
+        """
+        self._in_flight -= 1
+
+        if latency is None:
+            pass
+        elif error or status == 429 or (status is not None and status >= 500):
+            self.failures += 1
+            self._decrease_limit(token, "error" if error else f"status {status}")
+        else:
+            self.successes += 1
+            spike = self._latency is not None and latency > self._latency * self.latency_tolerance
+            # spikes count towards the average too, so a lasting change of latency becomes the new normal
+            self._latency = latency if self._latency is None else self._latency * 0.9 + latency * 0.1
+            if spike:
+                self._decrease_limit(token, "latency")
+            else:
+                self._increase_limit()
+
+        self._wake()
+
+    def _increase_limit(self) -> None:
+        before = self.limit
+        self._limit = min(self._limit + self.increase / self._limit, float(self.max_limit))
+        if self.limit > before:
+            self._decide("increase", "healthy")
+
+    def _decrease_limit(self, token: int, reason: str) -> None:
+        if token != self._epoch:
+            return
+        self._epoch += 1
+        self._limit = max(self._limit * self.backoff, float(self.min_limit))
+        self._decide("decrease", reason)
+
+    def _decide(self, action: str, reason: str) -> None:
+        decision = LimiterDecision(timestamp=time.time(), action=action, limit=self.limit, reason=reason)
+        self.decisions.append(decision)
+        _log.debug(f"Adaptive limit {action}d to {decision.limit} ({reason})")
+        if self.on_decision is not None:
+            self.on_decision(decision)
+
+
+class _LatencyWindow:
+    __slots__ = ("samples", "_sorted", "_stale")
+
+    def __init__(self, size: int) -> None:
+        self.samples: Deque[float] = collections.deque(maxlen=size)
+        self._sorted: List[float] = []
+        self._stale = 0
+
+    def add(self, latency: float) -> None:
+        self.samples.append(latency)
+        self._stale += 1
+
+    def percentile(self, q: float) -> float:
+        # re-sorting the window on every request would be wasteful, a few new samples don't move it much
+        if self._stale >= 16 or len(self._sorted) < len(self.samples):
+            self._sorted = sorted(self.samples)
+            self._stale = 0
+        return self._sorted[min(int(len(self._sorted) * q), len(self._sorted) - 1)]
+
+
+class HedgingPolicy:
+    """Decides when :class:`HTTPClient` sends a duplicate of a slow GET request.
+
+    The latencies of the recent requests of each route are tracked. Once a GET request has been
+    running for longer than the ``percentile`` latency of its route, a second identical request is
+    sent; the first response wins and the other request is cancelled. Hedges are capped to
+    ``max_ratio`` of the requests (plus a small ``burst``). They are only sent while the
+    :class:`AdaptiveLimiter` has a free slot and the :class:`PriorityScheduler` has budget to
+    spare above its reserve, and they are sent with :attr:`RequestPriority.low`, so they never
+    take budget reserved for or awaited by other requests.
+
+    Parameters
+    ----------
+    percentile: :class:`float`
+        The latency percentile after which a request is hedged, between 0 and 1.
+    max_ratio: :class:`float`
+        The maximum share of requests that may be hedged.
+    burst: :class:`int`
+        Hedges allowed on top of ``max_ratio``, e.g. right after start.
+    min_samples: :class:`int`
+        The number of latencies a route needs before its requests are hedged.
+    window: :class:`int`
+        The number of recent latencies kept per route.
+    min_delay: :class:`float`
+        The minimum seconds to wait before hedging.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.95,
+        max_ratio: float = 0.05,
+        burst: int = 2,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay: float = 0.01,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise BadArgument("percentile has to be between 0 and 1")
+        if not 0 <= max_ratio <= 1:
+            raise BadArgument("max_ratio has to be between 0 and 1")
+        if min_samples <= 0 or window < min_samples:
+            raise BadArgument("min_samples has to be positive and not greater than window")
+
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self._routes: Dict[str, _LatencyWindow] = {}
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def __repr__(self) -> str:
+        return f"<HedgingPolicy requests={self.requests} hedges={self.hedges} wins={self.wins}>"
+
+    def record(self, route: str, latency: float) -> None:
+        """Adds the latency of a completed request of ``route``."""
+        latencies = self._routes.get(route)
+        if latencies is None:
+            latencies = self._routes[route] = _LatencyWindow(self.window)
+        latencies.add(latency)
+
+    def delay(self, route: str) -> Optional[float]:
+        """Returns the seconds after which a request of ``route`` is hedged, ``None`` if it isn't."""
+        self.requests += 1
+        latencies = self._routes.get(route)
+        if latencies is None or len(latencies.samples) < self.min_samples:
+            return None
+        return max(latencies.percentile(self.percentile), self.min_delay)
+
+    def allow(self, limiter: AdaptiveLimiter, scheduler: Optional["PriorityScheduler"] = None) -> bool:
+        """Returns whether a hedge may be sent now and counts it if so."""
+        if self.hedges >= self.requests * self.max_ratio + self.burst:
+            return False
+        if limiter.in_flight >= limiter.limit or limiter.waiting:
+            return False
+        if scheduler is not None and not scheduler.spare:
+            return False
+        self.hedges += 1
+        return True
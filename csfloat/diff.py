@@ -0,0 +1,249 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import heapq
+import os
+import shutil
+import tempfile
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .enums import ChangeType
+from .errors import BadArgument
+from .listing import Listing
+
+__all__ = (
+    "Fingerprint",
+    "fingerprint",
+    "ChangeEvent",
+    "Snapshot",
+    "SnapshotWriter",
+    "diff_snapshots",
+)
+
+
+class Fingerprint(NamedTuple):
+    listing_id: str
+    price: int
+    watchers: int
+
+
+def fingerprint(listing: Union[Listing, Dict[str, Any]]) -> Fingerprint:
+    """Returns the :class:`Fingerprint` of a :class:`Listing` or raw listing dict. The price is in cents."""
+    if isinstance(listing, dict):
+        return Fingerprint(str(listing.get("id", "")), listing.get("price", 0), listing.get("watchers", 0))
+    return Fingerprint(str(listing._listing_id), listing._price, listing._watchers)
+
+
+class ChangeEvent:
+    """Represents a difference of a single listing between two snapshots."""
+
+    __slots__ = (
+        "_type",
+        "_old",
+        "_new",
+    )
+
+    def __init__(self, *, type: ChangeType, old: Optional[Fingerprint], new: Optional[Fingerprint]) -> None:
+        self._type = type
+        self._old = old
+        self._new = new
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent(type={self._type!r}, old={self._old!r}, new={self._new!r})"
+
+    @property
+    def type(self) -> ChangeType:
+        """:class:`ChangeType`: Returns the type of change."""
+        return self._type
+
+    @property
+    def listing_id(self) -> str:
+        """:class:`str`: Returns the ID of the listing."""
+        return (self._new or self._old).listing_id  # type: ignore
+
+    @property
+    def old(self) -> Optional[Fingerprint]:
+        """Optional[:class:`Fingerprint`]: Returns the fingerprint in the old snapshot."""
+        return self._old
+
+    @property
+    def new(self) -> Optional[Fingerprint]:
+        """Optional[:class:`Fingerprint`]: Returns the fingerprint in the new snapshot."""
+        return self._new
+
+    @property
+    def old_price(self) -> Optional[float]:
+        """Optional[:class:`float`]: Returns the old price in USD."""
+        return self._old.price / 100 if self._old else None
+
+    @property
+    def new_price(self) -> Optional[float]:
+        """Optional[:class:`float`]: Returns the new price in USD."""
+        return self._new.price / 100 if self._new else None
+
+
+def _read_run(path: str) -> Iterator[Fingerprint]:
+    with open(path, "r", encoding="utf-8") as fp:
+        for line in fp:
+            listing_id, price, watchers = line.rstrip("\n").split("\t")
+            yield Fingerprint(listing_id, int(price), int(watchers))
+
+
+class Snapshot:
+    """A finished snapshot stored as sorted runs of fingerprints on disk.
+
+    Iterating a snapshot yields its fingerprints ordered by ``listing_id`` by merging the runs,
+    so memory usage only depends on the number of runs. Use :class:`SnapshotWriter` to create one.
+    """
+
+    __slots__ = (
+        "_directory",
+        "_runs",
+        "_owned",
+    )
+
+    def __init__(self, *, directory: str, runs: List[str], owned: bool = True) -> None:
+        self._directory = directory
+        self._runs = runs
+        self._owned = owned
+
+    def __repr__(self) -> str:
+        return f"<Snapshot directory={self._directory!r} runs={len(self._runs)}>"
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[Fingerprint]:
+        previous: Optional[Fingerprint] = None
+        # heapq.merge is stable, so for duplicated IDs the last one written wins
+        for current in heapq.merge(*(_read_run(path) for path in self._runs), key=lambda f: f.listing_id):
+            if previous is not None and previous.listing_id != current.listing_id:
+                yield previous
+            previous = current
+        if previous is not None:
+            yield previous
+
+    @property
+    def runs(self) -> List[str]:
+        """List[:class:`str`]: Returns the paths of the sorted run files."""
+        return self._runs
+
+    def close(self) -> None:
+        """Deletes the run files of the snapshot."""
+        if self._owned:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._runs = []
+
+
+class SnapshotWriter:
+    """Collects listing fingerprints and spills them to disk as sorted runs.
+
+    Parameters
+    ----------
+    directory: Optional[:class:`str`]
+        The directory in which a temporary directory for the runs is created.
+    run_size: :class:`int`
+        The number of fingerprints kept in memory before a run is written.
+    """
+
+    __slots__ = (
+        "_directory",
+        "_buffer",
+        "_runs",
+        "run_size",
+    )
+
+    def __init__(self, *, directory: Optional[str] = None, run_size: int = 250_000) -> None:
+        if run_size <= 0:
+            raise BadArgument("run_size has to be a positive integer")
+
+        self._directory = tempfile.mkdtemp(prefix="csfloat-snapshot-", dir=directory)
+        self._buffer: List[Fingerprint] = []
+        self._runs: List[str] = []
+        self.run_size: int = run_size
+
+    def add(self, listing: Union[Listing, Dict[str, Any]]) -> None:
+        self._buffer.append(fingerprint(listing))
+        if len(self._buffer) >= self.run_size:
+            self._spill()
+
+    def add_many(self, listings: Iterable[Union[Listing, Dict[str, Any]]]) -> None:
+        for listing in listings:
+            self.add(listing)
+
+    async def feed(self, source: AsyncIterable[Any]) -> None:
+        """*coroutine*
+        Adds every listing of a :class:`ListingAsyncIterator` or of a stream of pages.
+        """
+        async for element in source:
+            if isinstance(element, (list, tuple)):
+                self.add_many(element)
+            else:
+                self.add(element)
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort(key=lambda f: f.listing_id)
+        path = os.path.join(self._directory, f"run-{len(self._runs):06d}.tsv")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.writelines(f"{f.listing_id}\t{f.price}\t{f.watchers}\n" for f in self._buffer)
+        self._runs.append(path)
+        self._buffer = []
+
+    def finish(self) -> Snapshot:
+        """Writes the remaining fingerprints and returns the finished :class:`Snapshot`."""
+        self._spill()
+        return Snapshot(directory=self._directory, runs=self._runs)
+
+
+def diff_snapshots(old: Iterable[Fingerprint], new: Iterable[Fingerprint]) -> Iterator[ChangeEvent]:
+    """Compares two snapshots and yields a :class:`ChangeEvent` per difference.
+
+    Both inputs have to be ordered by ``listing_id``, as :class:`Snapshot` objects are. The
+    snapshots are merge-joined in a single pass, so this runs in linear time and constant memory.
+    A listing whose price and watchers both changed yields two events.
+    """
+    old_iter = iter(old)
+    new_iter = iter(new)
+    a = next(old_iter, None)
+    b = next(new_iter, None)
+
+    while a is not None or b is not None:
+        if b is None or (a is not None and a.listing_id < b.listing_id):
+            yield ChangeEvent(type=ChangeType.removed, old=a, new=None)
+            a = next(old_iter, None)
+        elif a is None or b.listing_id < a.listing_id:
+            yield ChangeEvent(type=ChangeType.new, old=None, new=b)
+            b = next(new_iter, None)
+        else:
+            if a.price != b.price:
+                yield ChangeEvent(type=ChangeType.price_change, old=a, new=b)
+            if a.watchers != b.watchers:
+                yield ChangeEvent(type=ChangeType.watchers_change, old=a, new=b)
+            a = next(old_iter, None)
+            b = next(new_iter, None)
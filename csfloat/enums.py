@@ -29,6 +29,9 @@ __all__ = (
     "Category",
     "ListingType",
     "Rarity",
+    "ChangeType",
+    "SlowConsumerPolicy",
+    "RequestPriority",
 )
 
 
@@ -69,3 +72,22 @@ class Rarity(IntEnum):
     classified = 5
     covert = 6
     contraband = 7
+
+
+class ChangeType(Enum):
+    new = "new"
+    removed = "removed"
+    price_change = "price_change"
+    watchers_change = "watchers_change"
+
+
+class SlowConsumerPolicy(Enum):
+    block = "block"
+    drop_oldest = "drop_oldest"
+    detach = "detach"
+
+
+class RequestPriority(IntEnum):
+    low = 0
+    normal = 1
+    high = 2
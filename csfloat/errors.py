@@ -34,6 +34,7 @@ __all__ = (
     "InternalServerError",
     "ServiceUnavailable",
     "BadArgument",
+    "RequestTimeout",
 )
 
 
@@ -59,10 +60,9 @@ class HTTPException(CSFloatException):
     """Exception that's raised when an HTTP request operation fails.
     Attributes
     ------------
-    response: :class:`aiohttp.ClientResponse`
-        The response of the failed HTTP request. This is an
-        instance of :class:`aiohttp.ClientResponse`. In some cases
-        this could also be a :class:`requests.Response`.
+    response: :class:`TransportResponse`
+        The response of the failed HTTP request, as returned by the
+        :class:`Transport` of the client.
     text: :class:`str`
         The text of the error. Could be an empty string.
     status: :class:`int`
@@ -154,3 +154,25 @@ class BadArgument(CSFloatException):
 
     def __init__(self, message):
         super().__init__(message)
+
+
+class RequestTimeout(CSFloatException):
+    """Exception that's raised when no response arrives within the timeout of a request's route.
+
+    The timeout starts when the request is sent; time spent waiting for the rate budget or for a
+    slot of the :class:`AdaptiveLimiter` doesn't count.
+
+    Subclass of :exc:`CSFloatException`
+
+    Attributes
+    ------------
+    route: :class:`str`
+        The route of the request, e.g. ``"GET /listings/{listing_id}"``.
+    timeout: :class:`float`
+        The timeout in seconds.
+    """
+
+    def __init__(self, route: str, timeout: float):
+        self.route = route
+        self.timeout = timeout
+        super().__init__(f"{route} timed out after {timeout:g} seconds")
@@ -0,0 +1,240 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+from typing import IO, Any, AsyncIterable, Dict, Iterable, List, Optional, Sequence
+
+from .errors import BadArgument
+from .listing import _listing_data
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+__all__ = (
+    "NDJSONSink",
+    "CSVSink",
+)
+
+
+# column name -> path into the raw listing dict
+CSV_COLUMNS: Dict[str, Sequence[str]] = {
+    "listing_id": ("id",),
+    "created_at": ("created_at",),
+    "type": ("type",),
+    "state": ("state",),
+    "price": ("price",),
+    "watchers": ("watchers",),
+    "market_hash_name": ("item", "market_hash_name"),
+    "def_index": ("item", "def_index"),
+    "paint_index": ("item", "paint_index"),
+    "paint_seed": ("item", "paint_seed"),
+    "float_value": ("item", "float_value"),
+    "asset_id": ("item", "asset_id"),
+    "seller_steam_id": ("seller", "steam_id"),
+    "predicted_price": ("reference", "predicted_price"),
+    "base_price": ("reference", "base_price"),
+}
+
+
+def _open(path: str, compression: Optional[str]) -> IO[bytes]:
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise BadArgument("zstandard is required for zstd compression")
+        return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+    raise BadArgument("compression has to be None, 'gzip' or 'zstd'")
+
+
+class _Sink:
+    """Base class of the streaming export sinks.
+
+    Listings are grouped into batches of ``batch_size`` which are put into a bounded queue of
+    ``max_pending`` batches. A single writer task encodes and writes the batches in a worker
+    thread, so a slow disk fills the queue and in turn suspends the producer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        compression: Optional[str] = None,
+        batch_size: int = 5000,
+        max_pending: int = 4,
+    ) -> None:
+        if batch_size <= 0 or max_pending <= 0:
+            raise BadArgument("batch_size and max_pending have to be positive integers")
+
+        self.path: str = path
+        self.compression: Optional[str] = compression
+        self.batch_size: int = batch_size
+        self.max_pending: int = max_pending
+        self.written: int = 0
+        self._fp: Optional[IO[bytes]] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={self.path!r} written={self.written}>"
+
+    def _encode(self, batch: List[Dict[str, Any]]) -> bytes:
+        raise NotImplementedError
+
+    def _start(self) -> None:
+        pass
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if self._fp is None:
+            self._fp = _open(self.path, self.compression)
+            self._start()
+        self._fp.write(self._encode(batch))
+        self.written += len(batch)
+
+    def _close(self) -> None:
+        if self._fp is None:
+            self._fp = _open(self.path, self.compression)
+            self._start()
+        self._fp.close()
+        self._fp = None
+
+    async def consume(self, source: AsyncIterable[Any]) -> int:
+        """*coroutine*
+        Writes every listing of a :class:`ListingAsyncIterator`, or of a stream of pages such as
+        :meth:`ListingAsyncIterator.pages`, to the file and closes it.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listings written.
+        """
+        queue: asyncio.Queue[Optional[List[Dict[str, Any]]]] = asyncio.Queue(maxsize=self.max_pending)
+
+        # the write running in a worker thread, which cancelling the writer doesn't stop
+        writing: Optional[asyncio.Future[None]] = None
+
+        async def writer() -> None:
+            nonlocal writing
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    return
+                writing = asyncio.ensure_future(asyncio.to_thread(self._write, batch))
+                await asyncio.shield(writing)
+
+        task = asyncio.create_task(writer())
+
+        async def put(batch: Optional[List[Dict[str, Any]]]) -> None:
+            # fail fast instead of blocking forever on a full queue if the writer died
+            put_task = asyncio.ensure_future(queue.put(batch))
+            done, _ = await asyncio.wait({put_task, task}, return_when=asyncio.FIRST_COMPLETED)
+            if put_task not in done:
+                put_task.cancel()
+                task.result()
+
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for element in source:
+                if isinstance(element, (list, tuple)):
+                    batch.extend(_listing_data(listing) for listing in element)
+                else:
+                    batch.append(_listing_data(element))
+
+                if len(batch) >= self.batch_size:
+                    await put(batch)
+                    batch = []
+
+            if batch:
+                await put(batch)
+            await put(None)
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+            # the file can only be closed once no thread writes to it anymore
+            pending = [future for future in (task, writing) if future is not None]
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.to_thread(self._close)
+
+        return self.written
+
+
+class NDJSONSink(_Sink):
+    """Streams listings to a newline-delimited JSON file, one raw listing dict per line.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The file to write.
+    compression: Optional[:class:`str`]
+        ``"gzip"``, ``"zstd"`` (requires the ``zstandard`` package) or ``None``.
+    batch_size: :class:`int`
+        The number of listings encoded and written at once.
+    max_pending: :class:`int`
+        The number of batches that may wait for the writer before the producer is suspended.
+    """
+
+    def _encode(self, batch: List[Dict[str, Any]]) -> bytes:
+        dumps = json.JSONEncoder(separators=(",", ":")).encode
+        return "".join(dumps(data) + "\n" for data in batch).encode("utf-8")
+
+
+class CSVSink(_Sink):
+    """Streams listings to a CSV file with one row per listing.
+
+    Takes the same parameters as :class:`NDJSONSink` and additionally ``columns``, a sequence of
+    column names. The available columns are ``listing_id``, ``created_at``, ``type``, ``state``,
+    ``price`` (in cents), ``watchers``, ``market_hash_name``, ``def_index``, ``paint_index``,
+    ``paint_seed``, ``float_value``, ``asset_id``, ``seller_steam_id``, ``predicted_price`` and
+    ``base_price``.
+    """
+
+    def __init__(self, path: str, *, columns: Optional[Iterable[str]] = None, **kwargs: Any) -> None:
+        super().__init__(path, **kwargs)
+        self.columns: List[str] = list(columns) if columns is not None else list(CSV_COLUMNS)
+        unknown = [column for column in self.columns if column not in CSV_COLUMNS]
+        if unknown:
+            raise BadArgument(f"unknown CSV columns: {', '.join(unknown)}")
+
+    def _start(self) -> None:
+        self._fp.write((",".join(self.columns) + "\r\n").encode("utf-8"))  # type: ignore
+
+    def _encode(self, batch: List[Dict[str, Any]]) -> bytes:
+        paths = [CSV_COLUMNS[column] for column in self.columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for data in batch:
+            row = []
+            for path in paths:
+                value: Any = data
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                row.append(value)
+            writer.writerow(row)
+        return buffer.getvalue().encode("utf-8")
@@ -0,0 +1,397 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .errors import BadArgument
+from .iterators import ListingAsyncIterator
+from .listing import Listing
+from .utils import parse_time
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+__all__ = ("ListingFrame",)
+
+
+# column name -> array typecode; missing integers are stored as -1, missing floats as NaN
+NUMERIC_COLUMNS: Dict[str, str] = {
+    "price": "q",
+    "float_value": "d",
+    "paint_seed": "q",
+    "def_index": "q",
+    "paint_index": "q",
+    "watchers": "q",
+    "created_at": "d",
+    "predicted_price": "q",
+    "base_price": "q",
+    "sticker_value": "q",
+}
+
+STRING_COLUMNS = (
+    "market_hash_name",
+    "type",
+    "state",
+    "seller",
+)
+
+
+def _timestamp(value: Optional[str]) -> float:
+    if not value:
+        return math.nan
+    return parse_time(value).timestamp()
+
+
+def _int(value: Any) -> int:
+    return -1 if value is None else int(value)
+
+
+def _float(value: Any) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _sticker_value(stickers: Optional[List[Dict[str, Any]]]) -> int:
+    total = 0
+    for sticker in stickers or ():
+        reference = sticker.get("reference")
+        if reference and reference.get("price"):
+            total += reference["price"]
+    return total
+
+
+class _Dictionary:
+    """Maps the distinct values of a string column to dense integer codes."""
+
+    __slots__ = ("values", "_lookup")
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+        self._lookup: Dict[Optional[str], int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        try:
+            return self._lookup[value]
+        except KeyError:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+            return code
+
+    def code(self, value: Optional[str]) -> int:
+        return self._lookup.get(value, -1)
+
+
+class ListingFrame:
+    """A columnar container of listings built directly from the raw page dicts of the API.
+
+    Numeric columns are stored as contiguous :class:`array.array` objects, string columns are
+    dictionary-encoded. Filtering, sorting and grouping work on the columns and never build
+    :class:`Listing` objects; use :meth:`listing` to materialise a single row on demand.
+
+    If NumPy is installed, :meth:`to_numpy` returns zero-copy views of the columns and
+    :meth:`where` evaluates its conditions vectorised.
+    """
+
+    __slots__ = (
+        "_ids",
+        "_raw",
+        "_numeric",
+        "_codes",
+        "_dictionaries",
+    )
+
+    def __init__(self, listings: Optional[Iterable[Dict[str, Any]]] = None) -> None:
+        self._ids: List[str] = []
+        self._raw: List[Dict[str, Any]] = []
+        self._numeric: Dict[str, array] = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS.items()}
+        self._codes: Dict[str, array] = {name: array("q") for name in STRING_COLUMNS}
+        self._dictionaries: Dict[str, _Dictionary] = {name: _Dictionary() for name in STRING_COLUMNS}
+
+        if listings is not None:
+            self.extend(listings)
+
+    def __repr__(self) -> str:
+        return f"<ListingFrame rows={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Iterable[Dict[str, Any]]]) -> "ListingFrame":
+        """Builds a frame from an iterable of pages, each being a list of raw listing dicts."""
+        frame = cls()
+        for page in pages:
+            frame.extend(page)
+        return frame
+
+    @classmethod
+    async def from_iterator(cls, iterator: ListingAsyncIterator) -> "ListingFrame":
+        """*coroutine*
+        Consumes the remaining pages of a :class:`ListingAsyncIterator` into a new frame.
+
+        Returns
+        -------
+        :class:`ListingFrame`
+        """
+        frame = cls()
+        async for page in iterator.pages():
+            frame.extend(page)
+        return frame
+
+    def extend(self, listings: Iterable[Dict[str, Any]]) -> None:
+        """Appends raw listing dicts, e.g. the ``data`` of a page, to the frame."""
+        ids = self._ids
+        raw = self._raw
+        price = self._numeric["price"]
+        float_value = self._numeric["float_value"]
+        paint_seed = self._numeric["paint_seed"]
+        def_index = self._numeric["def_index"]
+        paint_index = self._numeric["paint_index"]
+        watchers = self._numeric["watchers"]
+        created_at = self._numeric["created_at"]
+        predicted_price = self._numeric["predicted_price"]
+        base_price = self._numeric["base_price"]
+        sticker_value = self._numeric["sticker_value"]
+        names = self._codes["market_hash_name"]
+        types = self._codes["type"]
+        states = self._codes["state"]
+        sellers = self._codes["seller"]
+        encode_name = self._dictionaries["market_hash_name"].encode
+        encode_type = self._dictionaries["type"].encode
+        encode_state = self._dictionaries["state"].encode
+        encode_seller = self._dictionaries["seller"].encode
+
+        for data in listings:
+            item = data.get("item") or {}
+            seller = data.get("seller") or {}
+            reference = data.get("reference") or {}
+
+            ids.append(data.get("id", ""))
+            raw.append(data)
+            price.append(data.get("price", 0))
+            float_value.append(_float(item.get("float_value")))
+            paint_seed.append(_int(item.get("paint_seed")))
+            def_index.append(_int(item.get("def_index")))
+            paint_index.append(_int(item.get("paint_index")))
+            watchers.append(data.get("watchers", 0))
+            created_at.append(_timestamp(data.get("created_at")))
+            predicted_price.append(_int(reference.get("predicted_price")))
+            base_price.append(_int(reference.get("base_price")))
+            sticker_value.append(_sticker_value(item.get("stickers")))
+            names.append(encode_name(item.get("market_hash_name")))
+            types.append(encode_type(data.get("type")))
+            states.append(encode_state(data.get("state")))
+            sellers.append(encode_seller(seller.get("steam_id")))
+
+    @property
+    def columns(self) -> List[str]:
+        """List[:class:`str`]: Returns the names of all columns."""
+        return ["listing_id", *NUMERIC_COLUMNS, *STRING_COLUMNS]
+
+    @property
+    def listing_ids(self) -> List[str]:
+        """List[:class:`str`]: Returns the listing IDs in row order."""
+        return self._ids
+
+    def column(self, name: str) -> Union[array, List[Any]]:
+        """Returns a column by name.
+
+        Numeric columns are returned as the underlying :class:`array.array` (prices are in cents,
+        ``created_at`` is a POSIX timestamp), string columns are decoded into a list. ``sticker_value``
+        is the sum of the reference prices of all applied stickers.
+        """
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._codes:
+            values = self._dictionaries[name].values
+            return [values[code] for code in self._codes[name]]
+        if name == "listing_id":
+            return self._ids
+        raise BadArgument(f"unknown column {name!r}")
+
+    def codes(self, name: str) -> array:
+        """Returns the integer codes of a dictionary-encoded string column."""
+        try:
+            return self._codes[name]
+        except KeyError:
+            raise BadArgument(f"{name!r} is not a string column") from None
+
+    def categories(self, name: str) -> List[Optional[str]]:
+        """Returns the distinct values of a dictionary-encoded string column, indexed by code."""
+        try:
+            return self._dictionaries[name].values
+        except KeyError:
+            raise BadArgument(f"{name!r} is not a string column") from None
+
+    def to_numpy(self, name: str) -> Any:
+        """Returns a zero-copy :class:`numpy.ndarray` view of a numeric column or the codes of a string column.
+
+        Raises
+        ------
+        :exc:`BadArgument`
+            NumPy is not installed.
+        """
+        if numpy is None:
+            raise BadArgument("numpy is required for to_numpy()")
+        if name in self._numeric:
+            column = self._numeric[name]
+        else:
+            column = self.codes(name)
+        return numpy.frombuffer(column, dtype=numpy.float64 if column.typecode == "d" else numpy.int64)
+
+    def raw(self, index: int) -> Dict[str, Any]:
+        """Returns the raw listing dict of a row."""
+        return self._raw[index]
+
+    def listing(self, index: int) -> Listing:
+        """Builds the :class:`Listing` of a row."""
+        return Listing(data=self._raw[index])
+
+    def listings(self) -> Iterator[Listing]:
+        """Lazily builds a :class:`Listing` for every row."""
+        for data in self._raw:
+            yield Listing(data=data)
+
+    def take(self, indices: Iterable[int]) -> "ListingFrame":
+        """Returns a new frame containing the given rows in the given order.
+
+        The new frame shares the string dictionaries with this frame.
+        """
+        frame = ListingFrame.__new__(ListingFrame)
+        indices = list(indices)
+        frame._ids = [self._ids[i] for i in indices]
+        frame._raw = [self._raw[i] for i in indices]
+        frame._numeric = {name: array(col.typecode, [col[i] for i in indices]) for name, col in self._numeric.items()}
+        frame._codes = {name: array("q", [col[i] for i in indices]) for name, col in self._codes.items()}
+        frame._dictionaries = self._dictionaries
+        return frame
+
+    def filter(self, mask: Iterable[bool]) -> "ListingFrame":
+        """Returns the rows for which ``mask`` is truthy. ``mask`` may be any iterable, including a NumPy array."""
+        return self.take(i for i, keep in enumerate(mask) if keep)
+
+    def where(
+        self,
+        column: str,
+        *,
+        min: Optional[float] = None,
+        max: Optional[float] = None,
+        equals: Any = None,
+    ) -> "ListingFrame":
+        """Returns the rows whose value in ``column`` lies within ``[min, max]`` or equals ``equals``.
+
+        For string columns only ``equals`` is supported. Rows with a missing value never match a range.
+        """
+        if column in self._codes:
+            if equals is None:
+                raise BadArgument("string columns can only be filtered with equals")
+            code = self._dictionaries[column].code(equals)
+            return self.take(i for i, c in enumerate(self._codes[column]) if c == code)
+
+        if column not in self._numeric:
+            raise BadArgument(f"unknown column {column!r}")
+
+        # missing floats are NaN and fail every comparison, missing integers have to be excluded
+        exclude_missing = NUMERIC_COLUMNS[column] == "q" and (min is not None or max is not None)
+
+        if numpy is not None:
+            values = self.to_numpy(column)
+            mask = numpy.ones(len(values), dtype=bool)
+            if equals is not None:
+                mask &= values == equals
+            if min is not None:
+                mask &= values >= min
+            if max is not None:
+                mask &= values <= max
+            if exclude_missing:
+                mask &= values != -1
+            return self.take(numpy.flatnonzero(mask).tolist())
+
+        values = self._numeric[column]
+        lo = -math.inf if min is None else min
+        hi = math.inf if max is None else max
+        if equals is not None:
+            return self.take(
+                i for i, v in enumerate(values) if v == equals and lo <= v <= hi and not (exclude_missing and v == -1)
+            )
+        return self.take(i for i, v in enumerate(values) if lo <= v <= hi and not (exclude_missing and v == -1))
+
+    def _is_missing(self, column: str, value: Any) -> bool:
+        return math.isnan(value) if NUMERIC_COLUMNS[column] == "d" else value == -1
+
+    def argsort(self, by: str, *, reverse: bool = False) -> List[int]:
+        """Returns the row indices that sort the frame by ``by``. String columns sort by their decoded value.
+
+        The sort is stable. Rows with a missing numeric value come last in either direction.
+        """
+        if by in self._codes:
+            values: Sequence[Any] = [v or "" for v in self.column(by)]  # type: ignore
+        elif by in self._numeric:
+            if numpy is not None:
+                column_values = self.to_numpy(by)
+                missing = numpy.isnan(column_values) if NUMERIC_COLUMNS[by] == "d" else column_values == -1
+                present = numpy.flatnonzero(~missing)
+                keys = column_values[present]
+                order = present[numpy.argsort(-keys if reverse else keys, kind="stable")]
+                return order.tolist() + numpy.flatnonzero(missing).tolist()
+
+            values = self._numeric[by]
+            present_rows = [i for i, v in enumerate(values) if not self._is_missing(by, v)]
+            present_rows.sort(key=values.__getitem__, reverse=reverse)
+            if len(present_rows) == len(values):
+                return present_rows
+            return present_rows + [i for i, v in enumerate(values) if self._is_missing(by, v)]
+        elif by == "listing_id":
+            values = self._ids
+        else:
+            raise BadArgument(f"unknown column {by!r}")
+        return sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+
+    def sort(self, by: str, *, reverse: bool = False) -> "ListingFrame":
+        """Returns a new frame sorted by a column."""
+        return self.take(self.argsort(by, reverse=reverse))
+
+    def groupby(self, by: str) -> Dict[Any, "ListingFrame"]:
+        """Groups the rows by the value of a column and returns a frame per distinct value.
+
+        Rows with a missing numeric value form the ``None`` group.
+        """
+        groups: Dict[Any, List[int]] = {}
+        if by in self._codes:
+            buckets: Dict[int, List[int]] = {}
+            for i, code in enumerate(self._codes[by]):
+                buckets.setdefault(code, []).append(i)
+            values = self._dictionaries[by].values
+            groups = {values[code]: indices for code, indices in buckets.items()}
+        elif by in self._numeric:
+            # every missing value, NaN or -1, falls into a single None group
+            for i, value in enumerate(self._numeric[by]):
+                groups.setdefault(None if self._is_missing(by, value) else value, []).append(i)
+        else:
+            for i, value in enumerate(self.column(by)):
+                groups.setdefault(value, []).append(i)
+        return {key: self.take(indices) for key, indices in groups.items()}
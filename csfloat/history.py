@@ -0,0 +1,405 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import os
+import struct
+import time
+import zlib
+from typing import Any, AsyncIterable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .errors import BadArgument
+from .listing import Listing
+
+__all__ = (
+    "PricePoint",
+    "PriceHistoryStore",
+)
+
+
+# key length, offset, length, first timestamp, last timestamp, count
+_INDEX_ENTRY = struct.Struct("<HQIqqI")
+# kind, key length, timestamp, price
+_LOG_ENTRY = struct.Struct("<BHqq")
+_LOG_POINT = 0
+# the buffered points of the key were written as the chunk at the offset in the timestamp field
+_LOG_CHUNKED = 1
+# first entry of a rewritten log, every chunk below the offset in the timestamp field is accounted for
+_LOG_BASE = 2
+
+
+class PricePoint(NamedTuple):
+    timestamp: int
+    price: int
+
+
+class _Chunk(NamedTuple):
+    offset: int
+    length: int
+    first: int
+    last: int
+    count: int
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    # zigzag encoding keeps small negative deltas small
+    value = (value << 1) ^ (value >> 63)
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varints(data: bytes) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append((value >> 1) ^ -(value & 1))
+        value = shift = 0
+    return values
+
+
+def _encode(points: List[PricePoint]) -> bytes:
+    out = bytearray()
+    timestamp = price = 0
+    for point in points:
+        _write_varint(out, point.timestamp - timestamp)
+        _write_varint(out, point.price - price)
+        timestamp, price = point.timestamp, point.price
+    return zlib.compress(bytes(out))
+
+
+def _decode(data: bytes) -> List[PricePoint]:
+    values = _read_varints(zlib.decompress(data))
+    points = []
+    timestamp = price = 0
+    for i in range(0, len(values), 2):
+        timestamp += values[i]
+        price += values[i + 1]
+        points.append(PricePoint(timestamp, price))
+    return points
+
+
+class PriceHistoryStore:
+    """An append-only on-disk store of price time series.
+
+    Points are buffered per key and written as chunks of delta-encoded timestamps and prices in
+    cents, compressed with zlib. A separate index file maps every key to its chunks and their time
+    range, so range reads only decompress the chunks they need.
+
+    Only full chunks are compressed. :meth:`flush` makes the open tails durable by appending them
+    uncompressed to a log, which is replayed into the buffers when the store is opened again and
+    rewritten once most of its points have moved into chunks. Series that rarely fill a chunk,
+    such as per-listing series, would keep the log and the buffers growing, so once more than
+    ``max_buffered`` points are buffered in total every open tail is sealed into a chunk.
+
+    Parameters
+    ----------
+    directory: :class:`str`
+        The directory holding ``history.dat``, ``history.idx`` and ``history.log``. It is created
+        if necessary.
+    chunk_size: :class:`int`
+        The number of points per key that are buffered before a chunk is written.
+    max_buffered: :class:`int`
+        The number of buffered points of all keys together above which the open tails are sealed
+        into chunks. It bounds the memory use and the size of the log.
+    """
+
+    __slots__ = (
+        "_data",
+        "_index",
+        "_log",
+        "_pending",
+        "_log_entries",
+        "_chunks",
+        "_buffers",
+        "_buffered",
+        "chunk_size",
+        "max_buffered",
+    )
+
+    def __init__(self, directory: str, *, chunk_size: int = 512, max_buffered: int = 65536) -> None:
+        if chunk_size <= 0 or max_buffered <= 0:
+            raise BadArgument("chunk_size and max_buffered have to be positive integers")
+
+        os.makedirs(directory, exist_ok=True)
+        data_path = os.path.join(directory, "history.dat")
+        index_path = os.path.join(directory, "history.idx")
+        log_path = os.path.join(directory, "history.log")
+
+        self._chunks: Dict[str, List[_Chunk]] = {}
+        self._buffers: Dict[str, List[PricePoint]] = {}
+        # log entries not written yet and the number of entries in the log including them
+        self._pending = bytearray()
+        self._log_entries = 0
+        self.chunk_size: int = chunk_size
+        self.max_buffered: int = max_buffered
+        self._load_index(index_path, os.path.getsize(data_path) if os.path.exists(data_path) else 0)
+        self._load_log(log_path)
+        self._buffered = sum(map(len, self._buffers.values()))
+
+        self._data = open(data_path, "ab")
+        self._index = open(index_path, "ab")
+        # rewriting it right away also drops a torn last entry
+        self._log = open(log_path, "ab")
+        self._rewrite_log()
+
+    def __repr__(self) -> str:
+        return f"<PriceHistoryStore keys={len(self.keys())}>"
+
+    def __enter__(self) -> "PriceHistoryStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _load_index(self, path: str, data_size: int) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as fp:
+            raw = fp.read()
+
+        position = 0
+        while position + _INDEX_ENTRY.size <= len(raw):
+            key_length, offset, length, first, last, count = _INDEX_ENTRY.unpack_from(raw, position)
+            position += _INDEX_ENTRY.size
+            key = raw[position : position + key_length].decode("utf-8")
+            position += key_length
+            # entries of chunks that never made it to the data file are ignored
+            if offset + length <= data_size:
+                self._chunks.setdefault(key, []).append(_Chunk(offset, length, first, last, count))
+
+    def _load_log(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as fp:
+            raw = fp.read()
+
+        buffers = self._buffers
+        base = 0
+        recorded = set()
+        position = 0
+        while position + _LOG_ENTRY.size <= len(raw):
+            kind, key_length, timestamp, price = _LOG_ENTRY.unpack_from(raw, position)
+            position += _LOG_ENTRY.size
+            if position + key_length > len(raw):
+                break
+            key = raw[position : position + key_length].decode("utf-8")
+            position += key_length
+            if kind == _LOG_BASE:
+                base = timestamp
+            elif kind == _LOG_CHUNKED:
+                buffers.pop(key, None)
+                recorded.add(timestamp)
+            else:
+                buffers.setdefault(key, []).append(PricePoint(timestamp, price))
+
+        # A chunk that reached the index but not the log holds every point logged for its key since
+        # the last recorded chunk, since the log is written in order.
+        for key in list(buffers):
+            if any(chunk.offset >= base and chunk.offset not in recorded for chunk in self._chunks.get(key, ())):
+                del buffers[key]
+
+    def _log_entry(self, kind: int, key: str, timestamp: int = 0, price: int = 0) -> None:
+        encoded_key = key.encode("utf-8")
+        self._pending += _LOG_ENTRY.pack(kind, len(encoded_key), timestamp, price) + encoded_key
+        self._log_entries += 1
+
+    def _rewrite_log(self) -> None:
+        # replaces the log with the points that are still buffered
+        self._pending.clear()
+        self._log_entries = 0
+        self._log_entry(_LOG_BASE, "", self._data.tell())
+        for key, points in self._buffers.items():
+            for point in points:
+                self._log_entry(_LOG_POINT, key, point.timestamp, point.price)
+
+        path = self._log.name
+        with open(path + ".tmp", "wb") as fp:
+            fp.write(self._pending)
+        self._log.close()
+        os.replace(path + ".tmp", path)
+        self._log = open(path, "ab")
+        self._pending.clear()
+
+    def keys(self) -> List[str]:
+        """Returns all keys with at least one point."""
+        return list(self._chunks.keys() | self._buffers.keys())
+
+    def append(self, key: str, price: int, timestamp: Optional[float] = None) -> None:
+        """Appends a point to the series of ``key``.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The series key, see :meth:`item_key` and :meth:`listing_key`.
+        price: :class:`int`
+            The price in cents.
+        timestamp: Optional[:class:`float`]
+            The POSIX timestamp of the point, defaults to now. It is stored with second precision.
+        """
+        point = PricePoint(int(time.time() if timestamp is None else timestamp), int(price))
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(point)
+        self._buffered += 1
+        self._log_entry(_LOG_POINT, key, point.timestamp, point.price)
+        if len(buffer) >= self.chunk_size:
+            self._seal(key)
+        if self._buffered > self.max_buffered:
+            for key in list(self._buffers):
+                self._seal(key)
+
+    def _seal(self, key: str) -> None:
+        points = self._buffers.pop(key)
+        self._buffered -= len(points)
+        chunk = self._write_chunk(key, points)
+        self._log_entry(_LOG_CHUNKED, key, chunk.offset)
+
+    def _write_chunk(self, key: str, points: List[PricePoint]) -> _Chunk:
+        points.sort()
+        payload = _encode(points)
+        offset = self._data.tell()
+        self._data.write(payload)
+
+        chunk = _Chunk(offset, len(payload), points[0].timestamp, points[-1].timestamp, len(points))
+        encoded_key = key.encode("utf-8")
+        self._index.write(_INDEX_ENTRY.pack(len(encoded_key), *chunk) + encoded_key)
+        self._chunks.setdefault(key, []).append(chunk)
+        return chunk
+
+    def flush(self) -> None:
+        """Flushes the written chunks and appends the buffered points to the log.
+
+        Buffered points stay buffered until their chunk is full, so frequent flushes don't produce
+        small chunks.
+        """
+        # the data has to hit the file before the index that points to it, and the index before
+        # the log forgets the points of the chunk
+        self._data.flush()
+        self._index.flush()
+        if self._log_entries > 2 * self._buffered + self.chunk_size:
+            self._rewrite_log()
+        else:
+            self._log.write(self._pending)
+            self._pending.clear()
+            self._log.flush()
+
+    def close(self) -> None:
+        """Flushes and closes the store."""
+        self.flush()
+        self._data.close()
+        self._index.close()
+        self._log.close()
+
+    def read(self, key: str, start: Optional[float] = None, end: Optional[float] = None) -> List[PricePoint]:
+        """Returns the points of ``key`` within ``[start, end]`` ordered by timestamp.
+
+        Returns
+        -------
+        List[:class:`PricePoint`]
+            The points; prices are in cents.
+        """
+        low = -(2**63) if start is None else int(start)
+        high = 2**63 - 1 if end is None else int(end)
+
+        self._data.flush()
+        points: List[PricePoint] = []
+        with open(self._data.name, "rb") as fp:
+            for chunk in self._chunks.get(key, ()):
+                if chunk.last < low or chunk.first > high:
+                    continue
+                fp.seek(chunk.offset)
+                points.extend(p for p in _decode(fp.read(chunk.length)) if low <= p.timestamp <= high)
+
+        points.extend(p for p in self._buffers.get(key, ()) if low <= p.timestamp <= high)
+        points.sort()
+        return points
+
+    @staticmethod
+    def item_key(market_hash_name: str) -> str:
+        """Returns the series key of an item."""
+        return f"item:{market_hash_name}"
+
+    @staticmethod
+    def listing_key(listing_id: Union[str, int]) -> str:
+        """Returns the series key of a listing."""
+        return f"listing:{listing_id}"
+
+    def record(
+        self,
+        listings: Iterable[Union[Listing, Dict[str, Any]]],
+        *,
+        timestamp: Optional[float] = None,
+        per_item: bool = True,
+        per_listing: bool = True,
+    ) -> int:
+        """Appends the current price of every listing to its item and/or listing series.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listings recorded.
+        """
+        now = time.time() if timestamp is None else timestamp
+        count = 0
+        for listing in listings:
+            if isinstance(listing, dict):
+                listing_id = listing.get("id")
+                price = listing.get("price", 0)
+                name = (listing.get("item") or {}).get("market_hash_name")
+            else:
+                listing_id = listing._listing_id
+                price = listing._price
+                name = (listing._item or {}).get("market_hash_name")
+
+            if per_item and name is not None:
+                self.append(self.item_key(name), price, now)
+            if per_listing and listing_id is not None:
+                self.append(self.listing_key(listing_id), price, now)
+            count += 1
+        return count
+
+    async def ingest(self, source: AsyncIterable[Any], *, per_item: bool = True, per_listing: bool = True) -> int:
+        """*coroutine*
+        Records every listing of a :class:`ListingAsyncIterator` or of a stream of pages,
+        timestamped when they arrive, then flushes the store in a worker thread.
+
+        Points that don't fill a chunk are kept in the log, so ingesting one crawl after another
+        adds to the open chunk of every series instead of writing a small chunk per crawl.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listings recorded.
+        """
+        count = 0
+        async for element in source:
+            batch = element if isinstance(element, (list, tuple)) else (element,)
+            count += self.record(batch, per_item=per_item, per_listing=per_listing)
+        await asyncio.to_thread(self.flush)
+        return count
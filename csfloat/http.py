@@ -23,16 +23,25 @@ SOFTWARE.
 """
 
 import asyncio
+import json
 import logging
 import sys
 import time
+from concurrent.futures import Executor
 from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote
 
 import aiohttp
 
 from csfloat import __version__
 
-from .errors import BadRequest, Forbidden, HTTPException, InternalServerError, NotFound, Unauthorized
+from .concurrency import AdaptiveLimiter, HedgingPolicy
+from .enums import RequestPriority
+from .errors import BadRequest, Forbidden, HTTPException, InternalServerError, NotFound, RequestTimeout, Unauthorized
+from .profiling import PipelineProfiler
+from .scheduler import PriorityScheduler
+from .tracing import NoOpTracer, Tracer
+from .transport import AiohttpTransport, Transport, TransportResponse
 
 _log = logging.getLogger(__name__)
 
@@ -40,10 +49,19 @@ _log = logging.getLogger(__name__)
 class Route:
     BASE = "https://csfloat.com/api/v1"
 
-    def __init__(self, method: str, path: str) -> None:
+    def __init__(self, method: str, path: str, **parameters: Any) -> None:
+        # path stays the template, e.g. "/listings/{listing_id}", so it can label traces
         self.path: str = path
         self.method: str = method
-        self.url: str = self.BASE + self.path
+        endpoint = self.path
+        if parameters:
+            endpoint = endpoint.format_map({k: quote(str(v), safe="") for k, v in parameters.items()})
+        self.endpoint: str = endpoint
+        self.url: str = self.BASE + self.endpoint
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}"
 
 
 class HTTPClient:
@@ -52,11 +70,38 @@ class HTTPClient:
         *,
         proxy: Optional[str] = None,
         proxy_auth: Optional[aiohttp.BasicAuth] = None,
+        executor: Optional[Executor] = None,
+        profiler: Optional[PipelineProfiler] = None,
+        tracer: Optional[Tracer] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        timeout: Optional[float] = 30.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        scheduler: Optional[PriorityScheduler] = None,
     ) -> None:
-        self.__session = aiohttp.ClientSession()
         self.api_key = None
         self.proxy: Optional[str] = proxy
         self.proxy_auth: Optional[aiohttp.BasicAuth] = proxy_auth
+        if transport is None:
+            transport = AiohttpTransport(proxy=proxy, proxy_auth=proxy_auth)
+        self.transport: Transport = transport
+        # shared by everything using this client, e.g. page prefetching and bulk operations
+        self.limiter: AdaptiveLimiter = limiter if limiter is not None else AdaptiveLimiter()
+        # seconds per request, overridden per route by Route.key, e.g. {"GET /listings/{listing_id}": 2.0}
+        self.timeout: Optional[float] = timeout
+        self.timeouts: Dict[str, float] = dict(timeouts or {})
+        # slow GET requests are duplicated according to this policy if set
+        self.hedging: Optional[HedgingPolicy] = hedging
+        # hands out the rate budget by RequestPriority, before the limiter hands out a slot
+        self.scheduler: PriorityScheduler = scheduler if scheduler is not None else PriorityScheduler()
+        # JSON bodies are decoded in this executor instead of on the event loop if set
+        self.executor: Optional[Executor] = executor
+        self.profiler: Optional[PipelineProfiler] = profiler
+        self.tracer: Tracer = tracer if tracer is not None else NoOpTracer()
+        # replaces Route.BASE, e.g. to run against a local server
+        self.base_url: Optional[str] = base_url.rstrip("/") if base_url is not None else None
 
         user_agent = "csfloat.py {0}) Python/{1[0]}.{1[1]} aiohttp/{2}"
         self.user_agent: str = user_agent.format(__version__, sys.version_info, str(aiohttp.__version__))
@@ -65,17 +110,146 @@ class HTTPClient:
         self.api_key = api_key
 
     async def close(self) -> None:
-        if self.__session:
-            await self.__session.close()
+        await self.transport.close()
+
+    async def loads(self, body: bytes) -> Any:
+        """Decodes a JSON body, in :attr:`executor` if one is set."""
+        if not body.strip():
+            return None
+
+        start = time.perf_counter()
+        try:
+            with self.tracer.span("csfloat.decode", {"csfloat.bytes": len(body)}):
+                if self.executor is None:
+                    return json.loads(body)
+                return await asyncio.get_running_loop().run_in_executor(self.executor, json.loads, body)
+        finally:
+            if self.profiler is not None:
+                self.profiler.add("decode", time.perf_counter() - start)
+
+    async def _send(
+        self, route: Route, method: str, url: str, attempt: int, priority: RequestPriority, kwargs: Dict[str, Any]
+    ) -> TransportResponse:
+        timeout = self.timeouts.get(route.key, self.timeout)
+        try:
+            if self.hedging is not None and method == "GET":
+                return await self._send_hedged(route, method, url, attempt, priority, kwargs, timeout)
+            return await self._send_once(route, method, url, attempt, priority, kwargs, timeout)
+        except asyncio.TimeoutError as e:
+            _log.info(f"{method} {url} timed out after {timeout} seconds")
+            raise RequestTimeout(route.key, timeout or 0.0) from e
+
+    async def _send_hedged(
+        self,
+        route: Route,
+        method: str,
+        url: str,
+        attempt: int,
+        priority: RequestPriority,
+        kwargs: Dict[str, Any],
+        timeout: Optional[float],
+    ) -> TransportResponse:
+        policy: HedgingPolicy = self.hedging  # type: ignore
+        delay = policy.delay(route.key)
+        tasks = [asyncio.ensure_future(self._send_once(route, method, url, attempt, priority, kwargs, timeout))]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and policy.allow(self.limiter, self.scheduler):
+                    _log.debug(f"{method} {url} is slower than {delay:.3f} seconds, sending a hedged request")
+                    # a hedge is optional, it never takes budget reserved for higher priorities
+                    low = RequestPriority.low
+                    hedge = self._send_once(route, method, url, attempt, low, kwargs, timeout, hedge=True)
+                    tasks.append(asyncio.ensure_future(hedge))
+
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # the first response wins, a failed request only loses if the other one can still answer
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    if succeeded[0] is not tasks[0]:
+                        policy.wins += 1
+                    return succeeded[0].result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _send_once(
+        self,
+        route: Route,
+        method: str,
+        url: str,
+        attempt: int,
+        priority: RequestPriority,
+        kwargs: Dict[str, Any],
+        timeout: Optional[float],
+        *,
+        hedge: bool = False,
+    ) -> TransportResponse:
+        limiter = self.limiter
+        queued = time.perf_counter()
+        with self.tracer.span("csfloat.ratelimit", {"csfloat.route": route.key, "csfloat.priority": priority.name}) as span:
+            # waiting for the shared budget and for a slot of the limiter; the timeout of the request
+            # only starts once both are granted
+            await self.scheduler.acquire(priority)
+            try:
+                token = await limiter.acquire()
+            except BaseException:
+                # cancelled while queued, nothing was sent
+                self.scheduler.refund(priority)
+                raise
+            start = time.perf_counter()
+            span.set_attribute("csfloat.wait", start - queued)
+        if self.profiler is not None:
+            self.profiler.add("ratelimit", start - queued)
+        latency: Optional[float] = None
+        status: Optional[int] = None
+        try:
+            attributes = {
+                "csfloat.route": route.key,
+                "csfloat.attempt": attempt,
+                "csfloat.limit": limiter.limit,
+                "csfloat.hedge": hedge,
+                "csfloat.priority": priority.name,
+            }
+            with self.tracer.span("csfloat.http", attributes) as span:
+                send = self.transport.send(method, url, **kwargs)
+                if timeout is None:
+                    response = await send
+                else:
+                    # the timeout only starts once the request holds a slot, so time spent queueing
+                    # never times it out; a timeout here counts as a failure of the limiter
+                    response = await asyncio.wait_for(send, timeout)
+                span.set_attribute("http.status_code", response.status)
+            status = response.status
+            latency = time.perf_counter() - start
+            self.scheduler.update(response.headers)
+            if self.hedging is not None:
+                self.hedging.record(route.key, latency)
+            return response
+        except Exception:
+            latency = time.perf_counter() - start
+            raise
+        finally:
+            limiter.release(token, latency=latency, status=status, error=status is None)
+            if self.profiler is not None:
+                self.profiler.add("network", time.perf_counter() - start)
 
     async def request(
         self,
         route: Route,
         params: Optional[Iterable[Dict[str, Any]]] = None,
+        *,
+        raw: bool = False,
+        priority: RequestPriority = RequestPriority.normal,
         **kwargs: Any,
     ) -> Any:
         method = route.method
-        url = route.url
+        url = route.url if self.base_url is None else self.base_url + route.endpoint
 
         # header creation
         headers: Dict[str, str] = {
@@ -90,16 +264,30 @@ class HTTPClient:
         if params:
             kwargs["params"] = params
 
-        async with self.__session.request(method, url, **kwargs) as response:
-            for _ in range(2):
-                _log.info(f"{method} {url} with {kwargs} has returned {response.status}")
+        profiler = self.profiler
+        tracer = self.tracer
+        with tracer.span("csfloat.request", {"csfloat.route": route.key, "http.method": method}) as span:
+            for attempt in range(1, 3):
+                span.set_attribute("csfloat.attempt", attempt)
+                response = await self._send(route, method, url, attempt, priority, kwargs)
+                body = response.body
+                span.set_attribute("http.status_code", response.status)
 
-                data = await response.json()
+                _log.info(f"{method} {url} with {kwargs} has returned {response.status}")
 
                 if 300 > response.status >= 200:
+                    if raw:
+                        _log.debug(f"{method} {url} has received {len(body)} bytes")
+                        return body
+                    data = await self.loads(body)
                     _log.debug(f"{method} {url} has received {data}")
                     return data
 
+                try:
+                    data = await self.loads(body)
+                except ValueError:
+                    data = body.decode("utf-8", "replace")
+
                 if response.status in {500, 503}:
                     raise InternalServerError(response, data)
 
@@ -111,31 +299,39 @@ class HTTPClient:
                     raise Forbidden(response, data)
                 if response.status == 404:
                     raise NotFound(response, data)
-                if response.status == 429:
+                if response.status == 429 and attempt == 1:
                     # We are getting rate-limited, read x-ratelimit-reset header and calculate cooldown
                     wait_time = 600
                     ratelimit_reset = response.headers.get("X-Ratelimit-Reset")
                     if ratelimit_reset is not None:
-                        wait_time = int(ratelimit_reset) - int(time.time())
+                        wait_time = max(int(ratelimit_reset) - int(time.time()), 0)
                     _log.info(f"{method} {url} is getting rate-limited, retry after {wait_time} seconds")
-                    await asyncio.sleep(wait_time)
+                    with tracer.span("csfloat.ratelimit", {"csfloat.route": route.key, "csfloat.wait": wait_time}):
+                        await asyncio.sleep(wait_time)
+                    if profiler is not None:
+                        profiler.add("ratelimit", wait_time)
                     continue
                 raise HTTPException(response, data)
 
-    async def get_all_listings(self, **parameters: Any) -> List[Dict[str, Any]]:
-        return await self.request(Route("GET", "/listings"), **parameters)
+    # Crawls default to low priority, actions that are usually time-critical to high priority.
+    async def get_all_listings(
+        self, *, priority: RequestPriority = RequestPriority.low, **parameters: Any
+    ) -> List[Dict[str, Any]]:
+        return await self.request(Route("GET", "/listings"), priority=priority, **parameters)
 
-    async def get_listing(self, item_id: int) -> Dict[str, Any]:
-        return await self.request(Route("GET", f"/listings/{item_id}"))
+    async def get_listing(self, item_id: int, *, priority: RequestPriority = RequestPriority.high) -> Dict[str, Any]:
+        return await self.request(Route("GET", "/listings/{listing_id}", listing_id=item_id), priority=priority)
 
-    async def list_item(self, parameters: Dict) -> List[Dict[str, Any]]:
-        return await self.request(Route("POST", "/listings"), json=parameters)
+    async def list_item(self, parameters: Dict, *, priority: RequestPriority = RequestPriority.high) -> List[Dict[str, Any]]:
+        return await self.request(Route("POST", "/listings"), json=parameters, priority=priority)
 
     async def get_user(self, user_id: int) -> Dict[str, Any]:
-        return await self.request(Route("GET", f"/users/{user_id}"))
+        return await self.request(Route("GET", "/users/{user_id}", user_id=user_id))
 
-    async def get_user_stall(self, user_id: int, **parameters: Any) -> List[Dict[str, Any]]:
-        return await self.request(Route("GET", f"/users/{user_id}/stall"), **parameters)
+    async def get_user_stall(
+        self, user_id: int, *, priority: RequestPriority = RequestPriority.low, **parameters: Any
+    ) -> List[Dict[str, Any]]:
+        return await self.request(Route("GET", "/users/{user_id}/stall", user_id=user_id), priority=priority, **parameters)
 
     # Undocumented endpoints (only usable with an API key)
     async def me(self) -> Dict[str, Any]:
@@ -144,5 +340,5 @@ class HTTPClient:
     async def get_inventory(self) -> List[Dict[str, Any]]:
         return await self.request(Route("GET", "/me/inventory"))
 
-    async def unlist_item(self, listing_id: int) -> Dict[str, str]:
-        return await self.request(Route("DELETE", f"/listings/{listing_id}"))
+    async def unlist_item(self, listing_id: int, *, priority: RequestPriority = RequestPriority.high) -> Dict[str, str]:
+        return await self.request(Route("DELETE", "/listings/{listing_id}", listing_id=listing_id), priority=priority)
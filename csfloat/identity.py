@@ -0,0 +1,141 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from .errors import BadArgument
+from .item import Reference
+from .user import User
+
+__all__ = ("IdentityMap",)
+
+
+class _LRU:
+    __slots__ = ("_entries", "_maxsize")
+
+    def __init__(self, maxsize: int) -> None:
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._maxsize = maxsize
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class IdentityMap:
+    """Shares :class:`User` and :class:`Reference` objects between listings.
+
+    Users are keyed by their ``steam_id`` (or ``obfuscated_id``), references by the
+    ``market_hash_name`` of the item they belong to. Looking up an entity that is already known
+    returns the existing object. Listings created with an identity map register their seller and
+    reference on creation and the existing object is updated in place if the data differs, so the
+    data of the most recently created listing wins. Both maps are bounded LRU caches.
+
+    Pass an identity map to :class:`Listing`, :class:`ListingAsyncIterator` or
+    :meth:`Client.fetch_all_listings` to use it.
+    """
+
+    __slots__ = (
+        "_users",
+        "_references",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, *, max_users: int = 10_000, max_references: int = 10_000) -> None:
+        if max_users <= 0 or max_references <= 0:
+            raise BadArgument("max_users and max_references have to be positive integers")
+
+        self._users = _LRU(max_users)
+        self._references = _LRU(max_references)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self) -> str:
+        return f"<IdentityMap users={len(self._users)} references={len(self._references)} hits={self.hits} misses={self.misses}>"
+
+    def clear(self) -> None:
+        """Forgets every cached entity."""
+        self._users.clear()
+        self._references.clear()
+
+    def user(self, data: Dict[str, Any], *, update: bool = True) -> User:
+        """Returns the shared :class:`User` for ``data``.
+
+        If ``update`` is ``True`` and the user is already known, it is updated with ``data``.
+        """
+        key = data.get("steam_id") or data.get("obfuscated_id")
+        if key is None:
+            return User(data=data)
+
+        entry = self._users.get(key)
+        if entry is not None:
+            self.hits += 1
+            user, source = entry
+            if update and source is not data and source != data:
+                user.__init__(data=data)
+                self._users.put(key, (user, data))
+            return user
+
+        self.misses += 1
+        user = User(data=data)
+        self._users.put(key, (user, data))
+        return user
+
+    def reference(self, key: Optional[str], data: Dict[str, Any], *, update: bool = True) -> Reference:
+        """Returns the shared :class:`Reference` of the item ``key`` for ``data``.
+
+        If ``update`` is ``True`` and the reference is already known, it is updated with ``data``.
+        """
+        if key is None:
+            return Reference(data=data)
+
+        entry = self._references.get(key)
+        if entry is not None:
+            self.hits += 1
+            reference, source = entry
+            if update and source is not data and source != data:
+                reference.__init__(data=data)
+                self._references.put(key, (reference, data))
+            return reference
+
+        self.misses += 1
+        reference = Reference(data=data)
+        self._references.put(key, (reference, data))
+        return reference
@@ -0,0 +1,548 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import bisect
+from typing import Any, AsyncIterable, Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from .item import AttachmentReference
+from .listing import Listing
+
+__all__ = (
+    "ListingIndex",
+    "AttachmentIndex",
+)
+
+
+class _HashIndex:
+    __slots__ = ("_buckets",)
+
+    def __init__(self) -> None:
+        self._buckets: Dict[Hashable, Set[str]] = {}
+
+    def add(self, value: Hashable, listing_id: str) -> None:
+        if value is not None:
+            self._buckets.setdefault(value, set()).add(listing_id)
+
+    def discard(self, value: Hashable, listing_id: str) -> None:
+        bucket = self._buckets.get(value)
+        if bucket is not None:
+            bucket.discard(listing_id)
+            if not bucket:
+                del self._buckets[value]
+
+    def get(self, value: Hashable) -> Set[str]:
+        return self._buckets.get(value, set())
+
+
+# entries per bucket of a _SortedIndex; a bucket is split when it grows to twice this size
+_BUCKET_SIZE = 512
+
+
+class _SortedIndex:
+    # The entries are kept in sorted buckets of at most 2 * _BUCKET_SIZE entries, so an insert or
+    # removal moves O(_BUCKET_SIZE) entries instead of shifting one list of all entries.
+    __slots__ = (
+        "_buckets",
+        "_maxes",
+        "_size",
+    )
+
+    def __init__(self) -> None:
+        self._buckets: List[List[Tuple[Any, str]]] = []
+        # the last entry of every bucket
+        self._maxes: List[Tuple[Any, str]] = []
+        self._size = 0
+
+    def add(self, value: Any, listing_id: str) -> None:
+        if value is None:
+            return
+        entry = (value, listing_id)
+        self._size += 1
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._maxes.append(entry)
+            return
+
+        position = min(bisect.bisect_left(self._maxes, entry), len(self._buckets) - 1)
+        bucket = self._buckets[position]
+        bisect.insort(bucket, entry)
+        self._maxes[position] = bucket[-1]
+        if len(bucket) >= 2 * _BUCKET_SIZE:
+            self._buckets.insert(position + 1, bucket[_BUCKET_SIZE:])
+            del bucket[_BUCKET_SIZE:]
+            self._maxes.insert(position, bucket[-1])
+
+    def add_many(self, entries: Iterable[Tuple[Any, str]]) -> None:
+        new = [entry for entry in entries if entry[0] is not None]
+        if len(new) * 8 < self._size:
+            for value, listing_id in new:
+                self.add(value, listing_id)
+            return
+
+        # sorting everything once beats that many inserts
+        merged = [entry for bucket in self._buckets for entry in bucket]
+        merged.extend(new)
+        merged.sort()
+        self._buckets = [merged[i : i + _BUCKET_SIZE] for i in range(0, len(merged), _BUCKET_SIZE)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._size = len(merged)
+
+    def discard(self, value: Any, listing_id: str) -> None:
+        if value is None:
+            return
+        entry = (value, listing_id)
+        position = bisect.bisect_left(self._maxes, entry)
+        if position == len(self._buckets):
+            return
+        bucket = self._buckets[position]
+        index = bisect.bisect_left(bucket, entry)
+        if index == len(bucket) or bucket[index] != entry:
+            return
+
+        del bucket[index]
+        self._size -= 1
+        if bucket:
+            self._maxes[position] = bucket[-1]
+        else:
+            del self._buckets[position]
+            del self._maxes[position]
+
+    def range(self, low: Optional[Any], high: Optional[Any]) -> List[str]:
+        buckets = self._buckets
+        if not buckets:
+            return []
+        # (high, chr(0x10FFFF)) sorts after every entry with value == high
+        first = 0 if low is None else bisect.bisect_left(self._maxes, (low,))
+        last = len(buckets) - 1 if high is None else bisect.bisect_right(self._maxes, (high, "\U0010ffff"))
+        last = min(last, len(buckets) - 1)
+
+        listing_ids: List[str] = []
+        for position in range(first, last + 1):
+            bucket = buckets[position]
+            start = 0 if low is None or position != first else bisect.bisect_left(bucket, (low,))
+            stop = len(bucket) if high is None or position != last else bisect.bisect_right(bucket, (high, "\U0010ffff"))
+            listing_ids.extend(listing_id for _, listing_id in bucket[start:stop])
+        return listing_ids
+
+
+class ListingIndex:
+    """An in-memory index of listings keyed by ``listing_id``.
+
+    Hash indexes cover ``def_index``, ``paint_index``, ``paint_seed`` and ``market_hash_name``,
+    sorted indexes cover ``float_value`` and ``price`` for range queries. Adding a listing with an
+    ID that is already indexed replaces the old entry.
+    """
+
+    __slots__ = (
+        "_listings",
+        "_keys",
+        "_def_index",
+        "_paint_index",
+        "_paint_seed",
+        "_market_hash_name",
+        "_float_value",
+        "_price",
+    )
+
+    def __init__(self, listings: Optional[Iterable[Listing]] = None) -> None:
+        self._listings: Dict[str, Listing] = {}
+        # listing_id -> (def_index, paint_index, paint_seed, market_hash_name, float_value, price)
+        self._keys: Dict[str, Tuple[Any, ...]] = {}
+        self._def_index = _HashIndex()
+        self._paint_index = _HashIndex()
+        self._paint_seed = _HashIndex()
+        self._market_hash_name = _HashIndex()
+        self._float_value = _SortedIndex()
+        self._price = _SortedIndex()
+
+        if listings is not None:
+            self.add_many(listings)
+
+    def __repr__(self) -> str:
+        return f"<ListingIndex size={len(self)}>"
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    def __contains__(self, listing_id: object) -> bool:
+        return listing_id in self._listings
+
+    def __iter__(self):
+        return iter(self._listings.values())
+
+    def _add_unsorted(self, listing: Listing) -> Tuple[str, Tuple[Any, ...]]:
+        # adds a listing to everything but the sorted indexes
+        listing_id = listing.listing_id
+        if listing_id in self._listings:
+            self.remove(listing_id)
+
+        item = listing.item
+        keys = (
+            item.def_index,
+            item.paint_index,
+            item.paint_seed,
+            item.market_hash_name,
+            item.float_value,
+            listing._price,
+        )
+        self._listings[listing_id] = listing
+        self._keys[listing_id] = keys
+        self._def_index.add(keys[0], listing_id)
+        self._paint_index.add(keys[1], listing_id)
+        self._paint_seed.add(keys[2], listing_id)
+        self._market_hash_name.add(keys[3], listing_id)
+        return listing_id, keys
+
+    def add(self, listing: Listing) -> None:
+        """Adds a listing or replaces the indexed listing with the same ID."""
+        listing_id, keys = self._add_unsorted(listing)
+        self._float_value.add(keys[4], listing_id)
+        self._price.add(keys[5], listing_id)
+
+    def add_many(self, listings: Iterable[Listing]) -> None:
+        """Adds multiple listings.
+
+        The sorted indexes are updated once for the whole batch, so building an index from a large
+        crawl sorts the entries once instead of inserting them one by one.
+        """
+        # the last listing of an ID wins, as with repeated add calls
+        batch = {listing.listing_id: listing for listing in listings}
+        added = [self._add_unsorted(listing) for listing in batch.values()]
+        self._float_value.add_many((keys[4], listing_id) for listing_id, keys in added)
+        self._price.add_many((keys[5], listing_id) for listing_id, keys in added)
+
+    async def feed(self, source: AsyncIterable[Listing]) -> int:
+        """*coroutine*
+        Adds every listing of a stream, e.g. a :class:`ListingAsyncIterator`.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listings that were added.
+        """
+        count = 0
+        async for listing in source:
+            self.add(listing)
+            count += 1
+        return count
+
+    def remove(self, listing_id: str) -> Optional[Listing]:
+        """Removes a listing by ID and returns it, or ``None`` if it was not indexed."""
+        listing = self._listings.pop(listing_id, None)
+        if listing is None:
+            return None
+
+        keys = self._keys.pop(listing_id)
+        self._def_index.discard(keys[0], listing_id)
+        self._paint_index.discard(keys[1], listing_id)
+        self._paint_seed.discard(keys[2], listing_id)
+        self._market_hash_name.discard(keys[3], listing_id)
+        self._float_value.discard(keys[4], listing_id)
+        self._price.discard(keys[5], listing_id)
+        return listing
+
+    def get(self, listing_id: str) -> Optional[Listing]:
+        """Returns the listing with the given ID, if indexed."""
+        return self._listings.get(listing_id)
+
+    def _resolve(self, listing_ids: Iterable[str]) -> List[Listing]:
+        listings = self._listings
+        return [listings[listing_id] for listing_id in listing_ids]
+
+    def by_def_index(self, def_index: int, paint_index: Optional[int] = None) -> List[Listing]:
+        """Returns the listings with the given ``def_index`` and, optionally, ``paint_index``."""
+        return self.query(def_index=def_index, paint_index=paint_index)
+
+    def by_paint_index(self, paint_index: int) -> List[Listing]:
+        """Returns the listings with the given ``paint_index``."""
+        return self._resolve(self._paint_index.get(paint_index))
+
+    def by_paint_seed(self, paint_seed: int) -> List[Listing]:
+        """Returns the listings with the given ``paint_seed``."""
+        return self._resolve(self._paint_seed.get(paint_seed))
+
+    def by_market_hash_name(self, market_hash_name: str) -> List[Listing]:
+        """Returns the listings with the given ``market_hash_name``."""
+        return self._resolve(self._market_hash_name.get(market_hash_name))
+
+    def float_range(self, min: Optional[float] = None, max: Optional[float] = None) -> List[Listing]:
+        """Returns the listings with a float value within ``[min, max]``, ordered by float value."""
+        return self._resolve(self._float_value.range(min, max))
+
+    def price_range(self, min: Optional[float] = None, max: Optional[float] = None) -> List[Listing]:
+        """Returns the listings with a price in USD within ``[min, max]``, ordered by price."""
+        low = None if min is None else round(min * 100)
+        high = None if max is None else round(max * 100)
+        return self._resolve(self._price.range(low, high))
+
+    def query(
+        self,
+        *,
+        def_index: Optional[int] = None,
+        paint_index: Optional[int] = None,
+        paint_seed: Optional[int] = None,
+        market_hash_name: Optional[str] = None,
+        min_float: Optional[float] = None,
+        max_float: Optional[float] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> List[Listing]:
+        """Returns the listings matching all given conditions. Prices are in USD.
+
+        The hash indexes are intersected smallest first, range conditions are checked against
+        the candidates or, without any equality condition, served from the sorted indexes.
+        """
+        candidates: List[Set[str]] = []
+        if def_index is not None:
+            candidates.append(self._def_index.get(def_index))
+        if paint_index is not None:
+            candidates.append(self._paint_index.get(paint_index))
+        if paint_seed is not None:
+            candidates.append(self._paint_seed.get(paint_seed))
+        if market_hash_name is not None:
+            candidates.append(self._market_hash_name.get(market_hash_name))
+
+        low_price = None if min_price is None else round(min_price * 100)
+        high_price = None if max_price is None else round(max_price * 100)
+
+        if not candidates:
+            if min_float is not None or max_float is not None:
+                listing_ids: Iterable[str] = self._float_value.range(min_float, max_float)
+            elif low_price is not None or high_price is not None:
+                return self._resolve(self._price.range(low_price, high_price))
+            else:
+                listing_ids = self._listings.keys()
+        else:
+            candidates.sort(key=len)
+            listing_ids = candidates[0].intersection(*candidates[1:])
+
+        result = []
+        for listing_id in listing_ids:
+            _, _, _, _, float_value, price = self._keys[listing_id]
+            if min_float is not None and (float_value is None or float_value < min_float):
+                continue
+            if max_float is not None and (float_value is None or float_value > max_float):
+                continue
+            if low_price is not None and price < low_price:
+                continue
+            if high_price is not None and price > high_price:
+                continue
+            result.append(self._listings[listing_id])
+        return result
+
+
+class AttachmentIndex:
+    """An inverted index from applied stickers and keychains to listing IDs.
+
+    The index reads the raw ``stickers`` and ``keychains`` dicts of each listing and never builds
+    :class:`Sticker` or :class:`Keychain` objects, so it can be fed directly with the pages of
+    :meth:`ListingAsyncIterator.pages`.
+    """
+
+    __slots__ = (
+        "_attachments",
+        "_stickers",
+        "_sticker_slots",
+        "_keychains",
+        "_keychain_patterns",
+        "_references",
+    )
+
+    def __init__(self) -> None:
+        # listing_id -> ((sticker_id, slot, wear, price), ...), ((sticker_id, pattern, price), ...)
+        self._attachments: Dict[str, Tuple[Tuple[Tuple[Any, ...], ...], Tuple[Tuple[Any, ...], ...]]] = {}
+        # sticker_id -> {listing_id: number of copies}
+        self._stickers: Dict[int, Dict[str, int]] = {}
+        self._sticker_slots: Dict[Tuple[int, int], Set[str]] = {}
+        self._keychains: Dict[int, Set[str]] = {}
+        self._keychain_patterns: Dict[Tuple[int, Any], Set[str]] = {}
+        # sticker_id -> most recently seen reference dict
+        self._references: Dict[int, Dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"<AttachmentIndex listings={len(self)} stickers={len(self._stickers)} keychains={len(self._keychains)}>"
+
+    def __len__(self) -> int:
+        return len(self._attachments)
+
+    def __contains__(self, listing_id: object) -> bool:
+        return listing_id in self._attachments
+
+    def add(self, listing: Union[Listing, Dict[str, Any]]) -> None:
+        """Indexes the attachments of a :class:`Listing` or raw listing dict, replacing a previous entry with the same ID."""
+        if isinstance(listing, Listing):
+            listing_id = listing._listing_id
+            item = listing._item or {}
+        else:
+            listing_id = listing.get("id", "")
+            item = listing.get("item") or {}
+
+        if listing_id in self._attachments:
+            self.remove(listing_id)
+
+        stickers = []
+        for sticker in item.get("stickers") or ():
+            sticker_id = sticker.get("stickerId")
+            if sticker_id is None:
+                continue
+            reference = sticker.get("reference")
+            if reference:
+                self._references[sticker_id] = reference
+            price = reference.get("price") or 0 if reference else 0
+            slot = sticker.get("slot")
+            stickers.append((sticker_id, slot, sticker.get("wear", 1.0), price))
+
+            copies = self._stickers.setdefault(sticker_id, {})
+            copies[listing_id] = copies.get(listing_id, 0) + 1
+            self._sticker_slots.setdefault((sticker_id, slot), set()).add(listing_id)
+
+        keychains = []
+        for keychain in item.get("keychains") or ():
+            sticker_id = keychain.get("stickerId")
+            if sticker_id is None:
+                continue
+            reference = keychain.get("reference")
+            price = reference.get("price") or 0 if reference else 0
+            pattern = keychain.get("pattern")
+            keychains.append((sticker_id, pattern, price))
+
+            self._keychains.setdefault(sticker_id, set()).add(listing_id)
+            self._keychain_patterns.setdefault((sticker_id, pattern), set()).add(listing_id)
+
+        if stickers or keychains:
+            self._attachments[listing_id] = (tuple(stickers), tuple(keychains))
+
+    def add_many(self, listings: Iterable[Union[Listing, Dict[str, Any]]]) -> None:
+        """Indexes multiple listings, e.g. a page of raw listing dicts."""
+        for listing in listings:
+            self.add(listing)
+
+    async def feed(self, source: AsyncIterable[Any]) -> None:
+        """*coroutine*
+        Indexes every listing of a stream of listings or of pages, e.g. :meth:`ListingAsyncIterator.pages`.
+        """
+        async for element in source:
+            if isinstance(element, (list, tuple)):
+                self.add_many(element)
+            else:
+                self.add(element)
+
+    def remove(self, listing_id: str) -> bool:
+        """Removes a listing from the index and returns whether it was indexed."""
+        entry = self._attachments.pop(listing_id, None)
+        if entry is None:
+            return False
+
+        stickers, keychains = entry
+        for sticker_id, slot, _, _ in stickers:
+            copies = self._stickers.get(sticker_id)
+            if copies is not None:
+                copies.pop(listing_id, None)
+                if not copies:
+                    del self._stickers[sticker_id]
+            _discard(self._sticker_slots, (sticker_id, slot), listing_id)
+
+        for sticker_id, pattern, _ in keychains:
+            _discard(self._keychains, sticker_id, listing_id)
+            _discard(self._keychain_patterns, (sticker_id, pattern), listing_id)
+        return True
+
+    def with_sticker(
+        self,
+        sticker_id: int,
+        *,
+        count: int = 1,
+        slot: Optional[int] = None,
+        max_wear: Optional[float] = None,
+    ) -> List[str]:
+        """Returns the IDs of the listings carrying at least ``count`` copies of a sticker.
+
+        Parameters
+        ----------
+        sticker_id: :class:`int`
+            The :attr:`Sticker.sticker_id` to look for.
+        count: :class:`int`
+            The minimum number of copies, e.g. ``4`` for a "4x" craft.
+        slot: Optional[:class:`int`]
+            Only consider copies in this slot.
+        max_wear: Optional[:class:`float`]
+            Only count copies with a wear of at most this value.
+        """
+        if slot is not None:
+            listing_ids: Iterable[str] = self._sticker_slots.get((sticker_id, slot), ())
+        else:
+            copies = self._stickers.get(sticker_id, {})
+            if max_wear is None:
+                return [listing_id for listing_id, n in copies.items() if n >= count]
+            listing_ids = copies.keys()
+
+        result = []
+        for listing_id in listing_ids:
+            matching = 0
+            for sid, sslot, wear, _ in self._attachments[listing_id][0]:
+                if sid != sticker_id or (slot is not None and sslot != slot):
+                    continue
+                if max_wear is not None and (wear or 0.0) > max_wear:
+                    continue
+                matching += 1
+            if matching >= count:
+                result.append(listing_id)
+        return result
+
+    def with_keychain(self, sticker_id: int, *, pattern: Optional[Any] = None) -> List[str]:
+        """Returns the IDs of the listings carrying a keychain, optionally with a specific pattern."""
+        if pattern is not None:
+            return list(self._keychain_patterns.get((sticker_id, pattern), ()))
+        return list(self._keychains.get(sticker_id, ()))
+
+    def sticker_count(self, sticker_id: int) -> int:
+        """Returns the total number of indexed copies of a sticker."""
+        return sum(self._stickers.get(sticker_id, {}).values())
+
+    def reference(self, sticker_id: int) -> Optional[AttachmentReference]:
+        """Returns the most recently seen :class:`AttachmentReference` of a sticker."""
+        data = self._references.get(sticker_id)
+        return AttachmentReference(data=data) if data else None
+
+    def sticker_value(self, listing_id: str) -> float:
+        """Returns the summed reference price in USD of all stickers applied to a listing."""
+        entry = self._attachments.get(listing_id)
+        return sum(price for _, _, _, price in entry[0]) / 100 if entry else 0.0
+
+    def keychain_value(self, listing_id: str) -> float:
+        """Returns the summed reference price in USD of all keychains attached to a listing."""
+        entry = self._attachments.get(listing_id)
+        return sum(price for _, _, price in entry[1]) / 100 if entry else 0.0
+
+    def attachment_value(self, listing_id: str) -> float:
+        """Returns the summed reference price in USD of all stickers and keychains of a listing."""
+        return self.sticker_value(listing_id) + self.keychain_value(listing_id)
+
+
+def _discard(mapping: Dict[Any, Set[str]], key: Any, listing_id: str) -> None:
+    bucket = mapping.get(key)
+    if bucket is not None:
+        bucket.discard(listing_id)
+        if not bucket:
+            del mapping[key]
@@ -23,10 +23,40 @@ SOFTWARE.
 """
 
 import asyncio
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+import json
+import time
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple, TypeVar, Union
 
 from .errors import BadRequest
 from .listing import Listing
+from .profiling import PipelineProfiler
+from .tracing import NoOpTracer, Tracer
+
+if TYPE_CHECKING:
+    from .concurrency import AdaptiveLimiter
+    from .identity import IdentityMap
+
+__all__ = ("ListingAsyncIterator",)
+
+T = TypeVar("T")
+
+# upper bound of the pages fetched ahead when the depth follows an AdaptiveLimiter
+MAX_PREFETCH = 4
+
+
+# Module level so they can be pickled for a ProcessPoolExecutor.
+def _decode_page(body: bytes) -> List[Dict[str, Any]]:
+    return json.loads(body)["data"]
+
+
+def _build_page(body: bytes) -> List[Listing]:
+    return [Listing(data=data) for data in json.loads(body)["data"]]
+
+
+def _retrieve(task: "asyncio.Task[Any]") -> None:
+    if not task.cancelled():
+        task.exception()
 
 
 class ListingAsyncIterator:
@@ -35,9 +65,26 @@ class ListingAsyncIterator:
         getter: Callable[..., Coroutine[Any, Any, Any]],
         limit: Optional[int] = None,
         pagination_token: int = 0,
+        identity_map: Optional["IdentityMap"] = None,
+        executor: Optional[Executor] = None,
+        profiler: Optional[PipelineProfiler] = None,
+        tracer: Optional[Tracer] = None,
+        limiter: Optional["AdaptiveLimiter"] = None,
+        prefetch: Optional[int] = None,
         **kwargs: Dict[str, Any],
     ) -> None:
         self.limit = limit
+        self.identity_map = identity_map
+        # pages are fetched as raw bytes and decoded, and their listings built, in this executor if set
+        self.executor = executor
+        self.profiler = profiler
+        self.tracer = tracer if tracer is not None else NoOpTracer()
+        # pages fetched ahead of the consumer; None follows the limit of the limiter
+        self.limiter = limiter
+        self.prefetch = prefetch
+        self._prefetched: Dict[int, Tuple[Optional[Callable[[bytes], Any]], asyncio.Task]] = {}
+        # when the last element was handed to the consumer, for the consumer stage of the profiler
+        self._handed_out: Optional[float] = None
         self.has_more = True
         self.getter = getter
         self.kwargs = kwargs
@@ -47,14 +94,28 @@ class ListingAsyncIterator:
         self.next_token = pagination_token + 1
 
     async def __anext__(self):
-        try:
+        if self.profiler is None:
             return await self.next()
-        except StopAsyncIteration as e:
-            raise
+
+        self._record_consumer()
+        listing = await self.next()
+        self._handed_out = time.perf_counter()
+        return listing
+
+    def _record_consumer(self) -> None:
+        if self._handed_out is not None:
+            self.profiler.add("consumer", time.perf_counter() - self._handed_out)  # type: ignore
+            self._handed_out = None
 
     def __aiter__(self):
         return self
 
+    async def __aenter__(self) -> "ListingAsyncIterator":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
     async def flatten(self):
         return [element async for element in self]
 
@@ -71,16 +132,138 @@ class ListingAsyncIterator:
         if not self.has_more:
             raise StopAsyncIteration
 
-        self.kwargs["page"] = self.pagination_token
-        try:
-            data: Dict[str, Any] = await self.getter(params=self.kwargs)
-            listings = data["data"]
-        except BadRequest:
+        if self.executor is not None:
+            listings = await self._next_page(_build_page)
+            if listings is None:
+                return
+            if self.identity_map is not None:
+                for listing in listings:
+                    listing._attach(self.identity_map)
+        else:
+            page = await self._next_page(None)
+            if page is None:
+                return
+            start = time.perf_counter()
+            listings = [Listing(data=l, identity_map=self.identity_map) for l in page]
+            if self.profiler is not None:
+                self.profiler.add("construct", time.perf_counter() - start)
+
+        for listing in reversed(listings):
+            self.listings.put_nowait(listing)
+
+    async def fetch_page(self) -> Optional[List[Dict[str, Any]]]:
+        """*coroutine*
+        Fetches the next page and returns the raw listing dicts without building :class:`Listing` objects.
+
+        Returns
+        -------
+        Optional[List[Dict[str, Any]]]
+            The listings of the page or ``None`` if there are no more pages.
+        """
+        return await self._next_page(_decode_page)
+
+    def _prefetch_depth(self) -> int:
+        if self.prefetch is not None:
+            return self.prefetch
+        if self.limiter is not None:
+            return max(min(self.limiter.limit - 1, MAX_PREFETCH), 0)
+        return 0
+
+    async def _fetch(self, page: int, parse: Optional[Callable[[bytes], List[T]]]) -> List[T]:
+        params = dict(self.kwargs, page=page)
+        if self.executor is not None and parse is not None:
+            body: bytes = await self.getter(params=params, raw=True)
+            start = time.perf_counter()
+            listings = await asyncio.get_running_loop().run_in_executor(self.executor, parse, body)
+            if self.profiler is not None:
+                self.profiler.add("construct" if parse is _build_page else "decode", time.perf_counter() - start)
+            return listings
+
+        data: Dict[str, Any] = await self.getter(params=params)
+        return data["data"]
+
+    def _page_task(self, page: int, parse: Optional[Callable[[bytes], List[T]]]) -> "asyncio.Task[List[T]]":
+        # starts the requests for the following pages, so they run while this one is consumed
+        for ahead in range(page + 1, page + 1 + self._prefetch_depth()):
+            if ahead not in self._prefetched:
+                task = asyncio.ensure_future(self._fetch(ahead, parse))
+                # an abandoned prefetch that failed mustn't be logged as never retrieved, the error
+                # is still raised when the page is awaited
+                task.add_done_callback(_retrieve)
+                self._prefetched[ahead] = (parse, task)
+
+        prefetched = self._prefetched.pop(page, None)
+        if prefetched is not None and prefetched[0] is parse:
+            return prefetched[1]
+        if prefetched is not None:
+            prefetched[1].cancel()
+        return asyncio.ensure_future(self._fetch(page, parse))
+
+    def _cancel_prefetch(self) -> None:
+        for _, task in self._prefetched.values():
+            if task.done():
+                if not task.cancelled():
+                    task.exception()  # mark it as retrieved
+            else:
+                task.cancel()
+        self._prefetched.clear()
+
+    async def aclose(self) -> None:
+        """*coroutine*
+        Stops the iteration and cancels the pages that were requested ahead.
+
+        Call this when the iterator is abandoned before it is exhausted, so prefetched requests
+        don't keep running and holding slots of the limiter.
+        """
+        self.has_more = False
+        tasks = [task for _, task in self._prefetched.values()]
+        self._cancel_prefetch()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _next_page(self, parse: Optional[Callable[[bytes], List[T]]]) -> Optional[List[T]]:
+        if not self.has_more:
+            return None
+
+        page = self.pagination_token
+        with self.tracer.span("ListingAsyncIterator.page", {"csfloat.page": page}) as span:
+            try:
+                listings = await self._page_task(page, parse)
+            except BadRequest:
+                self.has_more = False
+                self._cancel_prefetch()
+                return None
+
+            span.set_attribute("csfloat.item_count", len(listings))
+
+        if not listings:
             self.has_more = False
-            return
+            self._cancel_prefetch()
+            return None
 
-        for l in reversed(listings):
-            self.listings.put_nowait(Listing(data=l))
+        if self.profiler is not None:
+            self.profiler.record_page(len(listings))
 
         self.pagination_token = self.next_token
         self.next_token = self.pagination_token + 1
+        return listings
+
+    async def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Iterates over the remaining pages as lists of raw listing dicts.
+
+        This skips the construction of :class:`Listing` objects and is meant for bulk consumers
+        like :class:`ListingFrame`. The iterator is closed with :meth:`aclose` when the generator
+        is, e.g. when the consuming loop breaks.
+        """
+        try:
+            while True:
+                if self.profiler is not None:
+                    self._record_consumer()
+                listings = await self.fetch_page()
+                if listings is None:
+                    return
+                if self.profiler is not None:
+                    self._handed_out = time.perf_counter()
+                yield listings
+        finally:
+            await self.aclose()
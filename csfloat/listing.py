@@ -23,11 +23,15 @@ SOFTWARE.
 """
 
 import datetime
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 from .enums import ListingType
 from .item import Item, Reference
 from .user import User
+from .utils import parse_time
+
+if TYPE_CHECKING:
+    from .identity import IdentityMap
 
 __all__ = (
     "TopBid",
@@ -66,7 +70,7 @@ class TopBid:
     @property
     def created_at(self) -> datetime.datetime:
         """:class:`datetime.datetime`: Returns the created at of the item."""
-        return datetime.datetime.fromisoformat(self._created_at)
+        return parse_time(self._created_at)
 
     @property
     def price(self) -> float:
@@ -115,7 +119,7 @@ class AuctionDetails:
 
     @property
     def expires_at(self) -> datetime.datetime:
-        return datetime.datetime.fromisoformat(self._expires_at)
+        return parse_time(self._expires_at)
 
     @property
     def min_next_bid(self) -> float:
@@ -141,9 +145,10 @@ class Listing:
         "_is_watchlisted",
         "_watchers",
         "_auction_details",
+        "_identity_map",
     )
 
-    def __init__(self, *, data: Dict[str, Any]) -> None:
+    def __init__(self, *, data: Dict[str, Any], identity_map: Optional["IdentityMap"] = None) -> None:
         self._listing_id = data.get("id", "")
         self._created_at = data.get("created_at", "1970-01-01T00:00:00.000000Z")
         self._description = data.get("description", None)
@@ -159,10 +164,27 @@ class Listing:
         self._is_watchlisted = data.get("is_watchlisted", False)
         self._watchers = data.get("watchers", 0)
         self._auction_details = data.get("auction_details", None)
+        self._identity_map = None
+
+        if identity_map is not None:
+            self._attach(identity_map)
 
     def __repr__(self) -> str:
         return f"Listing(data={{'id': {self._listing_id!r}, 'created_at': {self._created_at!r},  'description': {self._description!r}, 'type': {self._type!r}, 'price': {self._price!r}, 'state': {self._state!r}, 'seller': {self._seller!r}, 'reference': {self._reference!r}, 'item': {self._item!r}, 'is_seller': {self._is_seller!r}, 'min_offer_price': {self._min_offer_price!r}, 'max_offer_discount': {self._max_offer_discount!r}, 'is_watchlisted': {self._is_watchlisted!r}, 'watchers': {self._watchers!r}, 'auction_details': {self._auction_details!r}}})"
 
+    def _attach(self, identity_map: "IdentityMap") -> None:
+        self._identity_map = identity_map
+        if self._seller:
+            identity_map.user(self._seller)
+        if self._reference:
+            identity_map.reference((self._item or {}).get("market_hash_name"), self._reference)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the raw data of the listing in the format of the API."""
+        data = {slot[1:]: getattr(self, slot) for slot in Listing.__slots__ if slot != "_identity_map"}
+        data["id"] = data.pop("listing_id")
+        return data
+
     @property
     def listing_id(self) -> str:
         """:class:`str`: Returns the ID of the item."""
@@ -171,7 +193,7 @@ class Listing:
     @property
     def created_at(self) -> datetime.datetime:
         """:class:`datetime.datetime`: Returns the created at of the item."""
-        return datetime.datetime.fromisoformat(self._created_at)
+        return parse_time(self._created_at)
 
     @property
     def description(self) -> Optional[str]:
@@ -196,11 +218,15 @@ class Listing:
     @property
     def seller(self) -> User:
         """Returns the seller of the item."""
+        if self._identity_map is not None:
+            return self._identity_map.user(self._seller, update=False)
         return User(data=self._seller)
 
     @property
     def reference(self) -> Reference:
         """Returns the reference of the item."""
+        if self._identity_map is not None:
+            return self._identity_map.reference((self._item or {}).get("market_hash_name"), self._reference, update=False)
         return Reference(data=self._reference)
 
     @property
@@ -237,3 +263,8 @@ class Listing:
     def auction_details(self) -> Optional[AuctionDetails]:
         """:class:`AuctionDetails`: Returns the details of the auction, if the listing is an auction."""
         return AuctionDetails(data=self._auction_details) if self._auction_details else None
+
+
+def _listing_data(listing: Union[Listing, Dict[str, Any]]) -> Dict[str, Any]:
+    # the raw dict of a listing, for consumers accepting both Listing objects and raw pages
+    return listing if isinstance(listing, dict) else listing.to_dict()
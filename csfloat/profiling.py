@@ -0,0 +1,228 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .errors import BadArgument
+
+__all__ = (
+    "ProfileSummary",
+    "PipelineProfiler",
+)
+
+
+_log = logging.getLogger(__name__)
+
+
+STAGES = (
+    "network",
+    "ratelimit",
+    "decode",
+    "construct",
+    "consumer",
+)
+
+
+class ProfileSummary:
+    """Represents a snapshot of the counters of a :class:`PipelineProfiler`."""
+
+    __slots__ = (
+        "_elapsed",
+        "_totals",
+        "_counts",
+        "_pages",
+        "_listings",
+    )
+
+    def __init__(
+        self,
+        *,
+        elapsed: float,
+        totals: Dict[str, float],
+        counts: Dict[str, int],
+        pages: int,
+        listings: int,
+    ) -> None:
+        self._elapsed = elapsed
+        self._totals = totals
+        self._counts = counts
+        self._pages = pages
+        self._listings = listings
+
+    def __repr__(self) -> str:
+        return f"<ProfileSummary elapsed={self._elapsed:.2f} pages={self._pages} listings={self._listings}>"
+
+    def __str__(self) -> str:
+        lines = [
+            f"{self._pages} pages, {self._listings} listings in {self._elapsed:.2f}s "
+            f"({self.pages_per_second:.2f} pages/s, {self.listings_per_second:.1f} listings/s)"
+        ]
+        for stage in STAGES:
+            total = self._totals.get(stage, 0.0)
+            count = self._counts.get(stage, 0)
+            share = total / self._elapsed * 100 if self._elapsed > 0 else 0.0
+            lines.append(f"  {stage:<10} {total:9.3f}s {share:5.1f}% {count:>8} calls")
+        return "\n".join(lines)
+
+    @property
+    def elapsed(self) -> float:
+        """:class:`float`: Returns the seconds since the profiler was created or reset."""
+        return self._elapsed
+
+    @property
+    def totals(self) -> Dict[str, float]:
+        """Dict[:class:`str`, :class:`float`]: Returns the cumulative seconds per stage."""
+        return self._totals
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Dict[:class:`str`, :class:`int`]: Returns the number of measurements per stage."""
+        return self._counts
+
+    @property
+    def pages(self) -> int:
+        """:class:`int`: Returns the number of pages fetched."""
+        return self._pages
+
+    @property
+    def listings(self) -> int:
+        """:class:`int`: Returns the number of listings fetched."""
+        return self._listings
+
+    @property
+    def pages_per_second(self) -> float:
+        """:class:`float`: Returns the pages fetched per second."""
+        return self._pages / self._elapsed if self._elapsed > 0 else 0.0
+
+    @property
+    def listings_per_second(self) -> float:
+        """:class:`float`: Returns the listings fetched per second."""
+        return self._listings / self._elapsed if self._elapsed > 0 else 0.0
+
+
+class PipelineProfiler:
+    """Collects cumulative timings of the stages of the listing pipeline.
+
+    The stages are:
+
+    - ``network``: waiting for responses in :meth:`HTTPClient.request`.
+    - ``ratelimit``: waiting for the rate budget and the concurrency limit, and sleeping after a 429 response.
+    - ``decode``: decoding JSON bodies.
+    - ``construct``: building :class:`Listing` objects. With an executor this includes the decoding.
+    - ``consumer``: the time between two listings or pages handed out by :class:`ListingAsyncIterator`,
+      i.e. the time spent in the consuming code.
+
+    Pass the profiler to :class:`Client` (or to :class:`HTTPClient` and :class:`ListingAsyncIterator`).
+    Recording a measurement is two :func:`time.perf_counter` calls and two dict updates.
+
+    Parameters
+    ----------
+    report_interval: Optional[:class:`float`]
+        If set, ``on_report`` is called with a :class:`ProfileSummary` at most once every
+        ``report_interval`` seconds, from within the recording code.
+    on_report: Optional[Callable[[:class:`ProfileSummary`], Any]]
+        The report callback. Defaults to logging the summary at INFO level.
+    """
+
+    __slots__ = (
+        "_start",
+        "_totals",
+        "_counts",
+        "_pages",
+        "_listings",
+        "_report_interval",
+        "_on_report",
+        "_last_report",
+    )
+
+    def __init__(
+        self,
+        *,
+        report_interval: Optional[float] = None,
+        on_report: Optional[Callable[[ProfileSummary], Any]] = None,
+    ) -> None:
+        if report_interval is not None and report_interval <= 0:
+            raise BadArgument("report_interval has to be positive")
+
+        self._report_interval = report_interval
+        self._on_report = on_report
+        self.reset()
+
+    def __repr__(self) -> str:
+        return f"<PipelineProfiler pages={self._pages} listings={self._listings}>"
+
+    def reset(self) -> None:
+        """Resets all counters."""
+        self._start = time.perf_counter()
+        self._last_report = self._start
+        self._totals: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self._counts: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self._pages = 0
+        self._listings = 0
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        """Adds a measurement to a stage."""
+        self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+        self._counts[stage] = self._counts.get(stage, 0) + count
+        if self._report_interval is not None:
+            self._maybe_report()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Context manager measuring the wall time of its body as a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def record_page(self, listings: int) -> None:
+        """Counts a fetched page with ``listings`` listings."""
+        self._pages += 1
+        self._listings += listings
+
+    def summary(self) -> ProfileSummary:
+        """Returns a :class:`ProfileSummary` of the current counters."""
+        return ProfileSummary(
+            elapsed=time.perf_counter() - self._start,
+            totals=dict(self._totals),
+            counts=dict(self._counts),
+            pages=self._pages,
+            listings=self._listings,
+        )
+
+    def _maybe_report(self) -> None:
+        now = time.perf_counter()
+        if now - self._last_report < self._report_interval:  # type: ignore
+            return
+        self._last_report = now
+
+        summary = self.summary()
+        if self._on_report is None:
+            _log.info(f"Listing pipeline profile:\n{summary}")
+        else:
+            self._on_report(summary)
@@ -0,0 +1,336 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .bulk import BulkJournal, BulkResult, RepriceRequest
+from .enums import ListingType, RequestPriority, SortingParameter
+from .errors import BadArgument, BadRequest
+from .listing import Listing
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__ = ("RepricingService",)
+
+
+_log = logging.getLogger(__name__)
+
+# the most listings the API returns per page
+STALL_PAGE_SIZE = 50
+
+
+def _market_hash_name(listing: Listing) -> Optional[str]:
+    return (listing._item or {}).get("market_hash_name")
+
+
+def _same_item(listing: Listing) -> Dict[str, Any]:
+    return {"market_hash_name": _market_hash_name(listing)}
+
+
+class RepricingService:
+    """Keeps the own buy now listings just below the cheapest competitor.
+
+    Each cycle fetches the own stall once, groups the listings by item key and fetches the cheapest
+    competing listings once per key. Competitor floors are cached for ``ttl`` seconds and listings
+    are only repriced when their target price differs from the current one, so the number of
+    requests grows with the number of distinct items and price changes, not with the number of
+    own listings.
+
+    The stall and the competitors are fetched with :attr:`RequestPriority.low`, the reprices are
+    sent with :attr:`RequestPriority.normal`.
+
+    Parameters
+    ----------
+    client: :class:`Client`
+        The authenticated client.
+    steam_id: :class:`str`
+        The Steam ID of the own account. Its listings are never considered competitors.
+    undercut: :class:`int`
+        The amount in cents to go below the competitor floor.
+    min_price: Optional[Callable[[:class:`Listing`], Optional[:class:`int`]]]
+        Returns the lowest acceptable price in cents for an own listing, or ``None`` for no limit.
+    key: Callable[[:class:`Listing`], Optional[:class:`str`]]
+        Returns the item key used to group listings; each group shares one competitor floor.
+        Defaults to the ``market_hash_name``. Listings without a key are left alone.
+    query: Callable[[:class:`Listing`], Dict[:class:`str`, Any]]
+        Returns the parameters of the competitor search for the group of a listing, e.g.
+        ``market_hash_name`` plus ``min_float`` and ``max_float`` for a wear bucket. It is called
+        with the first listing of every group, so it has to agree with ``key``. Defaults to the
+        ``market_hash_name`` of the listing. Sorting, type and limit are always set.
+    ttl: :class:`float`
+        The number of seconds a competitor floor is cached.
+    depth: :class:`int`
+        The number of cheapest listings fetched per item key; it has to exceed the number of own
+        listings of that item for the floor to be found.
+    stall_limit: :class:`int`
+        The maximum number of own listings fetched per cycle, in pages of at most 50.
+    concurrency: :class:`int`
+        The maximum number of requests in flight.
+    journal: Optional[:class:`BulkJournal`]
+        Records every planned reprice and its steps. Listings an interrupted cycle unlisted but
+        didn't list again are relisted at the start of the next cycle. Pass a journal with a path
+        to survive restarts; by default it only lives in memory.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        *,
+        steam_id: str,
+        undercut: int = 1,
+        min_price: Optional[Callable[[Listing], Optional[int]]] = None,
+        key: Callable[[Listing], Optional[str]] = _market_hash_name,
+        query: Callable[[Listing], Dict[str, Any]] = _same_item,
+        ttl: float = 60.0,
+        depth: int = 10,
+        stall_limit: int = 1000,
+        concurrency: int = 4,
+        journal: Optional[BulkJournal] = None,
+    ) -> None:
+        if undercut < 0:
+            raise BadArgument("undercut can't be negative")
+        if depth <= 0 or concurrency <= 0:
+            raise BadArgument("depth and concurrency have to be positive integers")
+
+        self.client: Client = client
+        self.steam_id: str = str(steam_id)
+        self.undercut: int = undercut
+        self.min_price: Optional[Callable[[Listing], Optional[int]]] = min_price
+        self.key: Callable[[Listing], Optional[str]] = key
+        self.query: Callable[[Listing], Dict[str, Any]] = query
+        self.ttl: float = ttl
+        self.depth: int = depth
+        self.stall_limit: int = stall_limit
+        self.concurrency: int = concurrency
+        self.journal: BulkJournal = journal if journal is not None else BulkJournal()
+        # item key -> (expires at, floor price in cents or None)
+        self._floors: Dict[str, Tuple[float, Optional[int]]] = {}
+        self._running = False
+        self.requests: int = 0
+
+    def __repr__(self) -> str:
+        return f"<RepricingService steam_id={self.steam_id!r} cached_floors={len(self._floors)}>"
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drops the cached floor of an item key, or of all keys."""
+        if key is None:
+            self._floors.clear()
+        else:
+            self._floors.pop(key, None)
+
+    async def _fetch_floor(self, query: Dict[str, Any]) -> Optional[int]:
+        params = dict(
+            query,
+            sort_by=str(SortingParameter.lowest_price),
+            type=ListingType.buy_now.value,
+            limit=self.depth,
+        )
+        self.requests += 1
+        data = await self.client.http.get_all_listings(params=params, priority=RequestPriority.low)
+        for listing in data.get("data", ()):
+            if str((listing.get("seller") or {}).get("steam_id")) != self.steam_id:
+                return listing.get("price")
+        return None
+
+    async def floors(self, queries: Dict[str, Dict[str, Any]]) -> Dict[str, Optional[int]]:
+        """*coroutine*
+        Returns the competitor floor in cents of each item key, fetching only expired or missing ones.
+
+        ``queries`` maps every item key to the parameters of its competitor search, see ``query``.
+        """
+        now = time.monotonic()
+        result: Dict[str, Optional[int]] = {}
+        missing = []
+        for key in queries:
+            cached = self._floors.get(key)
+            if cached is not None and cached[0] > now:
+                result[key] = cached[1]
+            else:
+                missing.append(key)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(key: str) -> None:
+            async with semaphore:
+                try:
+                    floor = await self._fetch_floor(queries[key])
+                except Exception as e:
+                    _log.warning(f"Fetching competitors of {key} failed: {e!r}")
+                    return
+            self._floors[key] = (time.monotonic() + self.ttl, floor)
+            result[key] = floor
+
+        await asyncio.gather(*(fetch(key) for key in missing))
+        return result
+
+    def target_price(self, listing: Listing, floor: Optional[int]) -> Optional[int]:
+        """Returns the price in cents ``listing`` should have, or ``None`` to leave it alone."""
+        if floor is None:
+            return None
+        target = floor - self.undercut
+        if self.min_price is not None:
+            minimum = self.min_price(listing)
+            if minimum is not None:
+                target = max(target, minimum)
+        return target if target > 0 else None
+
+    async def _fetch_stall(self) -> List[Listing]:
+        own: List[Listing] = []
+        page = 0
+        while len(own) < self.stall_limit:
+            limit = min(STALL_PAGE_SIZE, self.stall_limit - len(own))
+            self.requests += 1
+            try:
+                listings = await self.client.get_user_stall(
+                    self.steam_id, limit=limit, page=page, priority=RequestPriority.low
+                )  # type: ignore
+            except BadRequest:
+                # past the last page
+                break
+            own.extend(listings)
+            if len(listings) < limit:
+                break
+            page += 1
+        return own
+
+    async def plan(self) -> List[RepriceRequest]:
+        """*coroutine*
+        Fetches the own stall and the competitor floors and returns the reprices that are needed.
+        """
+        own = await self._fetch_stall()
+
+        groups: Dict[str, List[Listing]] = {}
+        for listing in own:
+            if listing._type != ListingType.buy_now.value:
+                continue
+            key = self.key(listing)
+            if key is not None:
+                groups.setdefault(key, []).append(listing)
+
+        floors = await self.floors({key: self.query(listings[0]) for key, listings in groups.items()})
+        requests = []
+        for key, listings in groups.items():
+            if key not in floors:
+                continue
+            for listing in listings:
+                target = self.target_price(listing, floors[key])
+                if target is not None and target != listing._price:
+                    requests.append(RepriceRequest.from_listing(listing, target))
+        return requests
+
+    def _unfinished(self) -> List[RepriceRequest]:
+        # unlisted by an earlier cycle, but not listed again
+        return [
+            RepriceRequest(key, **self.journal.get(key, "plan"))
+            for key in self.journal.keys("plan")
+            if self.journal.done(key, "unlist") and not self.journal.done(key, "list")
+        ]
+
+    async def resume(self) -> Optional[BulkResult[Listing]]:
+        """*coroutine*
+        Lists the listings again that an interrupted cycle unlisted but didn't list again.
+
+        The journal is compacted afterwards, so it only keeps the listings that are still unlisted.
+
+        Returns
+        -------
+        Optional[:class:`BulkResult` of :class:`Listing`]
+            The outcome of the relists or ``None`` if there was nothing to resume.
+        """
+        pending = self._unfinished()
+        result = None
+        if pending:
+            self.requests += len(pending)
+            result = await self.client.bulk_reprice_items(
+                pending, concurrency=self.concurrency, priority=RequestPriority.normal, journal=self.journal
+            )
+            _log.info(f"Relisted {len(result.succeeded)} of {len(pending)} listings of an interrupted cycle")
+
+        unlisted = {key: self.journal.get(key, "unlist") for key in self.journal.keys("plan")}
+        remaining = [(request, unlisted[request.listing_id]) for request in self._unfinished()]
+        self.journal.clear()
+        for request, data in remaining:
+            self._plan(request)
+            self.journal.record(request.listing_id, "unlist", data)
+        return result
+
+    def _plan(self, request: RepriceRequest) -> None:
+        listing = request.listing
+        self.journal.record(
+            request.listing_id,
+            "plan",
+            {
+                "asset_id": listing.asset_id,
+                "price": listing.price,
+                "description": listing.description,
+                "max_offer_discount": listing.max_offer_discount,
+                "private": listing.private,
+            },
+        )
+
+    async def run_cycle(self) -> BulkResult[Listing]:
+        """*coroutine*
+        Runs a single repricing cycle.
+
+        Listings a previous cycle left unlisted are relisted first, see :meth:`resume`.
+
+        Returns
+        -------
+        :class:`BulkResult` of :class:`Listing`
+            The outcome of the reprices that were issued.
+        """
+        await self.resume()
+        requests = await self.plan()
+        for request in requests:
+            self._plan(request)
+        self.requests += 2 * len(requests)
+        result = await self.client.bulk_reprice_items(
+            requests, concurrency=self.concurrency, priority=RequestPriority.normal, journal=self.journal
+        )
+        if requests:
+            _log.info(f"Repriced {len(result.succeeded)} of {len(requests)} listings")
+        return result
+
+    async def run(self, interval: float = 30.0) -> None:
+        """*coroutine*
+        Runs repricing cycles every ``interval`` seconds until :meth:`stop` is called.
+        """
+        self._running = True
+        while self._running:
+            started = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                _log.warning(f"Repricing cycle failed: {e!r}")
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def stop(self) -> None:
+        """Stops :meth:`run` after the current cycle."""
+        self._running = False
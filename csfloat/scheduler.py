@@ -0,0 +1,237 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Dict, List, Mapping, Optional
+
+from .enums import RequestPriority
+from .errors import BadArgument
+
+__all__ = ("PriorityScheduler",)
+
+
+_log = logging.getLogger(__name__)
+
+
+class _Waiter:
+    __slots__ = ("priority", "since", "future")
+
+    def __init__(self, priority: RequestPriority, since: float, future: asyncio.Future) -> None:
+        self.priority = priority
+        self.since = since
+        self.future = future
+
+
+class PriorityScheduler:
+    """Hands out the rate budget of a :class:`HTTPClient` to requests by priority.
+
+    The budget is the smaller of a local token bucket (if ``rate`` is set) and what the API reports
+    in the ``X-Ratelimit-Remaining`` and ``X-Ratelimit-Reset`` headers of its responses. Once the
+    API reports no remaining requests, nothing is sent until the reset.
+
+    Waiting requests are served highest priority first. Requests below
+    :attr:`RequestPriority.high` can't take the last ``reserve`` share of the budget, so urgent
+    requests find capacity even while a crawl runs. To prevent starvation, a waiting request
+    gains one priority level per ``aging`` seconds.
+
+    Parameters
+    ----------
+    rate: Optional[:class:`float`]
+        Requests per second of the local token bucket. ``None`` only follows the API headers.
+    capacity: Optional[:class:`int`]
+        The size of the local token bucket. Defaults to ``rate``, i.e. one second worth of requests.
+    reserve: :class:`float`
+        The share of the budget kept for high priority requests, between 0 and 1.
+    aging: :class:`float`
+        Seconds of waiting that raise the priority of a request by one level.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = None,
+        capacity: Optional[int] = None,
+        reserve: float = 0.1,
+        aging: float = 5.0,
+    ) -> None:
+        if rate is not None and rate <= 0:
+            raise BadArgument("rate has to be a positive number or None")
+        if capacity is not None and capacity <= 0:
+            raise BadArgument("capacity has to be a positive integer or None")
+        if not 0 <= reserve < 1:
+            raise BadArgument("reserve has to be between 0 and 1")
+        if aging <= 0:
+            raise BadArgument("aging has to be a positive number")
+
+        self.rate = rate
+        self.capacity: Optional[float] = float(capacity or max(rate, 1.0)) if rate is not None else None
+        self.reserve = reserve
+        self.aging = aging
+
+        self._tokens: float = self.capacity if self.capacity is not None else math.inf
+        self._refilled = time.monotonic()
+        # the budget reported by the API
+        self._limit: Optional[int] = None
+        self._remaining: Optional[int] = None
+        self._reset: float = 0.0
+
+        self._waiters: List[_Waiter] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.granted: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+
+    def __repr__(self) -> str:
+        return f"<PriorityScheduler available={self.available} waiting={len(self._waiters)}>"
+
+    @property
+    def available(self) -> float:
+        """:class:`float`: Returns the number of requests that may be sent right now."""
+        self._refill()
+        if self._remaining is None:
+            return self._tokens
+        return min(self._tokens, self._remaining)
+
+    @property
+    def spare(self) -> bool:
+        """:class:`bool`: Returns whether a low priority request could be sent right now without
+        waiting, i.e. without taking budget that is reserved or that others are waiting for."""
+        return not self._waiters and self._can_grant(RequestPriority.low)
+
+    @property
+    def waiting(self) -> Dict[RequestPriority, int]:
+        """Dict[:class:`RequestPriority`, :class:`int`]: Returns the number of waiting requests per priority."""
+        counts = {priority: 0 for priority in RequestPriority}
+        for waiter in self._waiters:
+            counts[waiter.priority] += 1
+        return counts
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(self._tokens + (now - self._refilled) * self.rate, self.capacity)  # type: ignore
+        self._refilled = now
+        if self._remaining is not None and time.time() >= self._reset:
+            # the window of the API is over, the next response tells the new budget
+            self._remaining = None
+
+    def _reserved(self) -> float:
+        size = self._limit if self._limit is not None else self.capacity
+        return math.ceil(size * self.reserve) if size is not None else 0
+
+    def _effective(self, waiter: _Waiter, now: float) -> float:
+        return min(waiter.priority + (now - waiter.since) / self.aging, RequestPriority.high)
+
+    def _can_grant(self, priority: float) -> bool:
+        needed = 1 if priority >= RequestPriority.high else 1 + self._reserved()
+        return self.available >= needed
+
+    def _take(self, priority: RequestPriority) -> None:
+        self._tokens -= 1
+        if self._remaining is not None:
+            self._remaining -= 1
+        self.granted[priority] += 1
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.normal) -> None:
+        """*coroutine*
+        Waits until a request of ``priority`` may be sent and takes its share of the budget."""
+        if not self._waiters and self._can_grant(priority):
+            self._take(priority)
+            return
+
+        waiter = _Waiter(priority, time.monotonic(), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # the budget was already taken for us, give it back
+                self.refund(priority)
+            raise
+
+    def refund(self, priority: RequestPriority) -> None:
+        """Gives back the budget of an acquired request that was never sent."""
+        self._tokens += 1
+        if self._remaining is not None:
+            self._remaining += 1
+        self.granted[priority] -= 1
+        if self._waiters:
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        while self._waiters:
+            waiter = max(self._waiters, key=lambda waiter: (self._effective(waiter, now), -waiter.since))
+            if not self._can_grant(self._effective(waiter, now)):
+                break
+            self._waiters.remove(waiter)
+            self._take(waiter.priority)
+            waiter.future.set_result(None)
+
+        if self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(self._next_check(), self._dispatch)
+
+    def _next_check(self) -> float:
+        # re-check when the next token is refilled, the API window resets or a waiter ages a level
+        delays = [self.aging]
+        if self._remaining is not None and self._remaining <= 0:
+            delays.append(max(self._reset - time.time(), 0.0))
+        elif self.rate is not None:
+            delays.append(1 / self.rate)
+        return max(min(delays), 0.001)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Syncs the budget with the ``X-Ratelimit-*`` headers of a response."""
+        remaining = headers.get("X-Ratelimit-Remaining")
+        if remaining is None:
+            return
+
+        try:
+            remaining_count = int(remaining)
+            limit = headers.get("X-Ratelimit-Limit")
+            reset = headers.get("X-Ratelimit-Reset")
+            reset_at = float(reset) if reset is not None else time.time() + 60
+            if limit is not None:
+                self._limit = int(limit)
+        except ValueError:
+            _log.debug(f"Ignoring malformed rate limit headers {dict(headers)}")
+            return
+
+        if self._remaining is not None and reset_at == self._reset:
+            # requests granted since this one was sent aren't counted by the API yet
+            self._remaining = min(self._remaining, remaining_count)
+        else:
+            self._remaining = remaining_count
+            self._reset = reset_at
+
+        if self._waiters:
+            self._dispatch()
@@ -0,0 +1,226 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import heapq
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .errors import BadArgument
+from .frame import ListingFrame, numpy
+from .listing import Listing
+
+__all__ = (
+    "DealScores",
+    "score_listings",
+)
+
+
+SCORE_COLUMNS = (
+    "discount",
+    "base_discount",
+    "sticker_premium",
+    "expected_margin",
+)
+
+
+class DealScores:
+    """Represents the deal scores of a batch of listings.
+
+    Each score column is aligned with the rows of :attr:`frame`. Missing reference prices yield ``nan``.
+    """
+
+    __slots__ = (
+        "_frame",
+        "_columns",
+    )
+
+    def __init__(self, *, frame: ListingFrame, columns: Dict[str, Any]) -> None:
+        self._frame = frame
+        self._columns = columns
+
+    def __repr__(self) -> str:
+        return f"<DealScores rows={len(self._frame)}>"
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def frame(self) -> ListingFrame:
+        """:class:`ListingFrame`: Returns the scored listings."""
+        return self._frame
+
+    @property
+    def discount(self) -> Any:
+        """Returns ``1 - price / predicted_price`` per listing."""
+        return self._columns["discount"]
+
+    @property
+    def base_discount(self) -> Any:
+        """Returns ``1 - price / base_price`` per listing."""
+        return self._columns["base_discount"]
+
+    @property
+    def sticker_premium(self) -> Any:
+        """Returns the weighted sticker reference value in USD per listing."""
+        return self._columns["sticker_premium"]
+
+    @property
+    def expected_margin(self) -> Any:
+        """Returns ``predicted_price + sticker_premium - price`` in USD per listing."""
+        return self._columns["expected_margin"]
+
+    def column(self, name: str) -> Any:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise BadArgument(f"unknown score {name!r}") from None
+
+    def take(self, indices: Iterable[int]) -> "DealScores":
+        """Returns the scores of the given rows in the given order."""
+        indices = list(indices)
+        columns = {}
+        for name, values in self._columns.items():
+            if numpy is not None and isinstance(values, numpy.ndarray):
+                columns[name] = values[indices]
+            else:
+                columns[name] = array("d", [values[i] for i in indices])
+        return DealScores(frame=self._frame.take(indices), columns=columns)
+
+    def top(self, k: int, *, by: str = "expected_margin") -> "DealScores":
+        """Returns the ``k`` best rows by a score column in descending order. Rows without a score are skipped."""
+        indices = _top_indices(self.column(by), k)
+        return self.take(indices)
+
+    def listings(self) -> List[Listing]:
+        """Builds the :class:`Listing` objects of all rows."""
+        return list(self._frame.listings())
+
+
+def _top_indices(values: Any, k: int) -> List[int]:
+    if k <= 0:
+        return []
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        candidates = numpy.flatnonzero(~numpy.isnan(values))
+        if len(candidates) > k:
+            part = numpy.argpartition(-values[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        order = numpy.argsort(-values[candidates], kind="stable")
+        return candidates[order].tolist()
+
+    return heapq.nlargest(
+        k,
+        (i for i, value in enumerate(values) if not math.isnan(value)),
+        key=values.__getitem__,
+    )
+
+
+def _score_numpy(frame: ListingFrame, sticker_weight: float) -> Dict[str, Any]:
+    price = frame.to_numpy("price").astype(numpy.float64)
+    predicted = frame.to_numpy("predicted_price").astype(numpy.float64)
+    base = frame.to_numpy("base_price").astype(numpy.float64)
+    predicted[predicted <= 0] = numpy.nan
+    base[base <= 0] = numpy.nan
+    premium = frame.to_numpy("sticker_value") * (sticker_weight / 100)
+
+    return {
+        "discount": 1 - price / predicted,
+        "base_discount": 1 - price / base,
+        "sticker_premium": premium,
+        "expected_margin": (predicted - price) / 100 + premium,
+    }
+
+
+def _score_python(frame: ListingFrame, sticker_weight: float) -> Dict[str, Any]:
+    nan = math.nan
+    weight = sticker_weight / 100
+    discount = array("d")
+    base_discount = array("d")
+    sticker_premium = array("d")
+    expected_margin = array("d")
+
+    columns = zip(
+        frame.column("price"),
+        frame.column("predicted_price"),
+        frame.column("base_price"),
+        frame.column("sticker_value"),
+    )
+    for price, predicted, base, stickers in columns:
+        premium = stickers * weight
+        sticker_premium.append(premium)
+        base_discount.append(1 - price / base if base > 0 else nan)
+        if predicted > 0:
+            discount.append(1 - price / predicted)
+            expected_margin.append((predicted - price) / 100 + premium)
+        else:
+            discount.append(nan)
+            expected_margin.append(nan)
+
+    return {
+        "discount": discount,
+        "base_discount": base_discount,
+        "sticker_premium": sticker_premium,
+        "expected_margin": expected_margin,
+    }
+
+
+def score_listings(
+    listings: Union[ListingFrame, Iterable[Dict[str, Any]]],
+    *,
+    sticker_weight: float = 1.0,
+    top_k: Optional[int] = None,
+    by: str = "expected_margin",
+) -> DealScores:
+    """Scores a batch of listings against their reference prices in a single columnar pass.
+
+    Parameters
+    ----------
+    listings: Union[:class:`ListingFrame`, Iterable[Dict[str, Any]]]
+        A frame or the raw listing dicts of one or more pages.
+    sticker_weight: :class:`float`
+        The share of the sticker reference prices that is added on top of the predicted price.
+    top_k: Optional[:class:`int`]
+        If given, only the ``top_k`` best listings by ``by`` are returned.
+    by: :class:`str`
+        The score used for ``top_k``. One of ``discount``, ``base_discount``, ``sticker_premium``
+        or ``expected_margin``.
+
+    Returns
+    -------
+    :class:`DealScores`
+    """
+    if by not in SCORE_COLUMNS:
+        raise BadArgument(f"by has to be one of {', '.join(SCORE_COLUMNS)}")
+
+    frame = listings if isinstance(listings, ListingFrame) else ListingFrame(listings)
+    if numpy is not None:
+        columns = _score_numpy(frame, sticker_weight)
+    else:
+        columns = _score_python(frame, sticker_weight)
+
+    scores = DealScores(frame=frame, columns=columns)
+    if top_k is not None:
+        return scores.top(top_k, by=by)
+    return scores
@@ -0,0 +1,246 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .errors import BadArgument
+from .frame import NUMERIC_COLUMNS, STRING_COLUMNS, ListingFrame
+from .listing import Listing
+
+__all__ = (
+    "write_snapshot",
+    "BinarySnapshot",
+)
+
+
+_MAGIC = b"CSFLSNAP"
+# version 2 marks None in string tables, version 1 files have no None values and are still read
+_VERSION = 2
+# magic, version, section count, row count
+_HEADER = struct.Struct("<8sIIQ")
+# name, kind, offset, length
+_SECTION = struct.Struct("<24s8sQQ")
+
+_NUMERIC = b"array"
+_STRINGS = b"strings"
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _string_table(values: Iterable[Optional[str]]) -> bytes:
+    offsets = array("q", [0])
+    blob = bytearray()
+    for value in values:
+        if value is None:
+            # the complement of the end offset marks None, so it stays distinct from ""
+            offsets.append(~len(blob))
+        else:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+    # a string table is its length, the end offsets and the concatenated UTF-8 data
+    return struct.pack("<Q", len(offsets) - 1) + offsets.tobytes() + bytes(blob)
+
+
+def write_snapshot(path: str, listings: Union[ListingFrame, Iterable[Dict[str, Any]]]) -> int:
+    """Writes a binary snapshot of listings that can be memory-mapped with :class:`BinarySnapshot`.
+
+    The file contains every numeric column of :class:`ListingFrame` as a fixed-width array, the
+    dictionary codes of the string columns, string tables for the listing IDs and dictionaries
+    and the raw JSON of every listing so :class:`Listing` objects can be rebuilt on demand.
+
+    Returns
+    -------
+    :class:`int`
+        The number of listings written.
+    """
+    frame = listings if isinstance(listings, ListingFrame) else ListingFrame(listings)
+
+    sections: List[Tuple[str, bytes, bytes]] = []
+    for name in NUMERIC_COLUMNS:
+        column = frame.column(name)
+        sections.append((name, _NUMERIC + column.typecode.encode("ascii"), column.tobytes()))  # type: ignore
+    for name in STRING_COLUMNS:
+        sections.append((f"{name}.codes", _NUMERIC + b"q", frame.codes(name).tobytes()))
+        sections.append((f"{name}.values", _STRINGS, _string_table(frame.categories(name))))
+    sections.append(("listing_id", _STRINGS, _string_table(str(i) for i in frame.listing_ids)))
+    sections.append(
+        ("json", _STRINGS, _string_table(json.dumps(frame.raw(i), separators=(",", ":")) for i in range(len(frame))))
+    )
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory = bytearray()
+    for name, kind, payload in sections:
+        offset += _pad(offset)
+        directory += _SECTION.pack(name.encode("ascii"), kind, offset, len(payload))
+        offset += len(payload)
+
+    with open(path, "wb") as fp:
+        fp.write(_HEADER.pack(_MAGIC, _VERSION, len(sections), len(frame)))
+        fp.write(directory)
+        for _, _, payload in sections:
+            fp.write(b"\0" * _pad(fp.tell()))
+            fp.write(payload)
+    return len(frame)
+
+
+class _StringTable:
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, view: memoryview) -> None:
+        (count,) = struct.unpack_from("<Q", view)
+        end = 8 + (count + 1) * 8
+        self._offsets = view[8:end].cast("q")
+        self._blob = view[end:]
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, index: int) -> Optional[memoryview]:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        if end < 0:
+            return None
+        return self._blob[start if start >= 0 else ~start : end]
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        data = self.raw(index)
+        return str(data, "utf-8") if data is not None else None
+
+    def release(self) -> None:
+        self._offsets.release()
+        self._blob.release()
+
+
+class BinarySnapshot:
+    """A memory-mapped binary snapshot written by :func:`write_snapshot`.
+
+    Columns are exposed as zero-copy :class:`memoryview` objects over the mapped file, so opening
+    a snapshot costs the same regardless of its size. :class:`Listing` objects are only built
+    when a row is requested.
+
+    The snapshot has to be closed, or used as a context manager, to unmap the file. Views
+    returned by :meth:`column` must not be used after that.
+    """
+
+    __slots__ = (
+        "_file",
+        "_mmap",
+        "_view",
+        "_rows",
+        "_sections",
+        "_tables",
+    )
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._sections: Dict[str, memoryview] = {}
+        self._tables: Dict[str, _StringTable] = {}
+
+        magic, version, count, rows = _HEADER.unpack_from(self._view)
+        if magic != _MAGIC or version not in (1, _VERSION):
+            self.close()
+            raise BadArgument(f"{path!r} is not a csfloat.py snapshot")
+
+        self._rows: int = rows
+        for i in range(count):
+            name, kind, offset, length = _SECTION.unpack_from(self._view, _HEADER.size + i * _SECTION.size)
+            name = name.rstrip(b"\0").decode("ascii")
+            kind = kind.rstrip(b"\0")
+            section = self._view[offset : offset + length]
+            if kind.startswith(_NUMERIC):
+                self._sections[name] = section.cast(kind[len(_NUMERIC) :].decode("ascii"))
+            else:
+                self._tables[name] = _StringTable(section)
+
+    def __repr__(self) -> str:
+        return f"<BinarySnapshot rows={self._rows}>"
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases the views and unmaps the file."""
+        for table in self._tables.values():
+            table.release()
+        for section in self._sections.values():
+            section.release()
+        self._tables = {}
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+        self._file.close()
+
+    @property
+    def columns(self) -> List[str]:
+        """List[:class:`str`]: Returns the names of all columns."""
+        return ["listing_id", *NUMERIC_COLUMNS, *STRING_COLUMNS]
+
+    def column(self, name: str) -> memoryview:
+        """Returns a zero-copy view of a numeric column, or of the codes of a string column."""
+        if name in STRING_COLUMNS:
+            name = f"{name}.codes"
+        try:
+            return self._sections[name]
+        except KeyError:
+            raise BadArgument(f"unknown column {name!r}") from None
+
+    def categories(self, name: str) -> List[Optional[str]]:
+        """Returns the distinct values of a string column, indexed by code; a missing value is ``None``."""
+        try:
+            table = self._tables[f"{name}.values"]
+        except KeyError:
+            raise BadArgument(f"{name!r} is not a string column") from None
+        return [table[i] for i in range(len(table))]
+
+    def listing_id(self, index: int) -> str:
+        """Returns the listing ID of a row."""
+        return self._tables["listing_id"][index]  # type: ignore
+
+    def raw(self, index: int) -> Dict[str, Any]:
+        """Decodes the raw listing dict of a row."""
+        if not 0 <= index < self._rows:
+            raise IndexError(index)
+        return json.loads(bytes(self._tables["json"].raw(index)))  # type: ignore
+
+    def listing(self, index: int) -> Listing:
+        """Builds the :class:`Listing` of a row."""
+        return Listing(data=self.raw(index))
+
+    def listings(self) -> Iterator[Listing]:
+        """Lazily builds a :class:`Listing` for every row."""
+        for i in range(self._rows):
+            yield self.listing(i)
@@ -0,0 +1,344 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .errors import BadArgument
+from .listing import Listing, _listing_data
+
+__all__ = ("ListingStore",)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sellers (
+    seller_id TEXT PRIMARY KEY,
+    steam_id TEXT,
+    obfuscated_id TEXT,
+    username TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    asset_id TEXT PRIMARY KEY,
+    def_index INTEGER,
+    paint_index INTEGER,
+    paint_seed INTEGER,
+    float_value REAL,
+    market_hash_name TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS listings (
+    listing_id TEXT PRIMARY KEY,
+    asset_id TEXT REFERENCES items (asset_id),
+    seller_id TEXT REFERENCES sellers (seller_id),
+    type TEXT,
+    price INTEGER NOT NULL,
+    state TEXT,
+    watchers INTEGER NOT NULL,
+    created_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_price ON listings (price);
+CREATE INDEX IF NOT EXISTS listings_seller ON listings (seller_id);
+CREATE INDEX IF NOT EXISTS listings_asset ON listings (asset_id);
+CREATE INDEX IF NOT EXISTS items_def_paint ON items (def_index, paint_index);
+CREATE INDEX IF NOT EXISTS items_paint_seed ON items (paint_seed);
+CREATE INDEX IF NOT EXISTS items_float ON items (float_value);
+CREATE INDEX IF NOT EXISTS items_name ON items (market_hash_name);
+"""
+
+_UPSERT_SELLER = """
+INSERT INTO sellers (seller_id, steam_id, obfuscated_id, username, data) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (seller_id) DO UPDATE SET
+    steam_id = excluded.steam_id, obfuscated_id = excluded.obfuscated_id, username = excluded.username,
+    data = excluded.data
+WHERE sellers.data IS NOT excluded.data
+"""
+
+_UPSERT_ITEM = """
+INSERT INTO items (asset_id, def_index, paint_index, paint_seed, float_value, market_hash_name, data)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (asset_id) DO UPDATE SET
+    def_index = excluded.def_index, paint_index = excluded.paint_index, paint_seed = excluded.paint_seed,
+    float_value = excluded.float_value, market_hash_name = excluded.market_hash_name, data = excluded.data
+WHERE items.data IS NOT excluded.data
+"""
+
+# Only price, state and watchers are compared, the remaining fields of a listing never change.
+_UPSERT_LISTING = """
+INSERT INTO listings (listing_id, asset_id, seller_id, type, price, state, watchers, created_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (listing_id) DO UPDATE SET
+    price = excluded.price, state = excluded.state, watchers = excluded.watchers, data = excluded.data
+WHERE listings.price IS NOT excluded.price
+    OR listings.state IS NOT excluded.state
+    OR listings.watchers IS NOT excluded.watchers
+"""
+
+_SELECT = """
+SELECT listings.data, items.data, sellers.data FROM listings
+LEFT JOIN items ON items.asset_id = listings.asset_id
+LEFT JOIN sellers ON sellers.seller_id = listings.seller_id
+"""
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), sort_keys=True)
+
+
+class ListingStore:
+    """A local SQLite store of listings with normalised item and seller tables.
+
+    The database is opened in WAL mode. Writes are upserts keyed by ``listing_id`` that only touch
+    rows whose price, state or watchers changed, so re-syncing an unchanged crawl is cheap.
+    Sellers are keyed by their Steam ID, or by their obfuscated ID if the Steam ID is hidden.
+
+    The connection is shared by the worker threads of :meth:`sync` and the calling thread, so
+    every use of it is serialised by a lock.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The path of the database file.
+    batch_size: :class:`int`
+        The number of listings written per transaction by :meth:`sync`.
+    """
+
+    __slots__ = (
+        "_connection",
+        "_lock",
+        "batch_size",
+    )
+
+    def __init__(self, path: str, *, batch_size: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self.batch_size: int = batch_size
+
+    def __repr__(self) -> str:
+        return f"<ListingStore listings={len(self)}>"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def __enter__(self) -> "ListingStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def upsert(self, listings: Iterable[Union[Listing, Dict[str, Any]]]) -> int:
+        """Writes a batch of listings in a single transaction.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listing rows that were inserted or changed.
+        """
+        sellers: Dict[str, Tuple[Any, ...]] = {}
+        items: Dict[str, Tuple[Any, ...]] = {}
+        rows: List[Tuple[Any, ...]] = []
+
+        for listing in listings:
+            data = dict(_listing_data(listing))
+            item = data.pop("item", None) or {}
+            seller = data.pop("seller", None) or {}
+            asset_id = item.get("asset_id")
+            steam_id = seller.get("steam_id")
+            seller_id = steam_id or seller.get("obfuscated_id")
+
+            # sellers and items without an ID stay in the listing row
+            if seller_id is not None:
+                sellers[seller_id] = (
+                    seller_id,
+                    steam_id,
+                    seller.get("obfuscated_id"),
+                    seller.get("username"),
+                    _dumps(seller),
+                )
+            elif seller:
+                data["seller"] = seller
+            if asset_id is None and item:
+                data["item"] = item
+            elif asset_id is not None:
+                items[asset_id] = (
+                    asset_id,
+                    item.get("def_index"),
+                    item.get("paint_index"),
+                    item.get("paint_seed"),
+                    item.get("float_value"),
+                    item.get("market_hash_name"),
+                    _dumps(item),
+                )
+            rows.append(
+                (
+                    data.get("id"),
+                    asset_id,
+                    seller_id,
+                    data.get("type"),
+                    data.get("price", 0),
+                    data.get("state"),
+                    data.get("watchers", 0),
+                    data.get("created_at"),
+                    _dumps(data),
+                )
+            )
+
+        connection = self._connection
+        with self._lock, connection:
+            connection.execute("BEGIN")
+            connection.executemany(_UPSERT_SELLER, sellers.values())
+            connection.executemany(_UPSERT_ITEM, items.values())
+            before = connection.total_changes
+            connection.executemany(_UPSERT_LISTING, rows)
+            return connection.total_changes - before
+
+    async def sync(self, source: AsyncIterable[Any]) -> int:
+        """*coroutine*
+        Writes every listing of a stream in batches of :attr:`batch_size`.
+
+        ``source`` can be a :class:`ListingAsyncIterator` or a stream of pages such as
+        :meth:`ListingAsyncIterator.pages`. The transactions run in a worker thread.
+
+        Returns
+        -------
+        :class:`int`
+            The number of listing rows that were inserted or changed.
+        """
+        changed = 0
+        batch: List[Any] = []
+        async for element in source:
+            if isinstance(element, (list, tuple)):
+                batch.extend(element)
+            else:
+                batch.append(element)
+
+            if len(batch) >= self.batch_size:
+                changed += await asyncio.to_thread(self.upsert, batch)
+                batch = []
+
+        if batch:
+            changed += await asyncio.to_thread(self.upsert, batch)
+        return changed
+
+    def delete(self, listing_ids: Iterable[str]) -> int:
+        """Deletes listings by ID and returns the number of deleted rows."""
+        connection = self._connection
+        with self._lock, connection:
+            connection.execute("BEGIN")
+            before = connection.total_changes
+            connection.executemany("DELETE FROM listings WHERE listing_id = ?", ((i,) for i in listing_ids))
+            return connection.total_changes - before
+
+    def _build(self, rows: Iterable[Tuple[str, Optional[str], Optional[str]]]) -> List[Listing]:
+        listings = []
+        for listing_data, item_data, seller_data in rows:
+            data = json.loads(listing_data)
+            if item_data is not None:
+                data["item"] = json.loads(item_data)
+            if seller_data is not None:
+                data["seller"] = json.loads(seller_data)
+            listings.append(Listing(data=data))
+        return listings
+
+    def get(self, listing_id: str) -> Optional[Listing]:
+        """Returns a stored listing by ID."""
+        with self._lock:
+            rows = self._connection.execute(_SELECT + "WHERE listings.listing_id = ?", (listing_id,)).fetchall()
+        listings = self._build(rows)
+        return listings[0] if listings else None
+
+    def query(
+        self,
+        *,
+        def_index: Optional[int] = None,
+        paint_index: Optional[int] = None,
+        paint_seed: Optional[int] = None,
+        market_hash_name: Optional[str] = None,
+        seller_id: Optional[str] = None,
+        state: Optional[str] = None,
+        min_float: Optional[float] = None,
+        max_float: Optional[float] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        order_by: str = "price",
+        limit: Optional[int] = None,
+    ) -> List[Listing]:
+        """Returns the stored listings matching all given conditions. Prices are in USD.
+
+        ``order_by`` can be ``price``, ``float_value``, ``watchers`` or ``created_at``.
+        """
+        conditions = []
+        params: List[Any] = []
+        for column, value in (
+            ("items.def_index", def_index),
+            ("items.paint_index", paint_index),
+            ("items.paint_seed", paint_seed),
+            ("items.market_hash_name", market_hash_name),
+            ("listings.seller_id", seller_id),
+            ("listings.state", state),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for column, operator, value in (
+            ("items.float_value", ">=", min_float),
+            ("items.float_value", "<=", max_float),
+            ("listings.price", ">=", None if min_price is None else round(min_price * 100)),
+            ("listings.price", "<=", None if max_price is None else round(max_price * 100)),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+
+        columns = {
+            "price": "listings.price",
+            "float_value": "items.float_value",
+            "watchers": "listings.watchers",
+            "created_at": "listings.created_at",
+        }
+        if order_by not in columns:
+            raise BadArgument(f"order_by has to be one of {', '.join(columns)}")
+
+        sql = _SELECT
+        if conditions:
+            sql += "WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {columns[order_by]}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return self._build(rows)
@@ -0,0 +1,204 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import heapq
+import inspect
+import itertools
+from typing import Any, AsyncIterable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from .errors import BadArgument
+from .listing import Listing
+
+__all__ = (
+    "TopK",
+    "select_top_k",
+    "by_price",
+    "by_float_value",
+    "by_watchers",
+    "by_discount",
+)
+
+T = TypeVar("T")
+ListingLike = Union[Listing, Dict[str, Any]]
+
+
+def by_price(listing: ListingLike) -> float:
+    """Key function returning the price in USD of a :class:`Listing` or raw listing dict."""
+    if isinstance(listing, dict):
+        return listing.get("price", 0) / 100
+    return listing.price
+
+
+def by_float_value(listing: ListingLike) -> Optional[float]:
+    """Key function returning the float value of a :class:`Listing` or raw listing dict."""
+    if isinstance(listing, dict):
+        return (listing.get("item") or {}).get("float_value")
+    return listing.item.float_value
+
+
+def by_watchers(listing: ListingLike) -> int:
+    """Key function returning the number of watchers of a :class:`Listing` or raw listing dict."""
+    if isinstance(listing, dict):
+        return listing.get("watchers", 0)
+    return listing.watchers
+
+
+def by_discount(listing: ListingLike) -> Optional[float]:
+    """Key function returning ``1 - price / predicted_price`` of a :class:`Listing` or raw listing dict."""
+    if isinstance(listing, dict):
+        predicted = (listing.get("reference") or {}).get("predicted_price")
+        price = listing.get("price", 0)
+    else:
+        predicted = listing._reference.get("predicted_price") if listing._reference else None
+        price = listing._price
+    if not predicted:
+        return None
+    return 1 - price / predicted
+
+
+class TopK(Generic[T]):
+    """Keeps the ``k`` best elements seen so far in a bounded heap.
+
+    By default the elements with the **smallest** key are kept, pass ``largest=True`` to keep the largest.
+    Elements whose key is ``None`` are ignored. Memory usage is O(k) regardless of how many elements are pushed.
+    """
+
+    __slots__ = (
+        "_k",
+        "_key",
+        "_sign",
+        "_heap",
+        "_counter",
+        "_seen",
+    )
+
+    def __init__(self, k: int, *, key: Callable[[T], Any], largest: bool = False) -> None:
+        if k <= 0:
+            raise BadArgument("k has to be a positive integer")
+
+        self._k = k
+        self._key = key
+        # the heap root is always the worst element currently kept
+        self._sign = 1 if largest else -1
+        self._heap: List[Tuple[Any, int, T]] = []
+        self._counter = itertools.count()
+        self._seen = 0
+
+    def __repr__(self) -> str:
+        return f"<TopK k={self._k} size={len(self._heap)} seen={self._seen}>"
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def k(self) -> int:
+        """:class:`int`: Returns the maximum number of elements kept."""
+        return self._k
+
+    @property
+    def seen(self) -> int:
+        """:class:`int`: Returns the number of elements pushed so far."""
+        return self._seen
+
+    @property
+    def threshold(self) -> Any:
+        """Returns the key an element has to beat to enter a full selection, or ``None`` while it is not full."""
+        if len(self._heap) < self._k:
+            return None
+        return self._heap[0][0] * self._sign
+
+    def push(self, element: T) -> bool:
+        """Offers an element and returns whether the selection changed."""
+        self._seen += 1
+        value = self._key(element)
+        if value is None:
+            return False
+
+        entry = (value * self._sign, next(self._counter), element)
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def extend(self, elements: Iterable[T]) -> bool:
+        """Offers multiple elements and returns whether the selection changed."""
+        changed = False
+        for element in elements:
+            changed = self.push(element) or changed
+        return changed
+
+    def items(self) -> List[T]:
+        """Returns the kept elements, best first."""
+        return [element for _, _, element in sorted(self._heap, key=lambda e: (-e[0], e[1]))]
+
+
+async def select_top_k(
+    source: Union[AsyncIterable[T], AsyncIterable[Iterable[T]]],
+    k: int,
+    *,
+    key: Callable[[T], Any] = by_price,
+    largest: bool = False,
+    on_update: Optional[Callable[[TopK[T]], Any]] = None,
+) -> List[T]:
+    """*coroutine*
+    Consumes a :class:`ListingAsyncIterator`, or any async iterable of elements or batches of elements,
+    and returns the ``k`` best elements by ``key``.
+
+    Parameters
+    ----------
+    source:
+        The stream to consume. Lists and tuples yielded by the stream are treated as batches,
+        e.g. the pages of :meth:`ListingAsyncIterator.pages`.
+    k: :class:`int`
+        The number of elements to keep.
+    key:
+        Function returning the sort key of an element. Defaults to :func:`by_price`.
+    largest: :class:`bool`
+        Whether to keep the elements with the largest instead of the smallest key.
+    on_update:
+        Optional callback, or coroutine function, that is called with the :class:`TopK` every time
+        the selection changes.
+
+    Returns
+    -------
+    List
+        The selected elements, best first.
+    """
+    selection: TopK[T] = TopK(k, key=key, largest=largest)
+
+    async for element in source:
+        if isinstance(element, (list, tuple)):
+            changed = selection.extend(element)
+        else:
+            changed = selection.push(element)  # type: ignore
+
+        if changed and on_update is not None:
+            result = on_update(selection)
+            if inspect.isawaitable(result):
+                await result
+
+    return selection.items()
@@ -0,0 +1,178 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import contextvars
+import functools
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from .errors import BadArgument
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - opentelemetry is optional
+    otel_trace = None
+
+__all__ = (
+    "Span",
+    "Tracer",
+    "NoOpTracer",
+    "OpenTelemetryTracer",
+)
+
+T = TypeVar("T")
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("csfloat_current_span", default=None)
+
+
+class Span:
+    """Represents a traced operation. The base class records nothing.
+
+    Spans are context managers: leaving the block records a raised exception and ends the span.
+    """
+
+    __slots__ = ("_token",)
+
+    def __init__(self) -> None:
+        self._token: Optional[contextvars.Token] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Sets an attribute of the span."""
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Records an exception and marks the span as failed."""
+        pass
+
+    def end(self) -> None:
+        """Ends the span."""
+        pass
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+
+
+class _NoOpSpan(Span):
+    __slots__ = ()
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class Tracer:
+    """Base class of the pluggable tracers used by :class:`Client` and :class:`HTTPClient`.
+
+    Subclasses implement :meth:`start_span`. Parent spans are tracked in a context variable, so
+    spans started while another span is active become its children, also across tasks.
+    """
+
+    def start_span(self, name: str, *, attributes: Dict[str, Any], parent: Optional[Span]) -> Span:
+        """Creates and starts a span. Must be implemented by subclasses."""
+        raise NotImplementedError
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Starts a span as child of the current span. Use the result as a context manager."""
+        return self.start_span(name, attributes=attributes or {}, parent=_current_span.get())
+
+
+class NoOpTracer(Tracer):
+    """A tracer that records nothing. This is the default."""
+
+    def start_span(self, name: str, *, attributes: Dict[str, Any], parent: Optional[Span]) -> Span:
+        return _NOOP_SPAN
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        return _NOOP_SPAN
+
+
+class _OpenTelemetrySpan(Span):
+    __slots__ = ("span",)
+
+    def __init__(self, span: Any) -> None:
+        super().__init__()
+        self.span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.span.record_exception(exception)
+        self.span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(exception)))
+
+    def end(self) -> None:
+        self.span.end()
+
+
+class OpenTelemetryTracer(Tracer):
+    """A tracer that reports to OpenTelemetry. Requires the ``opentelemetry-api`` package.
+
+    Spans without a csfloat.py parent become children of the currently active OpenTelemetry span.
+
+    Parameters
+    ----------
+    tracer: Optional[:class:`opentelemetry.trace.Tracer`]
+        The tracer to use. Defaults to ``opentelemetry.trace.get_tracer("csfloat.py")``.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        if otel_trace is None:
+            raise BadArgument("opentelemetry-api is required for OpenTelemetryTracer")
+        self.tracer = tracer if tracer is not None else otel_trace.get_tracer("csfloat.py")
+
+    def start_span(self, name: str, *, attributes: Dict[str, Any], parent: Optional[Span]) -> Span:
+        context = None
+        if isinstance(parent, _OpenTelemetrySpan):
+            context = otel_trace.set_span_in_context(parent.span)
+        return _OpenTelemetrySpan(self.tracer.start_span(name, context=context, attributes=attributes))
+
+
+def traced(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator wrapping a :class:`Client` coroutine method in a span of ``self.http.tracer``."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+            with self.http.tracer.span(name) as span:
+                result = await func(self, *args, **kwargs)
+                if hasattr(result, "__len__") and not isinstance(result, (str, dict)):
+                    span.set_attribute("csfloat.item_count", len(result))  # type: ignore
+                return result
+
+        return wrapper
+
+    return decorator
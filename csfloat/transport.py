@@ -0,0 +1,308 @@
+"""
+MIT License
+
+Copyright (c) 2023-present PaxxPatriot
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import asyncio
+import base64
+import collections
+import gzip
+import json
+import time
+from typing import IO, Any, Deque, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .errors import BadArgument, ClientException
+
+__all__ = (
+    "TransportResponse",
+    "Transport",
+    "AiohttpTransport",
+    "RecordingTransport",
+    "ReplayTransport",
+)
+
+CASSETTE_VERSION = 1
+
+
+class TransportResponse:
+    """Represents a completely read HTTP response.
+
+    Attributes
+    ----------
+    status: :class:`int`
+        The status code.
+    reason: :class:`str`
+        The reason phrase of the status code.
+    headers: :class:`multidict.CIMultiDict`
+        The response headers, including the rate limit headers.
+    body: :class:`bytes`
+        The response body.
+    elapsed: :class:`float`
+        Seconds between sending the request and reading the whole body.
+    """
+
+    __slots__ = ("status", "reason", "headers", "body", "elapsed")
+
+    def __init__(self, *, status: int, reason: str, headers: Mapping[str, str], body: bytes, elapsed: float = 0.0) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers: CIMultiDict = CIMultiDict(headers)
+        self.body = body
+        self.elapsed = elapsed
+
+    def __repr__(self) -> str:
+        return f"<TransportResponse status={self.status} reason={self.reason!r} length={len(self.body)}>"
+
+
+class Transport:
+    """Base class of the transports :class:`HTTPClient` sends its requests through."""
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+    ) -> TransportResponse:
+        """*coroutine*
+        Sends a request and returns its response. Must be implemented by subclasses."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """*coroutine*
+        Releases the resources of the transport."""
+        pass
+
+
+class AiohttpTransport(Transport):
+    """Sends requests with an :class:`aiohttp.ClientSession`. This is the default transport.
+
+    Parameters
+    ----------
+    proxy: Optional[:class:`str`]
+        The proxy to send the requests through.
+    proxy_auth: Optional[:class:`aiohttp.BasicAuth`]
+        The authentication for the proxy.
+    session: Optional[:class:`aiohttp.ClientSession`]
+        The session to use. It is created on the first request if not given.
+    """
+
+    def __init__(
+        self,
+        *,
+        proxy: Optional[str] = None,
+        proxy_auth: Optional[aiohttp.BasicAuth] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        self.proxy = proxy
+        self.proxy_auth = proxy_auth
+        self.session = session
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+    ) -> TransportResponse:
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+
+        start = time.perf_counter()
+        async with self.session.request(
+            method, url, headers=headers, params=params, json=json, proxy=self.proxy, proxy_auth=self.proxy_auth
+        ) as response:
+            body = await response.read()
+        return TransportResponse(
+            status=response.status,
+            reason=response.reason or "",
+            headers=response.headers,
+            body=body,
+            elapsed=time.perf_counter() - start,
+        )
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+
+def _request_key(method: str, url: str, params: Optional[Dict[str, Any]]) -> str:
+    # the host is left out, so a cassette can be replayed for a client with another base_url
+    parts = urlsplit(url)
+    key = f"{method} {parts.path}"
+    query = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    if parts.query:
+        key += "?" + parts.query
+    if query:
+        key += ("&" if parts.query else "?") + urlencode(query)
+    return key
+
+
+class RecordingTransport(Transport):
+    """Sends requests through another transport and records them to a cassette file.
+
+    A cassette is a gzip compressed file of JSON lines, one per exchange, with the status,
+    reason, headers, body and timing of each response. Request headers are not recorded,
+    so the API key doesn't end up in the cassette. Call :meth:`close` to finish the file.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The cassette file to write. An existing file is overwritten.
+    transport: Optional[:class:`Transport`]
+        The transport doing the actual requests. Defaults to :class:`AiohttpTransport`.
+    """
+
+    def __init__(self, path: str, transport: Optional[Transport] = None) -> None:
+        self.path = path
+        self.transport: Transport = transport if transport is not None else AiohttpTransport()
+        self.count = 0
+        self._start = time.monotonic()
+        self._fp: Optional[IO[bytes]] = gzip.open(path, "wb", compresslevel=6)
+        self._write({"version": CASSETTE_VERSION, "recorded_at": time.time()})
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        if self._fp is None:
+            raise ClientException("The cassette is already closed")
+        self._fp.write(json.dumps(entry, separators=(",", ":")).encode() + b"\n")
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+    ) -> TransportResponse:
+        sent_at = time.monotonic() - self._start
+        response = await self.transport.send(method, url, headers=headers, params=params, json=json)
+
+        entry: Dict[str, Any] = {
+            "key": _request_key(method, url, params),
+            "at": round(sent_at, 6),
+            "elapsed": round(response.elapsed, 6),
+            "status": response.status,
+            "reason": response.reason,
+            "headers": list(response.headers.items()),
+        }
+        try:
+            entry["body"] = response.body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(response.body).decode("ascii")
+        self._write(entry)
+        self.count += 1
+        return response
+
+    async def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        await self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Answers requests from a cassette written by :class:`RecordingTransport`, without any network.
+
+    Requests are matched by method, path and query parameters; repeated requests get the
+    recorded responses in the order they were recorded.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        The cassette file to read.
+    speed: Optional[:class:`float`]
+        Every response is delayed by its recorded latency divided by ``speed``, e.g. ``10.0``
+        replays ten times faster and ``0.5`` twice as slow. ``None`` answers immediately.
+    cycle: :class:`bool`
+        Whether to start over with the first recorded response of a request once all of them
+        have been replayed. Otherwise running out raises :exc:`ClientException`.
+    """
+
+    def __init__(self, path: str, *, speed: Optional[float] = 1.0, cycle: bool = False) -> None:
+        if speed is not None and speed <= 0:
+            raise BadArgument("speed has to be a positive number or None")
+
+        self.path = path
+        self.speed = speed
+        self.cycle = cycle
+        self.count = 0
+        self._recorded: Dict[str, List[Dict[str, Any]]] = collections.defaultdict(list)
+        self._pending: Dict[str, Deque[Dict[str, Any]]] = {}
+
+        with gzip.open(path, "rb") as fp:
+            header = json.loads(fp.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise BadArgument(f"Unsupported cassette version {header.get('version')!r}")
+            for line in fp:
+                entry = json.loads(line)
+                self._recorded[entry["key"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._recorded.values())
+
+    def _next_entry(self, key: str) -> Dict[str, Any]:
+        pending = self._pending.get(key)
+        if not pending:
+            recorded = self._recorded.get(key)
+            if not recorded or (key in self._pending and not self.cycle):
+                raise ClientException(f"The cassette has no (more) responses for {key}")
+            pending = self._pending[key] = collections.deque(recorded)
+        return pending.popleft()
+
+    @staticmethod
+    def _response(entry: Dict[str, Any]) -> Tuple[bytes, CIMultiDict]:
+        if "body_b64" in entry:
+            body = base64.b64decode(entry["body_b64"])
+        else:
+            body = entry["body"].encode("utf-8")
+        return body, CIMultiDict(entry["headers"])
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+    ) -> TransportResponse:
+        entry = self._next_entry(_request_key(method, url, params))
+        self.count += 1
+        elapsed = entry["elapsed"]
+        if self.speed is not None:
+            elapsed /= self.speed
+            await asyncio.sleep(elapsed)
+        else:
+            elapsed = 0.0
+        body, response_headers = self._response(entry)
+        return TransportResponse(
+            status=entry["status"], reason=entry["reason"], headers=response_headers, body=body, elapsed=elapsed
+        )
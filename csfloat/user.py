@@ -189,6 +189,7 @@ class User:
         "_steam_id",
         "_username",
         "_verification_mode",
+        "_statistics_cache",
     )
 
     def __init__(self, *, data: Dict[str, Any]) -> None:
@@ -203,6 +204,7 @@ class User:
         self._steam_id = data.get("steam_id", None)
         self._username = data.get("username", None)
         self._verification_mode = data.get("verification_mode", None)
+        self._statistics_cache: Optional[UserStatistics] = None
 
     def __repr__(self) -> str:
         return f"User(data={{'avatar': {self._avatar!r}, 'away': {self._away!r}, 'flags': {self._flags!r}, 'obfuscated_id': {self._obfuscated_id!r}, 'has_valid_steam_api_key': {self._has_valid_steam_api_key!r}, 'online': {self._online!r}, 'stall_public': {self._stall_public!r}, 'statistics': {self._statistics!r}, 'steam_id': {self._steam_id!r}, 'username': {self._username!r}, 'verification_mode': {self._verification_mode!r}}})"
@@ -245,7 +247,9 @@ class User:
     @property
     def statistics(self) -> UserStatistics:
         """:class:`Any`: Returns the statistics of the seller."""
-        return UserStatistics(data=self._statistics)
+        if self._statistics_cache is None:
+            self._statistics_cache = UserStatistics(data=self._statistics)
+        return self._statistics_cache
 
     @property
     def steam_id(self) -> Optional[str]: